@@ -22,3 +22,11 @@ DEBUG=true
 ENVIRONMENT=development
 HOST=0.0.0.0
 PORT=8000
+
+# Parsed ECG/SpO2 signal cache (memory-mapped float32 .npy)
+# SIGNAL_CACHE_DIR=.signal_cache
+
+# Snoring uploads are scored in memory; opt in to keeping copies
+# SNORING_PERSIST_UPLOADS=false
+# SNORING_RETENTION_HOURS=24
+# SNORING_RETENTION_MAX_FILES=500
@@ -0,0 +1,41 @@
+"""
+Benchmark: vectorized multimodal fusion over a cohort
+Usage: python -m backend.benchmarks.bench_fusion [rows] (from repo root)
+"""
+import sys
+import time
+
+import numpy as np
+
+from backend.models.fusion import FusionEngine
+from backend.models.inference import fuse_modalities
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    scores = {m: rng.random(n) for m in ("audio", "video", "wearable")}
+    # About a third of the nights have no video, some lack wearable data
+    scores["video"][rng.random(n) < 0.35] = np.nan
+    scores["wearable"][rng.random(n) < 0.1] = np.nan
+    engine = FusionEngine()
+
+    start = time.perf_counter()
+    score, level = engine.fuse(scores)
+    vectorized = time.perf_counter() - start
+
+    sample = min(n, 20_000)
+    rows = [tuple(None if np.isnan(v) else float(v) for v in (scores["audio"][i], scores["video"][i], scores["wearable"][i]))
+            for i in range(sample)]
+    start = time.perf_counter()
+    for audio, video, wearable in rows:
+        fuse_modalities(audio, video, wearable)
+    per_row = (time.perf_counter() - start) / sample
+
+    print(f"{n} rows: {vectorized * 1e3:.1f} ms vectorized, "
+          f"~{per_row * n:.1f} s estimated for per-row fuse_modalities calls")
+    print("levels:", {name: int((level == name).sum()) for name in ("low", "moderate", "high", "unknown")})
+
+
+if __name__ == "__main__":
+    main()
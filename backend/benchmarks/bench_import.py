@@ -0,0 +1,47 @@
+"""
+Benchmark: cold import time of the API and which heavy dependencies it loads
+Usage: python -m backend.benchmarks.bench_import [runs] (from repo root)
+"""
+import subprocess
+import sys
+import time
+
+HEAVY = ("tensorflow", "pandas", "scipy", "cv2", "mediapipe")
+PROBE = ("import sys, time; t = time.perf_counter(); import backend.main; "
+         "print(time.perf_counter() - t); print(','.join(m for m in {heavy!r} if m in sys.modules))")
+
+
+def cold_import() -> tuple:
+    """(seconds to import backend.main, heavy modules loaded) in a fresh interpreter."""
+    out = subprocess.run([sys.executable, "-c", PROBE.format(heavy=HEAVY)],
+                         capture_output=True, text=True, check=True).stdout.split("\n")
+    return float(out[0]), [m for m in out[1].split(",") if m]
+
+
+def top_imports(n: int = 10) -> list:
+    """Slowest top-level-ish imports from ``python -X importtime`` (cumulative microseconds)."""
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", "import backend.main"],
+                         capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in err.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].rstrip()))
+    return sorted(rows, reverse=True)[:n]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    start = time.perf_counter()
+    samples = [cold_import() for _ in range(runs)]
+    wall = (time.perf_counter() - start) / runs
+    times = sorted(s for s, _ in samples)
+    print(f"import backend.main: median {times[len(times) // 2] * 1e3:.0f} ms, "
+          f"best {times[0] * 1e3:.0f} ms, interpreter + import {wall * 1e3:.0f} ms ({runs} runs)")
+    print("heavy modules loaded:", ", ".join(samples[-1][1]) or "none")
+    for cumulative, module in top_imports():
+        print(f"  {cumulative / 1e3:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
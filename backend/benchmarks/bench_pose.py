@@ -0,0 +1,98 @@
+"""
+Benchmark: pose extraction fast paths vs. the original read-every-frame loop
+Usage: python -m backend.benchmarks.bench_pose --video data/video/normal/example1.mp4 [--sample_rate 2] [--max_frames 3000]
+
+Reports frames/second (frames of video covered per wall-clock second) and how
+far each configuration's chest track and breathing-rate estimate drift from
+the original full-resolution path. Needs mediapipe and opencv.
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from backend.models.extract_pose_features import (
+    LEFT_HIP,
+    LEFT_SHOULDER,
+    RIGHT_HIP,
+    RIGHT_SHOULDER,
+    _extract_range,
+    mp_pose,
+    summarize_motion,
+)
+from backend.models.pose_motion import compute_motion
+
+TORSO = (LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP)
+
+
+def original_loop(video_path, sample_rate, end_frame):
+    """Original extract_pose_chest_motion loop: read() (full decode) on every frame."""
+    cap = cv2.VideoCapture(str(video_path))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    pose = mp_pose.Pose(static_image_mode=False, min_detection_confidence=0.5, model_complexity=1)
+    frame_idx, rows = 0, []
+    while frame_idx < end_frame:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frame_idx += 1
+        if (frame_idx - 1) % sample_rate != 0:
+            continue
+        results = pose.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if results.pose_landmarks:
+            lm = results.pose_landmarks.landmark
+            chest_x = float(np.mean([lm[i].x for i in TORSO]))
+            chest_y = float(np.mean([lm[i].y for i in TORSO]))
+        else:
+            chest_x = chest_y = np.nan
+        rows.append((frame_idx, (frame_idx - 1) / fps, chest_x, chest_y, 0.0))
+    pose.close()
+    cap.release()
+    return rows, fps
+
+
+def _track(chest_x, chest_y):
+    chest = np.column_stack([np.asarray(chest_x, dtype=np.float64), np.asarray(chest_y, dtype=np.float64)])
+    return chest, compute_motion(chest[:, 0], chest[:, 1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--video", required=True)
+    parser.add_argument("--sample_rate", type=int, default=2)
+    parser.add_argument("--max_frames", type=int, default=3000)
+    parser.add_argument("--width", type=int, default=640, help="Inference width for downscaled runs")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    ref_rows, fps = original_loop(args.video, args.sample_rate, args.max_frames)
+    t_ref = time.perf_counter() - start
+    n_frames = ref_rows[-1][0] if ref_rows else 0
+    ref_chest, ref_motion = _track([r[2] for r in ref_rows], [r[3] for r in ref_rows])
+    ref_bpm = summarize_motion(ref_motion.tolist(), fps, args.sample_rate)["peak_rate_bpm"]
+
+    configs = [
+        ("grab/retrieve", {}),
+        (f"+ width {args.width}", {"inference_width": args.width}),
+        (f"+ width {args.width}, lite", {"inference_width": args.width, "model_complexity": 0}),
+        (f"+ width {args.width}, lite, roi", {"inference_width": args.width, "model_complexity": 0, "roi_tracking": True}),
+    ]
+    print(f"{n_frames} frames, sample_rate={args.sample_rate}, reference breathing rate {ref_bpm:.1f} bpm")
+    print(f"{'config':<30}{'fps':>9}{'speedup':>9}{'chest err':>11}{'motion r':>10}{'bpm diff':>10}")
+    print(f"{'original read()':<30}{n_frames / t_ref:>9.1f}{1.0:>8.1f}x{0.0:>11.4f}{1.0:>10.3f}{0.0:>10.2f}")
+    for name, options in configs:
+        start = time.perf_counter()
+        columns, _, _ = _extract_range(args.video, 0, args.max_frames, args.sample_rate, **options)
+        elapsed = time.perf_counter() - start
+        chest, motion = _track(columns["chest_x"], columns["chest_y"])
+        n = min(len(chest), len(ref_chest))
+        both = ~np.isnan(chest[:n]).any(axis=1) & ~np.isnan(ref_chest[:n]).any(axis=1)
+        err = float(np.mean(np.hypot(*(chest[:n][both] - ref_chest[:n][both]).T))) if both.any() else float("nan")
+        r = float(np.corrcoef(motion[:n], ref_motion[:n])[0, 1]) if n > 1 else float("nan")
+        bpm = summarize_motion(motion.tolist(), fps, args.sample_rate)["peak_rate_bpm"]
+        print(f"{name:<30}{n_frames / elapsed:>9.1f}{t_ref / elapsed:>8.1f}x{err:>11.4f}{r:>10.3f}{bpm - ref_bpm:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
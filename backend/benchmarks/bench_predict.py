@@ -0,0 +1,63 @@
+"""
+Benchmark: Model.predict vs. the bucketed tf.function executor
+Reports first-call and steady-state per-call latency for the small batch sizes
+the REST endpoints send and for a full-night window count.
+Usage: python -m backend.benchmarks.bench_predict [--model backend/models/ecg_weights.hdf5] (from repo root)
+"""
+import argparse
+import os
+import statistics
+import time
+
+import numpy as np
+
+from backend.config import ECG_MODEL_PATH
+from backend.models.model_executor import DEFAULT_BUCKETS, BucketedExecutor
+
+
+def _timed(fn, x):
+    start = time.perf_counter()
+    fn(x)
+    return (time.perf_counter() - start) * 1e3
+
+
+def _bench(fn, x, repeats):
+    first = _timed(fn, x)
+    steady = [_timed(fn, x) for _ in range(repeats)]
+    return first, statistics.median(steady)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default=ECG_MODEL_PATH, help="Keras HDF5 model to benchmark")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    from tensorflow.keras.models import load_model  # type: ignore
+
+    if not os.path.exists(args.model):
+        raise SystemExit(f"Model not found: {args.model}")
+
+    # Separate model instances so one path's tracing cannot warm the other
+    predict_model = load_model(args.model, compile=False)
+    start = time.perf_counter()
+    executor = BucketedExecutor(load_model(args.model, compile=False), DEFAULT_BUCKETS)
+    warmup_s = time.perf_counter() - start
+    print(f"Model: {args.model}  input={executor.input_shape}  buckets={executor.buckets}")
+    print(f"Executor load + warmup: {warmup_s:.2f}s\n")
+
+    def predict(x):
+        return predict_model.predict(x, verbose=0)
+
+    rng = np.random.default_rng(0)
+    print(f"{'batch':>6}{'predict 1st':>14}{'predict p50':>14}{'exec 1st':>12}{'exec p50':>12}{'speedup':>10}")
+    for n in (1, 3, 8, 20, 64, 700):
+        x = rng.standard_normal((n,) + executor.input_shape).astype(np.float32)
+        assert np.allclose(predict(x), executor(x), atol=1e-4)
+        p_first, p_med = _bench(predict, x, args.repeats)
+        e_first, e_med = _bench(executor, x, args.repeats)
+        print(f"{n:>6}{p_first:>12.1f}ms{p_med:>12.1f}ms{e_first:>10.1f}ms{e_med:>10.1f}ms{p_med / e_med:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,9 @@ API_DESCRIPTION = "Comprehensive Sleep Health Monitoring System - Multimodal AI"
 
 # Database Configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./somnia.db")
+# Relative sqlite paths resolve against this directory (default: the repository
+# root), not the working directory the server happens to start in
+DATABASE_BASE_DIR = os.getenv("DATABASE_BASE_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Security
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
@@ -34,11 +37,57 @@ ALLOWED_ORIGINS = [
 UPLOAD_DIR = os.path.join(os.getcwd(), "uploads")
 MAX_UPLOAD_SIZE = 100 * 1024 * 1024  # 100MB
 
+# Overnight recordings are uploaded in resumable chunks (see utils/uploads.py)
+# and stored under AUDIO_UPLOAD_DIR, so they are not bound by MAX_UPLOAD_SIZE.
+AUDIO_UPLOAD_DIR = os.getenv("AUDIO_UPLOAD_DIR", os.path.join(UPLOAD_DIR, "recordings"))
+AUDIO_UPLOAD_CHUNK_SIZE = int(os.getenv("AUDIO_UPLOAD_CHUNK_SIZE", str(8 * 1024 * 1024)))
+AUDIO_UPLOAD_MAX_SIZE = int(os.getenv("AUDIO_UPLOAD_MAX_SIZE", str(4 * 1024 * 1024 * 1024)))
+
+# Background jobs (utils/jobs.py): long extractions run in a process pool;
+# submissions beyond JOB_MAX_PENDING queued + running jobs are rejected (503).
+JOB_STORE_DIR = os.getenv("JOB_STORE_DIR", os.path.join(os.getcwd(), "data", "jobs"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", "8"))
+# Request-path executors (utils/executors.py): threads for model inference /
+# CPU-heavy processing and for file/database I/O, each accepting at most
+# workers + queue tasks before requests get 503
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "2"))
+INFERENCE_QUEUE = int(os.getenv("INFERENCE_QUEUE", "16"))
+IO_WORKERS = int(os.getenv("IO_WORKERS", "8"))
+IO_QUEUE = int(os.getenv("IO_QUEUE", "64"))
+# Micro-batching of /infer/spo2 and /infer/ecg (utils/batching.py): a batch is
+# dispatched at INFER_BATCH_MAX_SIZE items or INFER_BATCH_MAX_WAIT_MS after its first
+INFER_BATCH_MAX_SIZE = int(os.getenv("INFER_BATCH_MAX_SIZE", "32"))
+INFER_BATCH_MAX_WAIT_MS = float(os.getenv("INFER_BATCH_MAX_WAIT_MS", "5"))
+# Records accepted by one bulk /infer/batch request
+INFER_BULK_MAX_RECORDS = int(os.getenv("INFER_BULK_MAX_RECORDS", "200000"))
+# Multimodal fusion (models/fusion.py): default profile name and an optional
+# JSON file with extra weight/threshold profiles
+FUSION_PROFILE = os.getenv("FUSION_PROFILE", "default")
+FUSION_PROFILES_PATH = os.getenv("FUSION_PROFILES_PATH", "")
+# Shard processes per pose-extraction job (1 = sequential)
+VIDEO_POSE_WORKERS = int(os.getenv("VIDEO_POSE_WORKERS", "1"))
+# Pose fast path: downscale width (0 = full resolution), MediaPipe model
+# complexity (0 lite / 1 full / 2 heavy) and torso ROI cropping
+VIDEO_POSE_INFERENCE_WIDTH = int(os.getenv("VIDEO_POSE_INFERENCE_WIDTH", "0"))
+VIDEO_POSE_MODEL_COMPLEXITY = int(os.getenv("VIDEO_POSE_MODEL_COMPLEXITY", "1"))
+VIDEO_POSE_ROI_TRACKING = os.getenv("VIDEO_POSE_ROI_TRACKING", "false").lower() == "true"
+# Live breathing monitor (routers/breathing.py): rolling rate window, flat
+# chest-motion duration that raises a pause event, and status message interval
+BREATHING_WINDOW_SECONDS = float(os.getenv("BREATHING_WINDOW_SECONDS", "30"))
+BREATHING_PAUSE_SECONDS = float(os.getenv("BREATHING_PAUSE_SECONDS", "10"))
+BREATHING_REPORT_SECONDS = float(os.getenv("BREATHING_REPORT_SECONDS", "1"))
+
 # AI/ML Configuration
 MODEL_PATH = os.path.join(os.getcwd(), "models")
 AUDIO_SAMPLE_RATE = 16000
 AUDIO_DURATION = 480  # 8 hours in seconds equivalent
 
+# Parsed ECG/SpO2 recordings (models/signal_cache.py) and how many file content
+# hashes the process remembers (least recently used are forgotten first)
+SIGNAL_CACHE_DIR = os.getenv("SIGNAL_CACHE_DIR", os.path.join(os.getcwd(), ".signal_cache"))
+SIGNAL_CACHE_MAX_DIGESTS = int(os.getenv("SIGNAL_CACHE_MAX_DIGESTS", "4096"))
+
 # Snoring Detection (adrianagaler/Snoring-Detection) integration
 # Provide paths to the frozen TF graph (.pb) and labels file generated by the
 # Snoring-Detection training pipeline (freeze.py). By default, we look under
@@ -55,6 +104,28 @@ SNORING_LABELS_PATH = os.getenv(
 
 SNORING_INPUT_TENSOR = os.getenv("SNORING_INPUT_TENSOR", "wav_data:0")
 SNORING_OUTPUT_TENSOR = os.getenv("SNORING_OUTPUT_TENSOR", "labels_softmax:0")
+# Batch scoring: per-clip fingerprint (MFCC) and the [batch, fingerprint_size]
+# classifier input it is reshaped into by freeze.py. Set either to "" to disable.
+SNORING_FINGERPRINT_TENSOR = os.getenv("SNORING_FINGERPRINT_TENSOR", "Mfcc:0")
+SNORING_BATCH_INPUT_TENSOR = os.getenv("SNORING_BATCH_INPUT_TENSOR", "Reshape:0")
+
+# Long-recording snoring analysis: recordings are resampled to the model rate and
+# cut into overlapping clips. Clips are fed as decoded PCM (skipping WAV
+# re-encoding) when the graph exposes the DecodeWav outputs below.
+SNORING_SAMPLE_RATE = int(os.getenv("SNORING_SAMPLE_RATE", "16000"))
+SNORING_CLIP_SECONDS = float(os.getenv("SNORING_CLIP_SECONDS", "1.0"))
+SNORING_HOP_SECONDS = float(os.getenv("SNORING_HOP_SECONDS", "0.5"))
+SNORING_LABEL = os.getenv("SNORING_LABEL", "snoring")
+SNORING_PCM_TENSOR = os.getenv("SNORING_PCM_TENSOR", "decoded_sample_data:0")
+SNORING_SAMPLE_RATE_TENSOR = os.getenv("SNORING_SAMPLE_RATE_TENSOR", "decoded_sample_data:1")
+
+# Snoring uploads are scored from memory. Set SNORING_PERSIST_UPLOADS=true to
+# keep a copy under uploads/audio; copies older than the retention window (or
+# beyond the file cap, oldest first) are pruned on each new upload.
+SNORING_PERSIST_UPLOADS = os.getenv("SNORING_PERSIST_UPLOADS", "false").lower() == "true"
+SNORING_UPLOAD_DIR = os.path.join(UPLOAD_DIR, "audio")
+SNORING_RETENTION_HOURS = float(os.getenv("SNORING_RETENTION_HOURS", "24"))
+SNORING_RETENTION_MAX_FILES = int(os.getenv("SNORING_RETENTION_MAX_FILES", "500"))
 
 # Feature flags (default off so nothing changes unless explicitly enabled)
 ENABLE_SNORING = os.getenv("ENABLE_SNORING", "false").lower() == "true"
@@ -65,4 +136,7 @@ ENABLE_ML_MODELS = os.getenv("ENABLE_ML_MODELS", "false").lower() == "true"
 SPO2_MODEL_PATH = os.getenv("SPO2_MODEL_PATH", os.path.join(os.path.dirname(__file__), "models", "SpO2_weights.hdf5"))
 ECG_MODEL_PATH = os.getenv("ECG_MODEL_PATH", os.path.join(os.path.dirname(__file__), "models", "ecg_weights.hdf5"))
 
-print(f"SOMNIA Configuration Loaded - Environment: {ENVIRONMENT}")
\ No newline at end of file
+# Startup: model warmup runs in the background after the server starts
+# accepting requests (GET /api/v1/ready reports progress); set false to block
+# startup until models are loaded
+BACKGROUND_WARMUP = os.getenv("BACKGROUND_WARMUP", "true").lower() == "true"
\ No newline at end of file
@@ -11,10 +11,14 @@ import uvicorn
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
-import json
-from pathlib import Path
+import logging
 from backend.utils.auth import get_current_user
-from backend.utils.wearable import summarize_wearable_samples, save_wearable_record, WEARABLE_DIR
+from backend.utils.batching import batcher_stats, get_batcher
+from backend.utils.executors import ExecutorBusy, executor_stats, run_inference, run_io, shutdown_executors
+from backend.utils.telemetry import configure_logging, get_logger, log_event, metrics, stage_timer
+from backend.utils.wearable import summarize_wearable_samples, save_wearable_record
+from backend.utils.wearable_store import get_wearable_store
+from backend.models.fusion import get_fusion_engine
 # === begin: wearable endpoints inserted directly into main.py ===
 from fastapi import Depends
 
@@ -34,25 +38,29 @@ async def upload_wearable(payload: Dict[str, Any] = Body(...), current_user: Dic
       ],
       "summary": {...}  # optional precomputed summary
     }
+    "samples" may also be columnar: {"ts": [...], "hr": [...], "spo2": [...], "hrv": [...]}
     """
     user_id = payload.get("user_id") or current_user.get("id", "demo_user")
     samples = payload.get("samples", [])
-    if not isinstance(samples, list) or len(samples) == 0:
+    if not isinstance(samples, (list, dict)) or len(samples) == 0:
         raise HTTPException(status_code=400, detail="No wearable samples provided")
 
     # compute summary features
-    summary = summarize_wearable_samples(samples)
-    # persist (simple JSON file)
-    saved = save_wearable_record(user_id, summary, payload)
+    try:
+        summary = await run_inference(summarize_wearable_samples, samples)
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid wearable samples: {e}")
+    # persist (wearable store at DATABASE_URL)
+    saved = await run_io(save_wearable_record, user_id, summary, payload)
 
     # Optionally: fuse with audio result if provided in payload (audio_prob)
     audio_prob = payload.get("audio_prob")
     fused = None
     if audio_prob is not None:
         try:
-            score = 0.6 * float(audio_prob) + 0.4 * summary.get("risk_score", 0.0)
-            level = "high" if score > 0.6 else "moderate" if score > 0.35 else "low"
-            fused = {"fusion_score": round(score, 3), "fusion_level": level}
+            fused = get_fusion_engine("wearable_audio").fuse_one(
+                audio=float(audio_prob), wearable=summary.get("risk_score", 0.0)
+            )
         except Exception:
             fused = None
 
@@ -62,23 +70,18 @@ async def upload_wearable(payload: Dict[str, Any] = Body(...), current_user: Dic
     return response
 
 @wearable_router.get("/wearable/logs")
-async def wearable_logs(limit: int = 20):
+async def wearable_logs(limit: int = 20, user_id: Optional[str] = None):
     """
-    Return recent wearable summary records (basic file-based storage)
+    Return recent wearable summary records, newest first (optionally for one user)
     """
-    files = sorted(Path(WEARABLE_DIR).glob("wearable_*.json"), reverse=True)
-    out = []
-    for f in files[:limit]:
-        try:
-            with open(f, "r", encoding="utf-8") as fh:
-                rec = json.load(fh)
-                out.append({"id": rec.get("id"), "timestamp": rec.get("timestamp"), "summary": rec.get("summary")})
-        except Exception:
-            continue
+    out = await run_io(get_wearable_store().recent, limit=max(0, limit), user_id=user_id)
     return {"count": len(out), "records": out}
 
 # Router registration will happen after app is created below.
 
+configure_logging()
+logger = get_logger("api")
+
 # Import local modules
 from backend.config import API_TITLE, API_DESCRIPTION, API_VERSION, ALLOWED_ORIGINS
 from backend.models.sleep_analyzer import analyze_sleep_audio, detect_sleep_disorders
@@ -105,31 +108,37 @@ app.add_middleware(
 # Include wearable endpoints defined above
 app.include_router(wearable_router)
 
-# Initialize ML Models if enabled
-from backend.config import ENABLE_SNORING, ENABLE_VIDEO_POSE, ENABLE_ML_MODELS
+# Resumable chunked audio uploads
+from backend.routers.audio_upload import router as audio_upload_router, ingest_upload
+app.include_router(audio_upload_router)
+
+# Single and bulk model inference (/infer/spo2, /infer/ecg, /infer/multimodal, /infer/batch)
+from backend.routers.inference import router as inference_router
+app.include_router(inference_router)
+
+# Live breathing monitor over a websocket pose feed (NumPy only)
+from backend.routers.breathing import router as breathing_router
+app.include_router(breathing_router)
+
+# Model warmup and optional feature routers
+from backend.config import ENABLE_SNORING, ENABLE_VIDEO_POSE, ENABLE_ML_MODELS, BACKGROUND_WARMUP, ENVIRONMENT
+from backend.models.warmup import model_warmup
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize ML models on startup if enabled"""
-    if ENABLE_ML_MODELS:
-        try:
-            from backend.models import inference
-            from backend.config import SPO2_MODEL_PATH, ECG_MODEL_PATH
-            print(f"🤖 Initializing ML models...")
-            print(f"  - SpO2 model: {SPO2_MODEL_PATH}")
-            print(f"  - ECG model: {ECG_MODEL_PATH}")
-            inference.init_models(spo2_path=SPO2_MODEL_PATH, ecg_path=ECG_MODEL_PATH)
-            print(f"✅ ML models initialized successfully")
-        except Exception as e:
-            print(f"⚠️ ML models initialization failed (will use mock mode): {e}")
-    else:
-        print(f"ℹ️ ML models disabled - using mock mode")
-    
-    print("==================================================")
-    print("SOMNIA Sleep Health Monitoring System")
-    print("Team: Chimpanzini Bananini")
-    print(f"Starting up at {datetime.now()}")
-    print("==================================================")
+    """Check storage settings, then start model warmup (in the background by default) when ENABLE_ML_MODELS is on"""
+    from backend.utils.wearable_store import configured_path
+    try:
+        configured_path()
+    except ValueError as e:
+        # Fail at startup rather than with a 500 on the first wearable upload
+        log_event(logger, logging.ERROR, "invalid_database_url", error=str(e))
+        raise RuntimeError(f"Invalid DATABASE_URL: {e}") from e
+    from backend.config import SPO2_MODEL_PATH, ECG_MODEL_PATH
+    model_warmup.start(spo2_path=SPO2_MODEL_PATH, ecg_path=ECG_MODEL_PATH, background=BACKGROUND_WARMUP,
+                       enabled=ENABLE_ML_MODELS)
+    log_event(logger, logging.INFO, "startup", service="SOMNIA API", version=API_VERSION, environment=ENVIRONMENT,
+              ml_models=ENABLE_ML_MODELS, background_warmup=BACKGROUND_WARMUP)
 
 # Conditionally register optional feature routers so default behavior is unchanged
 
@@ -138,14 +147,14 @@ if ENABLE_VIDEO_POSE:
         from backend.routers.video_pose import router as video_pose_router  # type: ignore
         app.include_router(video_pose_router)
     except Exception as e:
-        print(f"[Optional] Video Pose router not loaded: {e}")
+        log_event(logger, logging.WARNING, "optional_router_not_loaded", router="video_pose", error=str(e))
 
 if ENABLE_SNORING:
     try:
         from backend.routers.snoring import router as snoring_router  # type: ignore
         app.include_router(snoring_router)
     except Exception as e:
-        print(f"[Optional] Snoring router not loaded: {e}")
+        log_event(logger, logging.WARNING, "optional_router_not_loaded", router="snoring", error=str(e))
 
 # ==================== DATA MODELS ====================
 
@@ -212,29 +221,54 @@ async def upload_audio_file(
     file: UploadFile = File(...),
     current_user: dict = Depends(get_current_user)
 ):
-    """Upload audio recording for sleep analysis"""
+    """
+    Upload audio recording for sleep analysis
+    
+    The file is streamed to disk in bounded chunks (and WAV audio analyzed as it
+    arrives); large or unreliable uploads should use the resumable
+    /api/v1/upload/audio/sessions endpoints instead.
+    """
+    user_id = current_user.get("id", "demo_user")
     try:
-        if not file.filename.endswith(('.wav', '.mp3', '.m4a', '.flac')):
-            raise HTTPException(status_code=400, detail="Invalid audio format")
-        
-        file_id = f"audio_{datetime.now().timestamp()}"
-        return {
-            "file_id": file_id,
-            "filename": file.filename,
-            "message": "Audio file uploaded successfully",
-            "user_id": current_user.get("id", "demo_user")
-        }
+        result = await ingest_upload(file, user_id)
+    except (HTTPException, ExecutorBusy):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error uploading file: {str(e)}")
+    return {
+        **result,
+        "message": "Audio file uploaded successfully",
+        "user_id": user_id
+    }
+
+def _resolve_audio_upload(file_id: str) -> Dict:
+    """Completed upload record for ``file_id`` (404 unknown, 409 still uploading)"""
+    from backend.utils.uploads import UploadNotFound, UploadStateError, get_upload_store
+    store = get_upload_store()
+    try:
+        store.resolve(file_id)
+        return store.get(file_id)
+    except UploadNotFound:
+        raise HTTPException(status_code=404, detail=f"Audio file {file_id} not found")
+    except UploadStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 @app.post("/api/v1/analyze", response_model=AnalysisResult, tags=["Analysis"])
 async def analyze_sleep(
     data: SleepData
 ):
     """Analyze sleep data from multiple modalities with ML model integration (demo mode - no auth required)"""
+    audio_record = _resolve_audio_upload(data.audio_file_id) if data.audio_file_id else None
     try:
-        # Generate base analysis (audio processing)
-        analysis_result = analyze_sleep_audio(None)
+        # Generate base analysis (audio processing); uploads analyzed while they
+        # arrived reuse that result
+        with stage_timer("analyze.audio", logger, audio_file_id=data.audio_file_id):
+            if audio_record is not None and audio_record.get("analysis"):
+                analysis_result = dict(audio_record["analysis"])
+            elif audio_record is not None and audio_record["filename"].lower().endswith(".wav"):
+                analysis_result = await run_inference(analyze_sleep_audio, audio_record["path"])
+            else:
+                analysis_result = analyze_sleep_audio(None)
         
         # Extract wearable data if available
         spo2_data = data.wearable_data.get('spo2_data') if data.wearable_data else None
@@ -243,16 +277,17 @@ async def analyze_sleep(
         # If ML models are enabled and wearable data is available, use real predictions
         if ENABLE_ML_MODELS and (spo2_data or heart_rate_data):
             try:
-                from backend.models import inference
-                
+                # Predictions go through the shared micro-batchers, so concurrent
+                # analyses share one forward pass per model
                 # SpO2 Analysis
                 if spo2_data:
                     spo2_features = {
                         "avg_spo2": sum(spo2_data) / len(spo2_data) if spo2_data else 98.0,
                         "min_spo2": min(spo2_data) if spo2_data else 95.0,
                     }
-                    spo2_result = inference.predict_spo2(spo2_features)
-                    print(f"🩺 SpO2 Analysis: {spo2_result}")
+                    with stage_timer("analyze.spo2", logger) as fields:
+                        spo2_result = await get_batcher("spo2").submit(spo2_features)
+                        fields.update(spo2_result)
                     
                     # Adjust apnea events based on SpO2 prediction
                     if spo2_result["label"] == "low":
@@ -271,8 +306,9 @@ async def analyze_sleep(
                         "avg_hr": avg_hr,
                         "rmssd": rmssd,
                     }
-                    ecg_result = inference.predict_ecg(ecg_features)
-                    print(f"❤️ ECG Analysis: {ecg_result}")
+                    with stage_timer("analyze.ecg", logger) as fields:
+                        ecg_result = await get_batcher("ecg").submit(ecg_features)
+                        fields.update(ecg_result)
                     
                     # Adjust risk based on ECG prediction
                     if ecg_result["label"] == "abnormal":
@@ -281,14 +317,17 @@ async def analyze_sleep(
                         elif analysis_result["risk_assessment"] == "moderate":
                             analysis_result["risk_assessment"] = "high"
                 
+            except ExecutorBusy:
+                raise
             except Exception as e:
-                print(f"⚠️ ML model inference failed, using mock mode: {e}")
-        
-        # Detect disorders
-        disorders = detect_sleep_disorders(analysis_result)
+                log_event(logger, logging.WARNING, "ml_inference_failed", fallback="mock", error=str(e))
         
-        # Generate recommendations
-        report = generate_sleep_report(analysis_result, disorders)
+        with stage_timer("analyze.report", logger):
+            # Detect disorders
+            disorders = detect_sleep_disorders(analysis_result)
+            
+            # Generate recommendations
+            report = generate_sleep_report(analysis_result, disorders)
         
         return {
             "sleep_efficiency": analysis_result["sleep_efficiency"],
@@ -299,9 +338,33 @@ async def analyze_sleep(
             "recommendations": report["recommendations"],
             "disorders_detected": disorders
         }
+    except ExecutorBusy:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
+@app.get("/api/v1/metrics", tags=["Health"])
+def get_metrics():
+    """Per-stage timing metrics (count, total, mean and max duration)"""
+    return {"stages": metrics.snapshot(), "timestamp": datetime.now().isoformat()}
+
+@app.get("/api/v1/executors", tags=["Health"])
+def get_executors():
+    """Inference and I/O pool load (running/queued tasks, rejections, wait and run times) and micro-batch sizes"""
+    return {"executors": executor_stats(), "batchers": batcher_stats(), "timestamp": datetime.now().isoformat()}
+
+@app.get("/api/v1/ready", tags=["Health"])
+def readiness():
+    """Readiness probe: 200 once model warmup has finished, 503 while it is still running"""
+    status = model_warmup.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+@app.get("/api/v1/models", tags=["Health"])
+def get_models():
+    """Models resident in the shared registry and their approximate memory use"""
+    from backend.models.registry import registry
+    return registry.stats()
+
 @app.get("/api/v1/disorders", tags=["Information"])
 def get_sleep_disorders() -> dict:
     """Get information about all sleep disorders SOMNIA can detect"""
@@ -427,6 +490,16 @@ async def http_exception_handler(request, exc):
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail, "timestamp": datetime.now().isoformat()},
+        headers=getattr(exc, "headers", None),
+    )
+
+@app.exception_handler(ExecutorBusy)
+async def executor_busy_handler(request, exc):
+    """Back-pressure: a full inference or I/O pool rejects new work with 503"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc), "pool": exc.name, "timestamp": datetime.now().isoformat()},
+        headers={"Retry-After": "1"},
     )
 
 @app.exception_handler(Exception)
@@ -442,7 +515,8 @@ async def general_exception_handler(request, exc):
 @app.on_event("shutdown")
 async def shutdown_event():
     """Shutdown event"""
-    print("SOMNIA API shutting down...")
+    shutdown_executors()
+    log_event(logger, logging.INFO, "shutdown", service="SOMNIA API")
 
 # ==================== MAIN ====================
 
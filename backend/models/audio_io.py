@@ -0,0 +1,193 @@
+"""
+Audio I/O Helpers
+Decode PCM WAV recordings into float32 NumPy arrays without extra dependencies.
+Team: Chimpanzini Bananini
+"""
+
+import io
+import struct
+import wave
+from pathlib import Path
+from typing import Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+WavSource = Union[bytes, bytearray, memoryview, str, Path]
+
+
+def _pcm_to_float(raw: bytes, sample_width: int) -> np.ndarray:
+    """Convert little-endian PCM bytes to float32 in [-1, 1)."""
+    if sample_width == 1:
+        # 8-bit WAV is unsigned
+        return (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    if sample_width == 2:
+        return np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    if sample_width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        ints = np.where(ints & 0x800000, ints - (1 << 24), ints)
+        return ints.astype(np.float32) / float(1 << 23)
+    if sample_width == 4:
+        return np.frombuffer(raw, dtype="<i4").astype(np.float32) / float(1 << 31)
+    raise ValueError(f"Unsupported WAV sample width: {sample_width} bytes")
+
+
+def decode_wav(source: WavSource) -> Tuple[np.ndarray, int]:
+    """
+    Decode a PCM WAV file or buffer to mono float32.
+
+    Args:
+        source: WAV bytes or a path to a .wav file
+
+    Returns:
+        Tuple of (samples in [-1, 1], sample rate in Hz)
+    """
+    with _open(source) as handle, wave.open(handle, "rb") as wav:
+        sample_rate = wav.getframerate()
+        samples = _to_mono(_pcm_to_float(wav.readframes(wav.getnframes()), wav.getsampwidth()), wav.getnchannels())
+    return samples, sample_rate
+
+
+def read_wav_blocks(source: WavSource, block_seconds: float = 60.0) -> Iterator[Tuple[np.ndarray, int]]:
+    """
+    Decode a PCM WAV incrementally.
+
+    Yields (mono float32 block, sample rate) tuples of at most ``block_seconds``
+    each, so an overnight recording never has to be decoded in one piece.
+    """
+    with _open(source) as handle, wave.open(handle, "rb") as wav:
+        channels = wav.getnchannels()
+        sample_width = wav.getsampwidth()
+        sample_rate = wav.getframerate()
+        block_frames = max(1, int(block_seconds * sample_rate))
+        while True:
+            raw = wav.readframes(block_frames)
+            if not raw:
+                return
+            yield _to_mono(_pcm_to_float(raw, sample_width), channels), sample_rate
+
+
+def _open(source: WavSource):
+    return open(source, "rb") if isinstance(source, (str, Path)) else io.BytesIO(bytes(source))
+
+
+def _to_mono(samples: np.ndarray, channels: int) -> np.ndarray:
+    if channels > 1:
+        samples = samples[: samples.shape[0] - samples.shape[0] % channels]
+        samples = samples.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+    return samples
+
+
+def resample(samples: np.ndarray, orig_rate: int, target_rate: int) -> np.ndarray:
+    """Linear-interpolation resampling (adequate for detection-level features)."""
+    if orig_rate == target_rate or samples.size == 0:
+        return np.asarray(samples, dtype=np.float32)
+    n_out = int(round(samples.shape[0] * target_rate / orig_rate))
+    positions = np.arange(n_out, dtype=np.float64) * (orig_rate / target_rate)
+    return np.interp(positions, np.arange(samples.shape[0]), samples).astype(np.float32)
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int) -> bytes:
+    """Encode mono float32 samples in [-1, 1] as 16-bit PCM WAV bytes."""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def rms_db(samples: np.ndarray, floor_db: float = -120.0) -> float:
+    """RMS level in dB relative to full scale (dBFS)."""
+    if samples.size == 0:
+        return floor_db
+    rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float64))))
+    return max(floor_db, 20.0 * np.log10(rms)) if rms > 0 else floor_db
+
+
+class WavStreamDecoder:
+    """
+    Incremental PCM WAV decoder for bytes that arrive in arbitrary pieces.
+
+    ``feed`` parses the RIFF header as soon as enough bytes are buffered and
+    then returns the mono float32 samples completed by each piece; partial
+    sample frames are carried to the next call. Only the header and at most
+    one sample frame are ever buffered.
+    """
+
+    _PCM_FORMATS = (1, 0xFFFE)  # WAVE_FORMAT_PCM, WAVE_FORMAT_EXTENSIBLE
+
+    def __init__(self):
+        self.sample_rate: Optional[int] = None
+        self.channels: Optional[int] = None
+        self.sample_width: Optional[int] = None
+        self.samples_decoded = 0
+        self._buffer = bytearray()
+        self._riff_checked = False
+        self._skip = 0
+        self._data_remaining: Optional[int] = None
+
+    @property
+    def header_parsed(self) -> bool:
+        return self._data_remaining is not None
+
+    def feed(self, data: bytes) -> np.ndarray:
+        self._buffer += data
+        if not self.header_parsed and not self._parse_header():
+            return np.empty(0, dtype=np.float32)
+
+        block_align = self.channels * self.sample_width
+        usable = min(len(self._buffer), self._data_remaining)
+        usable -= usable % block_align
+        if usable == 0:
+            return np.empty(0, dtype=np.float32)
+        raw = bytes(self._buffer[:usable])
+        del self._buffer[:usable]
+        self._data_remaining -= usable
+        if self._data_remaining == 0:
+            # Trailing RIFF chunks (LIST, cue, ...) are not audio
+            self._buffer.clear()
+        samples = _to_mono(_pcm_to_float(raw, self.sample_width), self.channels)
+        self.samples_decoded += samples.shape[0]
+        return samples
+
+    def _parse_header(self) -> bool:
+        """Consume header chunks up to the start of 'data'; False if more bytes are needed."""
+        buf = self._buffer
+        if not self._riff_checked:
+            if len(buf) < 12:
+                return False
+            if buf[:4] != b"RIFF" or buf[8:12] != b"WAVE":
+                raise ValueError("Not a RIFF/WAVE file")
+            del buf[:12]
+            self._riff_checked = True
+
+        while True:
+            if self._skip:
+                skipped = min(self._skip, len(buf))
+                del buf[:skipped]
+                self._skip -= skipped
+                if self._skip:
+                    return False
+            if len(buf) < 8:
+                return False
+            chunk_id = bytes(buf[:4])
+            size = struct.unpack("<I", buf[4:8])[0]
+            if chunk_id == b"data":
+                if self.sample_rate is None:
+                    raise ValueError("WAV 'data' chunk before 'fmt ' chunk")
+                del buf[:8]
+                # Streaming writers leave the size as 0 or 0xFFFFFFFF until the end
+                self._data_remaining = size if 0 < size < 0xFFFFFFFF else float("inf")
+                return True
+            if chunk_id == b"fmt ":
+                if len(buf) < 8 + size:
+                    return False
+                fmt, channels, rate, _, _, bits = struct.unpack("<HHIIHH", buf[8:24])
+                if fmt not in self._PCM_FORMATS:
+                    raise ValueError(f"Unsupported WAV encoding (format tag {fmt}); only PCM is supported")
+                self.channels, self.sample_rate, self.sample_width = channels, rate, bits // 8
+            del buf[:8]
+            self._skip = size + (size & 1)
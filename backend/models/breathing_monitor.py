@@ -0,0 +1,247 @@
+"""
+Real-time Breathing Monitor
+Online breathing-rate and breathing-pause estimation from a live chest-motion
+feed (per-frame pose keypoints streamed by the app, see routers/breathing.py).
+Team: Chimpanzini Bananini
+
+Unlike ``summarize_motion`` in extract_pose_features.py, which smooths and
+peak-picks a finished recording, every sample here costs O(1) work:
+
+- the chest's vertical position is band-passed with two exponential moving
+  averages (a fast one to suppress keypoint jitter, a slow one as baseline);
+- a breath is counted each time the band-passed signal rises through an
+  adaptive hysteresis band (a fraction of its running amplitude);
+- breath times live in a fixed-size ring buffer, from which the rolling
+  breaths-per-minute over the last ``window_seconds`` is read;
+- a pause event is raised when no breath has been seen for ``pause_seconds``
+  (chest motion stayed flat) and closed, with its duration, at the next breath.
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# MediaPipe Pose landmark indices (shoulders and hips) averaged into the chest point
+TORSO_LANDMARKS = (11, 12, 23, 24)
+
+PAUSE_START = "pause_start"
+PAUSE_END = "pause_end"
+
+
+class RingBuffer:
+    """Fixed-capacity FIFO of floats in a preallocated array; oldest values are overwritten."""
+
+    def __init__(self, capacity: int):
+        self._data = np.zeros(max(1, int(capacity)), dtype=np.float64)
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, value: float) -> None:
+        capacity = self._data.shape[0]
+        self._data[(self._head + self._size) % capacity] = value
+        if self._size < capacity:
+            self._size += 1
+        else:
+            self._head = (self._head + 1) % capacity
+
+    def popleft(self) -> float:
+        if not self._size:
+            raise IndexError("pop from an empty RingBuffer")
+        value = float(self._data[self._head])
+        self._head = (self._head + 1) % self._data.shape[0]
+        self._size -= 1
+        return value
+
+    @property
+    def first(self) -> float:
+        return float(self._data[self._head])
+
+    @property
+    def last(self) -> float:
+        return float(self._data[(self._head + self._size - 1) % self._data.shape[0]])
+
+    def values(self) -> np.ndarray:
+        idx = (self._head + np.arange(self._size)) % self._data.shape[0]
+        return self._data[idx]
+
+
+def chest_from_landmarks(landmarks: Sequence, min_visibility: float = 0.5) -> float:
+    """
+    Chest height (normalized y) from one frame of pose landmarks, or NaN.
+
+    ``landmarks`` is the full MediaPipe list (33 entries), each ``[x, y]``,
+    ``[x, y, visibility]`` or ``{"x": .., "y": .., "visibility": ..}``.
+    """
+    try:
+        points = [landmarks[i] for i in TORSO_LANDMARKS]
+    except (IndexError, KeyError, TypeError):
+        return math.nan
+    ys = []
+    for p in points:
+        if isinstance(p, dict):
+            y, visibility = p.get("y"), p.get("visibility", 1.0)
+        else:
+            y, visibility = (p[1] if len(p) > 1 else None), (p[2] if len(p) > 2 else 1.0)
+        if y is None or visibility is None or visibility < min_visibility:
+            return math.nan
+        ys.append(float(y))
+    return sum(ys) / len(ys)
+
+
+class BreathingRateEstimator:
+    """
+    Streaming breathing-rate and pause detector, one chest sample at a time.
+
+    sample_rate: nominal frames per second, used when samples carry no timestamp
+    window_seconds: span of the rolling breaths-per-minute estimate
+    pause_seconds: flat-motion duration that raises a ``pause_start`` event
+    min_amplitude: hysteresis floor (normalized image units) below which chest
+        movement counts as flat, so keypoint jitter is not read as breathing
+    max_rate_bpm: breaths closer together than this rate allows are ignored
+    """
+
+    def __init__(self, sample_rate: float = 30.0, window_seconds: float = 30.0, pause_seconds: float = 10.0,
+                 min_amplitude: float = 0.0005, max_rate_bpm: float = 90.0,
+                 smooth_seconds: float = 0.2, baseline_seconds: float = 8.0, hysteresis: float = 0.3):
+        for name, value in (("sample_rate", sample_rate), ("window_seconds", window_seconds),
+                            ("pause_seconds", pause_seconds), ("max_rate_bpm", max_rate_bpm)):
+            if not (math.isfinite(value) and value > 0):
+                raise ValueError(f"{name} must be a positive number, got {value}")
+        self.sample_rate = float(sample_rate)
+        self.window_seconds = float(window_seconds)
+        self.pause_seconds = float(pause_seconds)
+        self.min_amplitude = float(min_amplitude)
+        self.min_interval = 60.0 / float(max_rate_bpm)
+        self.smooth_seconds = float(smooth_seconds)
+        self.baseline_seconds = float(baseline_seconds)
+        self.hysteresis = float(hysteresis)
+
+        self._breaths = RingBuffer(int(self.window_seconds / self.min_interval) + 2)
+        self.samples = 0
+        self.breath_count = 0
+        self.time = 0.0
+        self._smooth = self._baseline = None
+        self._envelope = 0.0
+        self._armed = False
+        self._last_valid = None
+        self._last_breath = None
+        self._pause_start = None
+
+    @property
+    def rate_bpm(self) -> float:
+        """Breaths per minute over the last ``window_seconds`` (0 until two breaths are seen or while paused)."""
+        n = len(self._breaths)
+        if n < 2 or self._pause_start is not None:
+            return 0.0
+        span = self._breaths.last - self._breaths.first
+        return 60.0 * (n - 1) / span if span > 0 else 0.0
+
+    @property
+    def flat_seconds(self) -> float:
+        """Time since the last breath (or since tracking started)."""
+        if self._last_breath is None:
+            return 0.0
+        return max(0.0, self.time - self._last_breath)
+
+    @property
+    def paused(self) -> bool:
+        return self._pause_start is not None
+
+    def state(self) -> Dict:
+        return {
+            "time": round(self.time, 3),
+            "rate_bpm": round(self.rate_bpm, 2),
+            "breaths": self.breath_count,
+            "flat_seconds": round(self.flat_seconds, 2),
+            "paused": self.paused,
+        }
+
+    def _alpha(self, dt: float, tau: float) -> float:
+        return 1.0 - math.exp(-dt / tau) if tau > 0 else 1.0
+
+    def update(self, chest_y: float, timestamp: Optional[float] = None) -> List[Dict]:
+        """
+        Add one sample (NaN = no detection) and return the events it triggered.
+
+        Frames without a detection only advance the clock; filters and the
+        pause check run on tracked frames, so losing the sleeper is not
+        reported as a pause while they are out of view.
+        """
+        self.time = float(timestamp) if timestamp is not None else self.samples / self.sample_rate
+        self.samples += 1
+        t = self.time
+        if chest_y is None or math.isnan(chest_y):
+            return []
+
+        if self._smooth is None:
+            self._smooth = self._baseline = float(chest_y)
+            self._last_valid = self._last_breath = t
+            return []
+        dt = max(t - self._last_valid, 1e-6)
+        self._last_valid = t
+        self._smooth += self._alpha(dt, self.smooth_seconds) * (chest_y - self._smooth)
+        self._baseline += self._alpha(dt, self.baseline_seconds) * (self._smooth - self._baseline)
+        band = self._smooth - self._baseline
+        self._envelope += self._alpha(dt, self.window_seconds / 3) * (abs(band) - self._envelope)
+        threshold = max(self.min_amplitude, self.hysteresis * self._envelope)
+
+        events = []
+        if band < -threshold:
+            self._armed = True
+        elif band > threshold and self._armed:
+            self._armed = False
+            if t - self._last_breath >= self.min_interval or self.breath_count == 0:
+                events.extend(self._breath(t))
+
+        # Drop breaths that slid out of the rate window
+        while len(self._breaths) and self._breaths.first < t - self.window_seconds:
+            self._breaths.popleft()
+
+        if self._pause_start is None and t - self._last_breath >= self.pause_seconds:
+            self._pause_start = self._last_breath
+            events.append({"type": PAUSE_START, "time": round(t, 3), "start": round(self._pause_start, 3)})
+        return events
+
+    def _breath(self, t: float) -> List[Dict]:
+        events = []
+        if self._pause_start is not None:
+            events.append({
+                "type": PAUSE_END, "time": round(t, 3), "start": round(self._pause_start, 3),
+                "duration": round(t - self._pause_start, 3),
+            })
+            self._pause_start = None
+            # Breaths before the pause say nothing about the rate after it
+            while len(self._breaths):
+                self._breaths.popleft()
+        self._breaths.append(t)
+        self._last_breath = t
+        self.breath_count += 1
+        return events
+
+    def feed(self, chest_y: np.ndarray, timestamps: Optional[np.ndarray] = None) -> List[Dict]:
+        """Run a block of samples through ``update`` (e.g. a replayed frame store)."""
+        events = []
+        if timestamps is None:
+            for value in np.asarray(chest_y, dtype=np.float64).tolist():
+                events.extend(self.update(value))
+        else:
+            for value, ts in zip(np.asarray(chest_y, dtype=np.float64).tolist(),
+                                 np.asarray(timestamps, dtype=np.float64).tolist()):
+                events.extend(self.update(value, ts))
+        return events
+
+
+def monitor_frames(frames: Dict[str, np.ndarray], **kwargs) -> Dict:
+    """
+    Replay stored pose frames (``frame_store.load_frames``) through the estimator.
+
+    Returns the final state plus every pause event, for comparing the live
+    monitor against offline extraction of the same video.
+    """
+    estimator = BreathingRateEstimator(**kwargs)
+    events = estimator.feed(frames["chest_y"], frames.get("timestamp"))
+    return {**estimator.state(), "events": events}
@@ -0,0 +1,109 @@
+"""
+Event Timeline Extraction
+Turns per-window probabilities into discrete events (apnea, snoring, breathing
+pauses) with start/end times, and derives per-hour event rates such as AHI.
+Team: Chimpanzini Bananini
+
+Everything is vectorized over the window axis, so an 8-hour recording with
+tens of thousands of windows is processed in well under a millisecond.
+"""
+
+from typing import Dict, NamedTuple, Tuple
+
+import numpy as np
+
+
+class EventTimeline(NamedTuple):
+    """Detected events as parallel arrays (times in seconds from recording start)."""
+    start: np.ndarray
+    end: np.ndarray
+    peak: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.start.shape[0])
+
+    @property
+    def duration(self) -> np.ndarray:
+        return self.end - self.start
+
+    def to_dict(self) -> Dict:
+        """JSON-friendly representation with summary statistics."""
+        durations = self.duration
+        return {
+            "count": len(self),
+            "total_seconds": round(float(durations.sum()), 2),
+            "longest_seconds": round(float(durations.max()), 2) if len(self) else 0.0,
+            "start": np.round(self.start, 2).tolist(),
+            "end": np.round(self.end, 2).tolist(),
+            "peak": np.round(self.peak, 4).tolist(),
+        }
+
+
+def timeline_from_dict(data: Dict) -> EventTimeline:
+    """Inverse of ``EventTimeline.to_dict`` (e.g. for analysis results stored as JSON)."""
+    return EventTimeline(np.asarray(data["start"], dtype=np.float64), np.asarray(data["end"], dtype=np.float64),
+                         np.asarray(data["peak"], dtype=np.float32))
+
+
+def empty_timeline() -> EventTimeline:
+    return EventTimeline(np.empty(0), np.empty(0), np.empty(0, dtype=np.float32))
+
+
+def find_runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Start (inclusive) and end (exclusive) indices of consecutive True runs.
+
+    Example: [0, 1, 1, 0, 1] -> starts [1, 4], ends [3, 5]
+    """
+    mask = np.asarray(mask, dtype=bool).ravel()
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def extract_events(
+    probabilities: np.ndarray,
+    hop_seconds: float,
+    window_seconds: float,
+    threshold: float = 0.5,
+    min_duration: float = 10.0,
+) -> EventTimeline:
+    """
+    Threshold window probabilities and merge adjacent positive windows into events.
+
+    Window ``i`` covers ``[i * hop_seconds, i * hop_seconds + window_seconds)``,
+    so a run of positive windows ``a..b`` spans from the start of window ``a``
+    to the end of window ``b``. Events shorter than ``min_duration`` are dropped.
+
+    Args:
+        probabilities: Per-window probabilities, shape (n,) or (n, 1)
+        hop_seconds: Time between consecutive window starts
+        window_seconds: Length of one window
+        threshold: Probability above which a window is positive
+        min_duration: Minimum event length in seconds (10 s for apnea)
+
+    Returns:
+        EventTimeline with start, end and peak probability per event
+    """
+    probs = np.asarray(probabilities, dtype=np.float32).ravel()
+    if probs.size == 0:
+        return empty_timeline()
+
+    starts, ends = find_runs(probs > threshold)
+    if starts.size == 0:
+        return empty_timeline()
+
+    start_s = starts * float(hop_seconds)
+    end_s = (ends - 1) * float(hop_seconds) + float(window_seconds)
+    # Each reduceat segment runs to the next event start; the samples after a
+    # run are below threshold, so the segment max is the run's peak.
+    peak = np.maximum.reduceat(probs, starts)
+
+    keep = (end_s - start_s) >= min_duration
+    return EventTimeline(start_s[keep], end_s[keep], peak[keep])
+
+
+def events_per_hour(timeline: EventTimeline, duration_seconds: float) -> float:
+    """Event rate normalized to one hour of recording (e.g. AHI)."""
+    if duration_seconds <= 0:
+        return 0.0
+    return len(timeline) * 3600.0 / float(duration_seconds)
@@ -1,24 +1,33 @@
 """
 Extract pose keypoints using MediaPipe Pose and compute chest-motion features.
-Saves per-frame CSV and a summary JSON for each video.
+Saves per-frame features as a columnar frame store (see frame_store.py; CSV
+optional with --csv) and a summary JSON for each video.
 
 Usage:
   # from repo root
   python backend/models/extract_pose_features.py --video data/video/normal/example1.mp4 --out_dir data/video_features --sample_rate 2
 
 Dependencies:
-  mediapipe, opencv-python-headless, numpy, pandas, scipy
+  mediapipe, opencv-python-headless, numpy, scipy
 """
 import argparse
+import multiprocessing
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
 from pathlib import Path
 import cv2
 import numpy as np
 import mediapipe as mp
-import pandas as pd
 import json
 from scipy.signal import find_peaks
 from scipy.ndimage import gaussian_filter1d
 
+try:
+    from backend.models.frame_store import FrameColumns, FrameStoreWriter, export_csv
+    from backend.models.pose_motion import compute_motion, crop_to_frame, plan_shards, torso_box
+except ImportError:  # running as a standalone script from backend/models
+    from frame_store import FrameColumns, FrameStoreWriter, export_csv
+    from pose_motion import compute_motion, crop_to_frame, plan_shards, torso_box
+
 mp_pose = mp.solutions.pose
 
 # MediaPipe Pose landmark indices of interest
@@ -27,65 +36,197 @@ RIGHT_SHOULDER = 12
 LEFT_HIP = 23
 RIGHT_HIP = 24
 
-def extract_pose_chest_motion(video_path: str, sample_rate: int = 1):
+def _torso_points(results):
+    """(xs, ys, mean visibility) of the shoulder/hip landmarks, or None when no pose was found."""
+    if not results.pose_landmarks:
+        return None
+    lm = results.pose_landmarks.landmark
+    try:
+        points = [lm[i] for i in (LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP)]
+    except Exception:
+        return None
+    xs = np.array([p.x for p in points], dtype=np.float64)
+    ys = np.array([p.y for p in points], dtype=np.float64)
+    return xs, ys, float(sum(p.visibility for p in points) / 4.0)
+
+def _resize_for_inference(frame, inference_width):
+    """Downscale to ``inference_width`` pixels wide (landmarks are normalized, so unaffected)."""
+    h, w = frame.shape[:2]
+    if not inference_width or w <= inference_width:
+        return frame
+    return cv2.resize(frame, (inference_width, max(1, round(h * inference_width / w))), interpolation=cv2.INTER_AREA)
+
+def _crop(frame, box):
+    h, w = frame.shape[:2]
+    x0, y0, x1, y1 = box
+    return frame[int(y0 * h):max(int(y0 * h) + 1, int(round(y1 * h))),
+                 int(x0 * w):max(int(x0 * w) + 1, int(round(x1 * w)))]
+
+def _extract_range(video_path, start_frame=0, end_frame=None, sample_rate=1, progress=None, sink=None,
+                   inference_width=None, model_complexity=1, roi_tracking=False):
+    """
+    Pose the sampled frames in ``[start_frame, end_frame)`` (0-based; end None =
+    to the end of the video) with a dedicated Pose instance.
+
+    Skipped frames are only grabbed (demuxed), never decoded. Sampled frames can
+    be downscaled to ``inference_width`` and, with ``roi_tracking``, cropped to
+    the torso box of the previous detection (falling back to the full frame
+    when the crop loses the pose).
+
+    Per-frame values go into preallocated typed column buffers; full buffers
+    are passed to ``sink`` (e.g. FrameStoreWriter.write) when given.
+
+    Returns (columns, fps, total_frames): columns maps frame, timestamp,
+    chest_x, chest_y and visibility to arrays (empty if everything went to
+    ``sink``); frame numbers are 1-based.
+    """
     cap = cv2.VideoCapture(str(video_path))
     if not cap.isOpened():
         raise RuntimeError(f"Cannot open video: {video_path}")
 
     fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
-    frame_idx = 0
-    prev_chest = None
-    motion_list = []
-    frames_info = []
-
-    pose = mp_pose.Pose(static_image_mode=False, min_detection_confidence=0.5, model_complexity=1)
-
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        frame_idx += 1
-        if (frame_idx - 1) % sample_rate != 0:
-            continue
-
-        # convert to RGB for mediapipe
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = pose.process(rgb)
-
-        if results.pose_landmarks:
-            lm = results.pose_landmarks.landmark
-            try:
-                chest_x = float((lm[LEFT_SHOULDER].x + lm[RIGHT_SHOULDER].x + lm[LEFT_HIP].x + lm[RIGHT_HIP].x) / 4.0)
-                chest_y = float((lm[LEFT_SHOULDER].y + lm[RIGHT_SHOULDER].y + lm[LEFT_HIP].y + lm[RIGHT_HIP].y) / 4.0)
-                visibility = float((lm[LEFT_SHOULDER].visibility + lm[RIGHT_SHOULDER].visibility + lm[LEFT_HIP].visibility + lm[RIGHT_HIP].visibility)/4.0)
-            except Exception:
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+    if start_frame:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+    frame_idx = start_frame
+    rows = FrameColumns(sink=sink)
+    roi = None
+
+    pose = mp_pose.Pose(static_image_mode=False, min_detection_confidence=0.5, model_complexity=model_complexity)
+    try:
+        while end_frame is None or frame_idx < end_frame:
+            if not cap.grab():
+                break
+            frame_idx += 1
+            if progress is not None:
+                progress(frame_idx - start_frame, max(total_frames, frame_idx) - start_frame)
+            if (frame_idx - 1) % sample_rate != 0:
+                continue
+            ret, frame = cap.retrieve()
+            if not ret:
+                break
+
+            points = None
+            if roi is not None:
+                crop = _resize_for_inference(_crop(frame, roi), inference_width)
+                points = _torso_points(pose.process(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)))
+                if points is not None:
+                    xs, ys = crop_to_frame(points[0], points[1], roi)
+                    points = (xs, ys, points[2])
+            if points is None:
+                # convert to RGB for mediapipe
+                rgb = cv2.cvtColor(_resize_for_inference(frame, inference_width), cv2.COLOR_BGR2RGB)
+                points = _torso_points(pose.process(rgb))
+
+            if points is None:
                 chest_x, chest_y, visibility = np.nan, np.nan, 0.0
-        else:
-            chest_x, chest_y, visibility = np.nan, np.nan, 0.0
-
-        # compute motion magnitude vs previous valid point
-        if prev_chest is not None and not np.isnan(chest_x) and not np.isnan(chest_y):
-            motion = float(np.linalg.norm(np.array([chest_x, chest_y]) - np.array(prev_chest)))
-        else:
-            motion = 0.0
-
-        if not np.isnan(chest_x) and not np.isnan(chest_y):
-            prev_chest = (chest_x, chest_y)
-
-        ts = (frame_idx - 1) / fps
-        frames_info.append({
-            "frame": frame_idx,
-            "timestamp": ts,
-            "chest_x": chest_x,
-            "chest_y": chest_y,
-            "visibility": visibility,
-            "motion": motion
-        })
-        motion_list.append(motion)
-
-    pose.close()
+                roi = None
+            else:
+                xs, ys, visibility = points
+                chest_x, chest_y = float(xs.mean()), float(ys.mean())
+                roi = torso_box(xs, ys) if roi_tracking else None
+            rows.append(frame_idx, (frame_idx - 1) / fps, chest_x, chest_y, visibility)
+    finally:
+        pose.close()
+        cap.release()
+    return rows.arrays(), fps, total_frames
+
+# Frames read across all shard workers (set by _init_shard_worker)
+_shard_counter = None
+
+def _init_shard_worker(counter):
+    global _shard_counter
+    _shard_counter = counter
+
+def _extract_shard(video_path, start_frame, end_frame, sample_rate, options):
+    seen, reported = [0], [0]
+
+    def progress(done, _total):
+        seen[0] = done
+        # Batch counter updates: the shared value takes a lock per update
+        if done - reported[0] >= 50:
+            with _shard_counter.get_lock():
+                _shard_counter.value += done - reported[0]
+            reported[0] = done
+
+    columns, _, _ = _extract_range(video_path, start_frame, end_frame, sample_rate, progress, **options)
+    with _shard_counter.get_lock():
+        _shard_counter.value += seen[0] - reported[0]
+    return columns
+
+def _extract_sharded(video_path, sample_rate, workers, progress=None, sink=None, **options):
+    """Pose ``workers`` time ranges in parallel processes and concatenate them in order."""
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open video: {video_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
     cap.release()
-    return frames_info, motion_list, fps
+
+    shards = plan_shards(total_frames, sample_rate, workers)
+    if len(shards) <= 1:
+        # Frame count unknown (some streams) or too short to split
+        columns, fps, _ = _extract_range(video_path, sample_rate=sample_rate, progress=progress, sink=sink, **options)
+        return columns, fps
+
+    ctx = multiprocessing.get_context("spawn")  # MediaPipe/OpenCV state does not survive fork
+    counter = ctx.Value("q", 0)
+    with ProcessPoolExecutor(max_workers=len(shards), mp_context=ctx,
+                             initializer=_init_shard_worker, initargs=(counter,)) as pool:
+        # The container's frame count is an estimate: the last shard reads to EOF
+        ends = [b for _, b in shards[:-1]] + [None]
+        futures = [
+            pool.submit(_extract_shard, str(video_path), a, end, sample_rate, options)
+            for (a, _), end in zip(shards, ends)
+        ]
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=0.5, return_when=FIRST_EXCEPTION)
+            if progress is not None:
+                progress(min(counter.value, total_frames), total_frames)
+        parts = [future.result() for future in futures]
+    # Shards come back in time order; append them like one sequential pass
+    merged = FrameColumns(sink=sink)
+    for part in parts:
+        merged.extend(part)
+    return merged.arrays(), fps
+
+def extract_pose_chest_motion(video_path: str, sample_rate: int = 1, progress=None, workers: int = 1,
+                              inference_width=None, model_complexity: int = 1, roi_tracking: bool = False,
+                              writer=None):
+    """
+    Per-frame chest position and motion for a video.
+
+    Returns (columns, fps). Without ``writer``, columns holds frame, timestamp,
+    chest_x, chest_y, visibility and motion arrays. With a FrameStoreWriter,
+    frame columns are streamed to disk as they fill (memory stays bounded by
+    one buffer), motion is written as a column too, and columns holds only
+    the motion array.
+
+    progress: optional callable(frames_read, total_frames) (total_frames is the
+    container's estimate)
+    workers: > 1 splits the video into that many frame ranges (aligned to
+    sample_rate), each seeked to with CAP_PROP_POS_FRAMES and posed in its own
+    process with its own Pose instance; records are merged in timestamp order
+    and motion is computed over the merged sequence. Pose tracking restarts at
+    each shard start, which only affects the first detection of a shard.
+    inference_width: downscale frames to this width before pose (None = full size)
+    model_complexity: MediaPipe Pose model (0 = lite, 1 = full, 2 = heavy)
+    roi_tracking: crop each frame to the torso box of the previous detection
+    """
+    options = dict(inference_width=inference_width, model_complexity=model_complexity, roi_tracking=roi_tracking)
+    sink = writer.write if writer is not None else None
+    if workers > 1:
+        columns, fps = _extract_sharded(video_path, sample_rate, workers, progress, sink=sink, **options)
+    else:
+        columns, fps, _ = _extract_range(video_path, sample_rate=sample_rate, progress=progress, sink=sink, **options)
+
+    if writer is None:
+        columns["motion"] = compute_motion(columns["chest_x"], columns["chest_y"]).astype(np.float32)
+        return columns, fps
+    motion = compute_motion(writer.read_column("chest_x"), writer.read_column("chest_y")).astype(np.float32)
+    writer.write_column("motion", motion)
+    return {"motion": motion}, fps
 
 def summarize_motion(motion_list, fps, sample_rate=1):
     if len(motion_list) == 0:
@@ -112,32 +253,69 @@ def summarize_motion(motion_list, fps, sample_rate=1):
         "duration_seconds": duration_seconds
     }
 
-def run_on_video(video_path: str, out_dir: str, sample_rate: int = 1):
+def run_on_video(video_path: str, out_dir: str, sample_rate: int = 1, progress=None, workers: int = 1,
+                 write_csv: bool = False, **pose_options):
+    """
+    Extract pose features for a video into ``out_dir``.
+
+    Returns (frames_dir, json_path): the columnar frame store
+    ``<stem>_frames/`` (read it with frame_store.load_frames) and the summary
+    JSON. ``write_csv`` additionally exports ``<stem>_frames.csv``.
+    """
     video_path = Path(video_path)
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    frames_info, motion_list, fps = extract_pose_chest_motion(str(video_path), sample_rate=sample_rate)
-    df = pd.DataFrame(frames_info)
-    csv_path = out_dir / f"{video_path.stem}_frames.csv"
-    df.to_csv(csv_path, index=False)
+    frames_dir = out_dir / f"{video_path.stem}_frames"
+    writer = FrameStoreWriter(frames_dir)
+    columns, fps = extract_pose_chest_motion(
+        str(video_path), sample_rate=sample_rate, progress=progress, workers=workers, writer=writer, **pose_options
+    )
+    writer.close(fps=fps, sample_rate=sample_rate, video=video_path.name)
+    print(f"Saved frame store to: {frames_dir}")
+    if write_csv:
+        csv_path = export_csv(frames_dir, out_dir / f"{video_path.stem}_frames.csv")
+        print(f"Saved frames CSV to: {csv_path}")
 
-    summary = summarize_motion(motion_list, fps, sample_rate)
+    summary = summarize_motion(columns["motion"], fps, sample_rate)
     json_path = out_dir / f"{video_path.stem}_summary.json"
     with open(json_path, "w", encoding="utf-8") as f:
         json.dump(summary, f, indent=2)
 
-    print(f"Saved frames CSV to: {csv_path}")
     print(f"Saved summary JSON to: {json_path}")
-    return csv_path, json_path
+    return frames_dir, json_path
+
+def pose_job(params, progress):
+    """Background job target (see backend/utils/jobs.py) wrapping run_on_video."""
+    frames_dir, json_path = run_on_video(
+        params["video_path"], params["out_dir"], sample_rate=params.get("sample_rate", 1),
+        write_csv=params.get("write_csv", False),
+        progress=progress, workers=params.get("workers", 1),
+        inference_width=params.get("inference_width"),
+        model_complexity=params.get("model_complexity", 1),
+        roi_tracking=params.get("roi_tracking", False),
+    )
+    with open(json_path, "r", encoding="utf-8") as f:
+        summary = json.load(f)
+    result = {"frames_dir": str(frames_dir), "summary_json": str(json_path), "summary": summary}
+    if params.get("write_csv"):
+        result["frames_csv"] = str(Path(params["out_dir"]) / f"{Path(params['video_path']).stem}_frames.csv")
+    return result
 
 def main():
     parser = argparse.ArgumentParser(description="Extract chest-motion features from a video using MediaPipe.")
     parser.add_argument("--video", required=True, help="Path to input video (mp4)")
     parser.add_argument("--out_dir", required=True, help="Output directory to save CSV/JSON")
     parser.add_argument("--sample_rate", type=int, default=2, help="Process every n-th frame (default=2)")
+    parser.add_argument("--workers", type=int, default=1, help="Parallel shard processes (default=1)")
+    parser.add_argument("--inference_width", type=int, default=None, help="Downscale frames to this width for pose")
+    parser.add_argument("--model_complexity", type=int, default=1, choices=(0, 1, 2), help="MediaPipe Pose model (default=1)")
+    parser.add_argument("--roi_tracking", action="store_true", help="Crop to the last detected torso box")
+    parser.add_argument("--csv", action="store_true", help="Also export the per-frame CSV")
     args = parser.parse_args()
-    run_on_video(args.video, args.out_dir, sample_rate=args.sample_rate)
+    run_on_video(args.video, args.out_dir, sample_rate=args.sample_rate, workers=args.workers, write_csv=args.csv,
+                 inference_width=args.inference_width, model_complexity=args.model_complexity,
+                 roi_tracking=args.roi_tracking)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
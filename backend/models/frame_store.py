@@ -0,0 +1,215 @@
+"""
+Columnar Frame Store
+Compact on-disk storage for per-frame pose features: one raw little-endian
+binary file per column plus ``meta.json``, readable back as memory-mapped
+NumPy arrays for downstream breathing analysis.
+Team: Chimpanzini Bananini
+
+Layout of a frame store directory::
+
+    meta.json        {"version": 1, "rows": n, "columns": {"frame": "<i4", ...}, ...}
+    frame.bin        n x int32
+    timestamp.bin    n x float64
+    chest_x.bin      n x float32
+    ...
+
+Rows are appended in chunks while a video is processed, so memory stays
+bounded by one chunk; ``meta.json`` is written last (atomically), so a
+directory without it is an incomplete extraction.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+# Column name -> on-disk dtype (explicit little-endian so files are portable)
+FRAME_COLUMNS = {
+    "frame": np.dtype("<i4"),
+    "timestamp": np.dtype("<f8"),
+    "chest_x": np.dtype("<f4"),
+    "chest_y": np.dtype("<f4"),
+    "visibility": np.dtype("<f4"),
+    "motion": np.dtype("<f4"),
+}
+# Columns filled while posing frames; motion is derived afterwards
+POSE_COLUMNS = ("frame", "timestamp", "chest_x", "chest_y", "visibility")
+
+
+class FrameColumns:
+    """
+    Preallocated typed arrays for per-frame pose values.
+
+    ``append`` writes into fixed-capacity buffers; when a buffer fills it is
+    handed to ``sink`` (e.g. ``FrameStoreWriter.write``) if one is given,
+    otherwise kept in memory for ``arrays()``.
+    """
+
+    def __init__(self, capacity: int = 4096, sink=None, columns=POSE_COLUMNS):
+        self.capacity = capacity
+        self.sink = sink
+        self.columns = tuple(columns)
+        self.rows = 0
+        self._chunks = []
+        self._new_buffers()
+
+    def _new_buffers(self) -> None:
+        self._buffers = {name: np.empty(self.capacity, dtype=FRAME_COLUMNS[name]) for name in self.columns}
+        self._n = 0
+
+    def append(self, *values) -> None:
+        i = self._n
+        for name, value in zip(self.columns, values):
+            self._buffers[name][i] = value
+        self._n += 1
+        self.rows += 1
+        if self._n == self.capacity:
+            self.flush()
+
+    def extend(self, columns: Dict[str, np.ndarray]) -> None:
+        """Add an already-built chunk (e.g. one shard's arrays) after the buffered rows."""
+        self.flush()
+        self.rows += len(columns[self.columns[0]])
+        if self.sink is not None:
+            self.sink(columns)
+        else:
+            self._chunks.append(columns)
+
+    def flush(self) -> None:
+        if self._n == 0:
+            return
+        filled = {name: buf[:self._n] for name, buf in self._buffers.items()}
+        if self.sink is not None:
+            self.sink(filled)
+        else:
+            self._chunks.append(filled)
+        self._new_buffers()
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """All rows not handed to a sink, as one array per column."""
+        self.flush()
+        return {
+            name: (np.concatenate([c[name] for c in self._chunks]) if self._chunks
+                   else np.empty(0, dtype=FRAME_COLUMNS[name]))
+            for name in self.columns
+        }
+
+
+class FrameStoreWriter:
+    """Append column chunks to a frame store directory; ``close`` writes meta.json."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Invalidate any previous extraction before overwriting its columns
+        (self.directory / "meta.json").unlink(missing_ok=True)
+        for name in FRAME_COLUMNS:
+            (self.directory / f"{name}.bin").unlink(missing_ok=True)
+        self.rows = 0
+        self._files = {}
+
+    def _file(self, name: str):
+        if name not in self._files:
+            self._files[name] = open(self.directory / f"{name}.bin", "wb")
+        return self._files[name]
+
+    def write(self, columns: Dict[str, np.ndarray]) -> None:
+        lengths = {len(v) for v in columns.values()}
+        if len(lengths) != 1:
+            raise ValueError("All columns in a chunk must have the same length")
+        for name, values in columns.items():
+            self._file(name).write(np.ascontiguousarray(values, dtype=FRAME_COLUMNS[name]).tobytes())
+        self.rows += lengths.pop()
+
+    def flush(self) -> None:
+        for f in self._files.values():
+            f.flush()
+
+    def read_column(self, name: str) -> np.ndarray:
+        """Read back a column written so far (e.g. to derive motion from chest_x/chest_y)."""
+        self.flush()
+        return np.fromfile(self.directory / f"{name}.bin", dtype=FRAME_COLUMNS[name], count=self.rows)
+
+    def write_column(self, name: str, values: np.ndarray) -> None:
+        """Write a whole derived column (e.g. motion) of ``rows`` values."""
+        if len(values) != self.rows:
+            raise ValueError(f"Column {name} has {len(values)} values, expected {self.rows}")
+        with open(self.directory / f"{name}.bin", "wb") as f:
+            f.write(np.ascontiguousarray(values, dtype=FRAME_COLUMNS[name]).tobytes())
+
+    def close(self, **meta) -> Path:
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+        present = [name for name in FRAME_COLUMNS if (self.directory / f"{name}.bin").exists()]
+        record = {
+            "version": FORMAT_VERSION,
+            "rows": self.rows,
+            "columns": {name: FRAME_COLUMNS[name].str for name in present},
+            **meta,
+        }
+        path = self.directory / "meta.json"
+        tmp = path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2)
+        os.replace(tmp, path)
+        return path
+
+
+def read_meta(directory) -> Dict:
+    path = Path(directory) / "meta.json"
+    if not path.exists():
+        raise FileNotFoundError(f"No frame store at {directory} (missing meta.json)")
+    with open(path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported frame store version: {meta.get('version')}")
+    return meta
+
+
+def load_frames(directory, mmap: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Columns of a frame store as arrays (read-only memory maps by default).
+
+    Memory maps cost nothing until accessed, so a night of frames can be
+    sliced or reduced without reading every column into RAM.
+    """
+    directory = Path(directory)
+    meta = read_meta(directory)
+    rows = meta["rows"]
+    columns = {}
+    for name, dtype in meta["columns"].items():
+        path = directory / f"{name}.bin"
+        if rows == 0:
+            columns[name] = np.empty(0, dtype=dtype)
+        elif mmap:
+            columns[name] = np.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+        else:
+            columns[name] = np.fromfile(path, dtype=dtype, count=rows)
+    return columns
+
+
+def export_csv(directory, csv_path, chunk_rows: int = 65536) -> Path:
+    """Write a frame store as CSV (header + rows), streaming ``chunk_rows`` at a time."""
+    columns = load_frames(directory)
+    names = [name for name in FRAME_COLUMNS if name in columns]
+    rows = len(columns[names[0]]) if names else 0
+    csv_path = Path(csv_path)
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        f.write(",".join(names) + "\n")
+        for start in range(0, rows, chunk_rows):
+            chunk = [_csv_strings(np.asarray(columns[name][start:start + chunk_rows])) for name in names]
+            f.writelines(",".join(row) + "\n" for row in zip(*chunk))
+    return csv_path
+
+
+def _csv_strings(values: np.ndarray) -> np.ndarray:
+    # Shortest round-trip text per dtype (0.01 stays "0.01" for float32); NaN -> empty
+    text = values.astype(str)
+    if values.dtype.kind == "f":
+        text[np.isnan(values)] = ""
+    return text
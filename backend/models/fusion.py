@@ -0,0 +1,129 @@
+"""
+Multimodal Fusion Engine
+Weighted fusion of per-modality risk scores (audio, video, wearable) into one
+score and a low / moderate / high level, shared by the API and offline cohort
+analysis.
+Team: Chimpanzini Bananini
+
+Scores are arrays with NaN marking a missing modality. Each row's weights are
+renormalized over the modalities it actually has, so a night without video is
+scored on audio and wearable alone instead of as if video were 0.0. Rows with
+no modality at all get a NaN score and the ``unknown`` level. Because of this
+the weights are relative: {"audio": 2, "wearable": 2} scores the same as
+{"audio": 0.5, "wearable": 0.5}, and the score stays on the 0..1 scale of the
+inputs whatever the weights sum to.
+
+Weights and level thresholds come from named profiles; the built-in ones can
+be extended or overridden from a JSON file (FUSION_PROFILES_PATH)::
+
+    {"profiles": {"pediatric": {"weights": {"audio": 0.3, "video": 0.5, "wearable": 0.2},
+                                "thresholds": {"high": 0.5, "moderate": 0.3}}}}
+"""
+
+import json
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+MODALITIES = ("audio", "video", "wearable")
+LEVELS = np.array(["low", "moderate", "high", "unknown"])
+
+
+class FusionProfile(NamedTuple):
+    """Modality weights plus the scores above which a row is high / moderate."""
+    weights: Dict[str, float]
+    high: float = 0.6
+    moderate: float = 0.35
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "FusionProfile":
+        weights = {m: float(w) for m, w in (data.get("weights") or {}).items()}
+        unknown = set(weights) - set(MODALITIES)
+        if unknown or not weights:
+            raise ValueError(f"Fusion weights must be a non-empty subset of {MODALITIES}, got {sorted(weights)}")
+        if any(w < 0 for w in weights.values()):
+            raise ValueError("Fusion weights must be non-negative")
+        if sum(weights.values()) <= 0:
+            raise ValueError("Fusion weights must not all be zero")
+        thresholds = data.get("thresholds") or {}
+        high, moderate = float(thresholds.get("high", 0.6)), float(thresholds.get("moderate", 0.35))
+        if moderate >= high:
+            raise ValueError(f"The moderate threshold ({moderate}) must be below the high threshold ({high})")
+        return cls(weights, high, moderate)
+
+
+PROFILES: Dict[str, FusionProfile] = {
+    "default": FusionProfile({"audio": 0.5, "video": 0.2, "wearable": 0.3}),
+    # Wearable upload fused with an app-side audio probability (no video)
+    "wearable_audio": FusionProfile({"audio": 0.6, "wearable": 0.4}),
+}
+
+
+def load_profiles(path) -> Dict[str, FusionProfile]:
+    """Built-in profiles updated with those defined in the JSON file at ``path``."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    profiles = dict(PROFILES)
+    for name, spec in (data.get("profiles") or {}).items():
+        profiles[name] = FusionProfile.from_dict(spec)
+    return profiles
+
+
+class FusionEngine:
+    """Vectorized weighted fusion for one profile."""
+
+    def __init__(self, profile: FusionProfile = PROFILES["default"]):
+        self.profile = profile
+
+    def fuse(self, scores: Mapping[str, object]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fuse modality score arrays (equal length, NaN = missing; absent keys are
+        all missing). Returns (score float64 array, level string array).
+        """
+        arrays = {m: np.asarray(scores[m], dtype=np.float64) for m in MODALITIES if scores.get(m) is not None}
+        n = next(iter(arrays.values())).shape[0] if arrays else 0
+        num = np.zeros(n)
+        den = np.zeros(n)
+        for modality, weight in self.profile.weights.items():
+            x = arrays.get(modality)
+            if x is None or weight == 0:
+                continue
+            present = ~np.isnan(x)
+            num += weight * np.where(present, x, 0.0)
+            den += weight * present
+        with np.errstate(invalid="ignore", divide="ignore"):
+            score = num / den  # NaN where no weighted modality is present
+        codes = (score > self.profile.moderate).astype(np.int8) + (score > self.profile.high)
+        codes[np.isnan(score)] = 3
+        return score, LEVELS[codes]
+
+    def fuse_one(self, audio: Optional[float] = None, video: Optional[float] = None,
+                 wearable: Optional[float] = None) -> Dict:
+        """Single-row fusion: {"fusion_score": float | None, "fusion_level": str}."""
+        values = {"audio": audio, "video": video, "wearable": wearable}
+        score, level = self.fuse({m: [np.nan if v is None else float(v)] for m, v in values.items()})
+        s = float(score[0])
+        return {"fusion_score": None if np.isnan(s) else round(s, 3), "fusion_level": str(level[0])}
+
+
+_PROFILES: Optional[Dict[str, FusionProfile]] = None
+
+
+def get_profiles() -> Dict[str, FusionProfile]:
+    """Built-in profiles plus FUSION_PROFILES_PATH, loaded once."""
+    global _PROFILES
+    if _PROFILES is None:
+        from backend.config import FUSION_PROFILES_PATH
+        _PROFILES = load_profiles(FUSION_PROFILES_PATH) if FUSION_PROFILES_PATH else dict(PROFILES)
+    return _PROFILES
+
+
+def get_fusion_engine(profile: Optional[str] = None) -> FusionEngine:
+    """Engine for a named profile (FUSION_PROFILE when None); KeyError if unknown."""
+    if profile is None:
+        from backend.config import FUSION_PROFILE
+        profile = FUSION_PROFILE
+    profiles = get_profiles()
+    if profile not in profiles:
+        raise KeyError(f"Unknown fusion profile: {profile}")
+    return FusionEngine(profiles[profile])
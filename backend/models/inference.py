@@ -1,35 +1,67 @@
 import os
 import json
 import traceback
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 USE_MOCK = os.getenv("USE_MOCK", "true").lower() in ("1", "true", "yes")
 
-# Lazy load to avoid heavy import at module import time
+# Models are loaded lazily through the shared registry (models/registry.py), so
+# repeated init_models calls and SleepApneaInference reuse the same instances.
 _tf_loaded = False
 SPO2_MODEL = None
 ECG_MODEL = None
+# Pre-traced tf.function wrappers (see model_executor); None -> Model.predict
+SPO2_EXECUTOR = None
+ECG_EXECUTOR = None
+_HANDLES: Dict[str, Any] = {}
 
 def _try_load_keras_model(path: str):
+    """Acquire a shared registry handle; None if any load error (missing file, incompatible TF version)."""
     global _tf_loaded
     try:
-        # Import inside function to avoid requiring TF for mock-only runs
-        from tensorflow.keras.models import load_model  # type: ignore
+        from .registry import registry
+        handle = registry.acquire(path)
         _tf_loaded = True
-        model = load_model(path)
-        return model
+        return handle
     except Exception:
-        # Return None if any load error (missing file, incompatible TF version)
         return None
 
+def _try_build_executor(handle):
+    if handle is None:
+        return None
+    try:
+        return handle.executor()
+    except Exception:
+        # Fall back to Model.predict if the model cannot be traced
+        traceback.print_exc()
+        return None
+
+def _run_model(model, executor, arr):
+    if executor is not None:
+        return executor(arr)
+    return model.predict(arr, verbose=0)
+
+def _swap_handle(name: str, handle):
+    old = _HANDLES.pop(name, None)
+    if handle is not None:
+        _HANDLES[name] = handle
+    if old is not None:
+        old.release()
+
 def init_models(spo2_path: Optional[str] = None, ecg_path: Optional[str] = None):
     """Call once at app startup. If load fails, keep models None -> mock mode used."""
-    global SPO2_MODEL, ECG_MODEL
+    global SPO2_MODEL, ECG_MODEL, SPO2_EXECUTOR, ECG_EXECUTOR
     if not USE_MOCK:
         if spo2_path:
-            SPO2_MODEL = _try_load_keras_model(spo2_path)
+            handle = _try_load_keras_model(spo2_path)
+            _swap_handle("spo2", handle)
+            SPO2_MODEL = handle.model if handle is not None else None
+            SPO2_EXECUTOR = _try_build_executor(handle)
         if ecg_path:
-            ECG_MODEL = _try_load_keras_model(ecg_path)
+            handle = _try_load_keras_model(ecg_path)
+            _swap_handle("ecg", handle)
+            ECG_MODEL = handle.model if handle is not None else None
+            ECG_EXECUTOR = _try_build_executor(handle)
 
 def _mock_spo2_predict(features: Dict[str, Any]) -> Dict[str, Any]:
     # deterministic-ish mock using simple heuristics, make it look realistic
@@ -48,61 +80,157 @@ def _mock_ecg_predict(features: Dict[str, Any]) -> Dict[str, Any]:
     label = "abnormal" if prob > 0.5 else "normal"
     return {"probability": round(prob,3), "label": label, "model":"mock_ecg"}
 
-def predict_spo2(features: Dict[str, Any]) -> Dict[str, Any]:
+def _spo2_vector(features: Dict[str, Any]):
+    X = features.get("X")  # if frontend sends preprocessed array
+    if X is None:
+        # fallback: build a tiny feature vector from available features
+        X = [features.get("avg_spo2", 98.0), features.get("min_spo2", 97.0)]
+    return X
+
+def _ecg_vector(features: Dict[str, Any]):
+    X = features.get("X")
+    if X is None:
+        X = [features.get("rmssd", 30.0), features.get("avg_hr", 70.0)]
+    return X
+
+def _batch_probabilities(model, executor, vectors: List) -> List[float]:
+    """One forward pass per input shape (usually just one) over all feature vectors."""
+    import numpy as np
+    groups: Dict[tuple, List[int]] = {}
+    for i, v in enumerate(vectors):
+        groups.setdefault(np.shape(v), []).append(i)
+    probs = [0.0] * len(vectors)
+    for idx in groups.values():
+        arr = np.array([vectors[i] for i in idx], dtype=np.float32)
+        out = np.asarray(_run_model(model, executor, arr)).reshape(len(idx), -1)
+        for i, p in zip(idx, out[:, 0].tolist()):
+            probs[i] = float(p)
+    return probs
+
+def predict_spo2_batch(features_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
-    features: dict containing precomputed features (avg_spo2, min_spo2, etc.)
-    Returns: {probability, label, model}
+    Batched predict_spo2: one model call for all requests, results in input order.
     """
-    if USE_MOCK:
-        return _mock_spo2_predict(features)
-    if SPO2_MODEL is None:
-        return _mock_spo2_predict(features)
+    if USE_MOCK or SPO2_MODEL is None:
+        return [_mock_spo2_predict(f) for f in features_list]
     try:
         # adapt this if your model expects different shaped input (use the same preprocessing)
-        import numpy as np
-        X = features.get("X")  # if frontend sends preprocessed array
-        if X is None:
-            # fallback: build a tiny feature vector from available features
-            X = [features.get("avg_spo2", 98.0), features.get("min_spo2", 97.0)]
-        arr = np.array([X], dtype=np.float32)
-        p = float(SPO2_MODEL.predict(arr).ravel()[0])
-        label = "low" if p > 0.5 else "normal"
-        return {"probability": round(p,3), "label": label, "model":"spo2_model"}
+        probs = _batch_probabilities(SPO2_MODEL, SPO2_EXECUTOR, [_spo2_vector(f) for f in features_list])
+        return [{"probability": round(p,3), "label": "low" if p > 0.5 else "normal", "model":"spo2_model"}
+                for p in probs]
     except Exception:
+        if len(features_list) > 1:
+            # Score items on their own so one bad payload does not send the whole batch to mock
+            return [result for f in features_list for result in predict_spo2_batch([f])]
         traceback.print_exc()
-        return _mock_spo2_predict(features)
+        return [_mock_spo2_predict(f) for f in features_list]
 
-def predict_ecg(features: Dict[str, Any]) -> Dict[str, Any]:
+def predict_ecg_batch(features_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
-    features: dict containing hr, rmssd, hrv features or preprocessed X
+    Batched predict_ecg: one model call for all requests, results in input order.
     """
-    if USE_MOCK:
-        return _mock_ecg_predict(features)
-    if ECG_MODEL is None:
-        return _mock_ecg_predict(features)
+    if USE_MOCK or ECG_MODEL is None:
+        return [_mock_ecg_predict(f) for f in features_list]
     try:
-        import numpy as np
-        X = features.get("X")
-        if X is None:
-            X = [features.get("rmssd", 30.0), features.get("avg_hr", 70.0)]
-        arr = np.array([X], dtype=np.float32)
-        p = float(ECG_MODEL.predict(arr).ravel()[0])
-        label = "abnormal" if p > 0.5 else "normal"
-        return {"probability": round(p,3), "label": label, "model":"ecg_model"}
+        probs = _batch_probabilities(ECG_MODEL, ECG_EXECUTOR, [_ecg_vector(f) for f in features_list])
+        return [{"probability": round(p,3), "label": "abnormal" if p > 0.5 else "normal", "model":"ecg_model"}
+                for p in probs]
     except Exception:
+        if len(features_list) > 1:
+            # Score items on their own so one bad payload does not send the whole batch to mock
+            return [result for f in features_list for result in predict_ecg_batch([f])]
         traceback.print_exc()
-        return _mock_ecg_predict(features)
+        return [_mock_ecg_predict(f) for f in features_list]
 
-def fuse_modalities(audio_prob: Optional[float], video_score: Optional[float], wearable_risk: Optional[float], weights=None):
+def predict_spo2(features: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Simple configurable fusion. Weights default: audio=0.5, video=0.2, wearable=0.3
-    Returns: {"fusion_score": float, "fusion_level": "low|moderate|high"}
+    features: dict containing precomputed features (avg_spo2, min_spo2, etc.)
+    Returns: {probability, label, model}
     """
+    return predict_spo2_batch([features])[0]
+
+def predict_ecg(features: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    features: dict containing hr, rmssd, hrv features or preprocessed X
+    """
+    return predict_ecg_batch([features])[0]
+
+# Columnar (whole-table) scoring for bulk requests: one array per feature, NaN = missing
+def _column(columns: Dict[str, Any], name: str, n: int):
+    import numpy as np
+    values = columns.get(name)
+    if values is None:
+        return np.full(n, np.nan)
+    return np.asarray(values, dtype=np.float64).reshape(n)
+
+def _present(x, fallback):
+    """``x`` where it is given, else ``fallback`` (array or scalar)."""
+    import numpy as np
+    return np.where(np.isnan(x), fallback, x)
+
+def predict_spo2_columns(columns: Dict[str, Any], n: int):
+    """
+    Vectorized predict_spo2 over feature columns (avg_spo2, min_spo2).
+    Returns (probabilities, model name); the label is probability > 0.5.
+    """
+    import numpy as np
+    avg, low = _column(columns, "avg_spo2", n), _column(columns, "min_spo2", n)
+    if not USE_MOCK and SPO2_MODEL is not None and n:
+        try:
+            X = np.column_stack([_present(avg, 98.0), _present(low, 97.0)]).astype(np.float32)
+            out = np.asarray(_run_model(SPO2_MODEL, SPO2_EXECUTOR, X)).reshape(n, -1)
+            return out[:, 0].astype(np.float64), "spo2_model"
+        except Exception:
+            traceback.print_exc()
+    # same heuristic as _mock_spo2_predict
+    avg = _present(avg, _present(low, 96.0))
+    return np.clip((100.0 - avg) / 20.0, 0.01, 0.99), "mock_spo2"
+
+def predict_ecg_columns(columns: Dict[str, Any], n: int):
+    """
+    Vectorized predict_ecg over feature columns (rmssd, avg_hrv, avg_hr).
+    Returns (probabilities, model name); the label is probability > 0.5.
+    """
+    import numpy as np
+    rmssd, hr = _column(columns, "rmssd", n), _column(columns, "avg_hr", n)
+    if not USE_MOCK and ECG_MODEL is not None and n:
+        try:
+            X = np.column_stack([_present(rmssd, 30.0), _present(hr, 70.0)]).astype(np.float32)
+            out = np.asarray(_run_model(ECG_MODEL, ECG_EXECUTOR, X)).reshape(n, -1)
+            return out[:, 0].astype(np.float64), "ecg_model"
+        except Exception:
+            traceback.print_exc()
+    # same heuristic as _mock_ecg_predict: missing or zero RMSSD falls back to avg_hrv, then 30
+    hrv = _column(columns, "avg_hrv", n)
+    hrv = np.where(np.isnan(hrv) | (hrv == 0), 30.0, hrv)
+    rmssd = np.where(np.isnan(rmssd) | (rmssd == 0), hrv, rmssd)
+    return np.clip((40.0 - rmssd) / 60.0 + 0.1, 0.01, 0.99), "mock_ecg"
+
+def fuse_modalities_columns(audio, video, wearable, weights=None, profile: Optional[str] = None):
+    """
+    Vectorized fuse_modalities over arrays (NaN = missing; weights are
+    renormalized over the modalities present). Returns (scores, levels).
+    """
+    return _fusion_engine(weights, profile).fuse({"audio": audio, "video": video, "wearable": wearable})
+
+def _fusion_engine(weights=None, profile: Optional[str] = None):
+    from .fusion import FusionEngine, FusionProfile, get_fusion_engine
     if weights is None:
-        weights = {"audio":0.5, "video":0.2, "wearable":0.3}
-    audio = float(audio_prob) if audio_prob is not None else 0.0
-    video = float(video_score) if video_score is not None else 0.0
-    wearable = float(wearable_risk) if wearable_risk is not None else 0.0
-    score = audio*weights["audio"] + video*weights["video"] + wearable*weights["wearable"]
-    level = "high" if score > 0.6 else "moderate" if score > 0.35 else "low"
-    return {"fusion_score": round(score,3), "fusion_level": level}
+        return get_fusion_engine(profile)
+    base = get_fusion_engine(profile).profile
+    # Validated like profile weights (ValueError if all zero, negative or unknown)
+    return FusionEngine(FusionProfile.from_dict(
+        {"weights": weights, "thresholds": {"high": base.high, "moderate": base.moderate}}
+    ))
+
+def fuse_modalities(audio_prob: Optional[float], video_score: Optional[float], wearable_risk: Optional[float], weights=None):
+    """
+    Configurable fusion (see models/fusion.py). Weights default to the
+    FUSION_PROFILE profile (audio=0.5, video=0.2, wearable=0.3); missing
+    modalities are left out and the remaining weights renormalized.
+    Caller-supplied weights are relative, i.e. divided by the sum over the
+    modalities present: weights that do not add up to 1 no longer give a plain
+    weighted sum as they did before the fusion engine.
+    Returns: {"fusion_score": float | None, "fusion_level": "low|moderate|high|unknown"}
+    """
+    return _fusion_engine(weights).fuse_one(audio_prob, video_score, wearable_risk)
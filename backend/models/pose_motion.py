@@ -0,0 +1,72 @@
+"""
+Pose Motion Helpers
+Dependency-light (NumPy only) pieces of the video pose pipeline: shard planning
+for parallel extraction and vectorized chest-motion computation.
+Team: Chimpanzini Bananini
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+
+def plan_shards(total_frames: int, sample_rate: int, n_shards: int) -> List[Tuple[int, int]]:
+    """
+    Split ``[0, total_frames)`` into up to ``n_shards`` contiguous frame ranges.
+
+    Every boundary is a multiple of ``sample_rate``, so each shard starts on a
+    sampled frame and the union of the shards samples exactly the frames a
+    single sequential pass would.
+    """
+    if total_frames <= 0:
+        return []
+    sample_rate = max(1, int(sample_rate))
+    n_sampled = -(-total_frames // sample_rate)
+    n_shards = max(1, min(int(n_shards), n_sampled))
+    # Distribute sampled frames as evenly as possible, then map back to frame indices
+    bounds = np.linspace(0, n_sampled, n_shards + 1).round().astype(np.int64) * sample_rate
+    bounds[-1] = total_frames
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def compute_motion(chest_x: np.ndarray, chest_y: np.ndarray) -> np.ndarray:
+    """
+    Per-frame chest displacement from the previous frame with a valid detection.
+
+    Frames without a detection (NaN) and the first valid frame get 0, matching
+    the original sequential loop. Computed over the whole recording at once,
+    so shard boundaries need no special handling.
+    """
+    x = np.asarray(chest_x, dtype=np.float64)
+    y = np.asarray(chest_y, dtype=np.float64)
+    motion = np.zeros(x.shape[0], dtype=np.float64)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    idx = np.flatnonzero(valid)
+    if idx.size > 1:
+        cur, prev = idx[1:], idx[:-1]
+        motion[cur] = np.hypot(x[cur] - x[prev], y[cur] - y[prev])
+    return motion
+
+
+def torso_box(xs, ys, margin: float = 0.5, min_size: float = 0.2) -> Tuple[float, float, float, float]:
+    """
+    Normalized (x0, y0, x1, y1) crop around torso landmarks for ROI tracking.
+
+    The landmark bounding box is grown by ``margin`` of its size on every side
+    (the sleeper moves between frames) and to at least ``min_size`` of the
+    frame, then clipped to the image.
+    """
+    xs, ys = np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)
+    cx, cy = (xs.min() + xs.max()) / 2, (ys.min() + ys.max()) / 2
+    half_w = max((xs.max() - xs.min()) * (0.5 + margin), min_size / 2)
+    half_h = max((ys.max() - ys.min()) * (0.5 + margin), min_size / 2)
+    return (
+        float(max(0.0, cx - half_w)), float(max(0.0, cy - half_h)),
+        float(min(1.0, cx + half_w)), float(min(1.0, cy + half_h)),
+    )
+
+
+def crop_to_frame(x, y, box: Tuple[float, float, float, float]):
+    """Map normalized coordinates inside ``box`` back to full-frame coordinates."""
+    x0, y0, x1, y1 = box
+    return x0 + np.asarray(x) * (x1 - x0), y0 + np.asarray(y) * (y1 - y0)
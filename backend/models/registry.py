@@ -0,0 +1,191 @@
+"""
+Model Registry
+Process-wide cache of loaded Keras models shared by the REST helpers
+(models/inference.py) and SleepApneaInference.
+Team: Chimpanzini Bananini
+
+Models are keyed by resolved path and modification time, loaded lazily at most
+once, and handed out as reference-counted handles. A handle also owns the
+warmed BucketedExecutor(s) for its model, so tracing happens once per process.
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from backend.models.model_executor import DEFAULT_BUCKETS, BucketedExecutor
+except ImportError:  # running as a standalone script from backend/models
+    from model_executor import DEFAULT_BUCKETS, BucketedExecutor
+
+ModelKey = Tuple[str, int]
+
+
+def _load_keras_model(path: str):
+    from tensorflow.keras.models import load_model  # type: ignore
+    return load_model(path, compile=False)
+
+
+def _model_nbytes(model) -> int:
+    """Approximate resident size of a model's weights."""
+    try:
+        return int(sum(int(w.shape.num_elements()) * w.dtype.size for w in model.weights))
+    except Exception:
+        try:
+            return int(model.count_params()) * 4
+        except Exception:
+            return 0
+
+
+class ModelHandle:
+    """Shared reference to a registry entry. Call ``release()`` when done."""
+
+    def __init__(self, registry: "ModelRegistry", entry: "_Entry"):
+        self._registry = registry
+        self._entry = entry
+        self._released = False
+
+    @property
+    def model(self):
+        return self._entry.model
+
+    @property
+    def path(self) -> str:
+        return self._entry.key[0]
+
+    def executor(self, buckets: Sequence[int] = DEFAULT_BUCKETS) -> BucketedExecutor:
+        """Warmed executor for this model (created on first request per bucket set)."""
+        return self._registry.warmup(self.path, buckets)
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._registry._release(self._entry)
+
+    def __enter__(self) -> "ModelHandle":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class _Entry:
+    def __init__(self, key: ModelKey):
+        self.key = key
+        self.model = None
+        self.refcount = 0
+        self.nbytes = 0
+        self.load_seconds = 0.0
+        self.loaded_at: Optional[float] = None
+        self.executors: Dict[Tuple[int, ...], BucketedExecutor] = {}
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    """Load-once, shared, reference-counted model cache."""
+
+    def __init__(self, loader: Callable[[str], object] = _load_keras_model):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._entries: Dict[ModelKey, _Entry] = {}
+        self.loads = 0
+
+    @staticmethod
+    def key_for(path: str) -> ModelKey:
+        resolved = os.path.realpath(path)
+        return resolved, os.stat(resolved).st_mtime_ns
+
+    def _entry_for(self, path: str) -> _Entry:
+        key = self.key_for(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                # A newer file replaces stale, unreferenced versions of the same path
+                for old_key in [k for k, e in self._entries.items() if k[0] == key[0] and e.refcount == 0]:
+                    del self._entries[old_key]
+                entry = self._entries[key] = _Entry(key)
+        # Per-entry lock: concurrent first uses of one model load it once, while
+        # different models load in parallel.
+        with entry.lock:
+            if entry.model is None:
+                start = time.perf_counter()
+                entry.model = self._loader(key[0])
+                entry.load_seconds = time.perf_counter() - start
+                entry.loaded_at = time.time()
+                entry.nbytes = _model_nbytes(entry.model)
+                self.loads += 1
+        return entry
+
+    def acquire(self, path: str) -> ModelHandle:
+        """Return a shared handle to the model at ``path``, loading it if needed."""
+        entry = self._entry_for(path)
+        with self._lock:
+            entry.refcount += 1
+        return ModelHandle(self, entry)
+
+    def _release(self, entry: _Entry) -> None:
+        with self._lock:
+            entry.refcount = max(0, entry.refcount - 1)
+
+    def warmup(self, path: str, buckets: Sequence[int] = DEFAULT_BUCKETS) -> BucketedExecutor:
+        """Load (if needed) and trace every batch bucket for ``path``."""
+        entry = self._entry_for(path)
+        buckets = tuple(sorted(set(int(b) for b in buckets)))
+        with entry.lock:
+            executor = entry.executors.get(buckets)
+            if executor is None:
+                executor = entry.executors[buckets] = BucketedExecutor(entry.model, buckets)
+        return executor
+
+    def evict(self, path: Optional[str] = None, force: bool = False) -> List[str]:
+        """
+        Drop models from the registry.
+
+        Args:
+            path: Model to evict (default: all models)
+            force: Also evict models that still have live handles
+
+        Returns:
+            Paths that were evicted
+        """
+        target = os.path.realpath(path) if path else None
+        evicted = []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if target is not None and key[0] != target:
+                    continue
+                if entry.refcount and not force:
+                    continue
+                del self._entries[key]
+                evicted.append(key[0])
+        return evicted
+
+    def resident(self) -> List[Dict]:
+        """Describe every loaded model and its approximate memory footprint."""
+        with self._lock:
+            entries = [e for e in self._entries.values() if e.model is not None]
+        return [
+            {
+                "path": e.key[0],
+                "mtime_ns": e.key[1],
+                "refcount": e.refcount,
+                "bytes": e.nbytes,
+                "load_seconds": round(e.load_seconds, 3),
+                "loaded_at": e.loaded_at,
+                "warm_buckets": [list(b) for b in e.executors],
+            }
+            for e in entries
+        ]
+
+    def stats(self) -> Dict:
+        models = self.resident()
+        return {
+            "models": models,
+            "count": len(models),
+            "total_bytes": sum(m["bytes"] for m in models),
+            "loads": self.loads,
+        }
+
+
+registry = ModelRegistry()
@@ -0,0 +1,163 @@
+"""
+Signal Loader Cache
+Converts ECG/SpO2 recordings (CSV, NPY, MAT) once into float32 .npy files keyed
+by content hash and serves later loads as read-only memory maps.
+Team: Chimpanzini Bananini
+"""
+
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+SUPPORTED_FORMATS = (".csv", ".npy", ".mat")
+
+# Bump when the conversion logic changes so stale cache entries are ignored
+_CACHE_VERSION = b"somnia-signal-v1"
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+def _config():
+    try:
+        from backend import config
+    except ImportError:  # running as a standalone script from backend/models
+        sys.path.append(str(Path(__file__).resolve().parents[2]))
+        from backend import config
+    return config
+
+
+def _read_source(path: Path) -> np.ndarray:
+    """Parse a recording into a flat float32 array (the slow path)."""
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        import pandas as pd
+        data = pd.read_csv(path).values
+    elif suffix == ".npy":
+        data = np.load(path, mmap_mode="r")
+    elif suffix == ".mat":
+        from scipy.io import loadmat
+        mat_data = loadmat(path)
+        key = [k for k in mat_data.keys() if not k.startswith("__")][0]
+        data = mat_data[key]
+    else:
+        raise ValueError(f"Unsupported format: {path.suffix}")
+    return np.ascontiguousarray(data, dtype=np.float32).ravel()
+
+
+class SignalCache:
+    """
+    Content-addressed, memory-mapped cache of parsed signal files.
+
+    The content hash of a source file is remembered per (path, size, mtime), so
+    repeated loads of an unchanged file neither re-hash nor re-parse it; at most
+    ``max_digests`` hashes are kept, least recently used evicted first.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, max_digests: Optional[int] = None):
+        if cache_dir is None or max_digests is None:
+            config = _config()
+            cache_dir = cache_dir or config.SIGNAL_CACHE_DIR
+            max_digests = config.SIGNAL_CACHE_MAX_DIGESTS if max_digests is None else max_digests
+        self.cache_dir = Path(cache_dir)
+        self.max_digests = max(1, int(max_digests))
+        self.hits = 0
+        self.misses = 0
+        self._digests: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def content_hash(self, path: Union[str, Path]) -> str:
+        """SHA-256 of the file content (plus cache version)."""
+        path = Path(path)
+        st = path.stat()
+        key = (str(path.resolve()), st.st_size, st.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(key)
+            if digest is not None:
+                self._digests.move_to_end(key)
+                return digest
+        h = hashlib.sha256(_CACHE_VERSION)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        with self._lock:
+            self._digests[key] = digest
+            while len(self._digests) > self.max_digests:
+                self._digests.popitem(last=False)
+        return digest
+
+    def entry_path(self, path: Union[str, Path]) -> Path:
+        return self.cache_dir / f"{self.content_hash(path)}.npy"
+
+    def load(self, path: Union[str, Path]) -> np.ndarray:
+        """
+        Load a recording as a flat, read-only float32 memory map.
+
+        Args:
+            path: CSV, NPY or MAT file
+
+        Returns:
+            1-D float32 ``np.memmap`` backed by the cache entry
+        """
+        path = Path(path)
+        if path.suffix.lower() not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported format: {path.suffix}")
+        if not path.exists():
+            raise FileNotFoundError(f"Signal file not found: {path}")
+
+        entry = self.entry_path(path)
+        if entry.exists():
+            with self._lock:
+                self.hits += 1
+            return np.load(entry, mmap_mode="r")
+
+        data = _read_source(path)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a unique temp file and rename so concurrent loaders never
+        # observe a half-written entry.
+        tmp = entry.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, data)
+        os.replace(tmp, entry)
+        with self._lock:
+            self.misses += 1
+        return np.load(entry, mmap_mode="r")
+
+    def clear(self) -> int:
+        """Delete all cache entries; returns the number removed."""
+        removed = 0
+        if self.cache_dir.exists():
+            for entry in self.cache_dir.glob("*.npy"):
+                entry.unlink()
+                removed += 1
+        with self._lock:
+            self._digests.clear()
+        return removed
+
+    def stats(self) -> Dict:
+        entries = list(self.cache_dir.glob("*.npy")) if self.cache_dir.exists() else []
+        lookups = self.hits + self.misses
+        return {
+            "cache_dir": str(self.cache_dir),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(entries),
+            "bytes": sum(e.stat().st_size for e in entries),
+        }
+
+
+_default_cache: Optional[SignalCache] = None
+
+
+def default_cache() -> SignalCache:
+    """Process-wide cache rooted at SIGNAL_CACHE_DIR."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SignalCache()
+    return _default_cache
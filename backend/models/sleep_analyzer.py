@@ -8,18 +8,66 @@ import numpy as np
 import random
 from datetime import datetime
 
+from backend.models.audio_features import (
+    breathing_pauses,
+    bruxism_events,
+    estimate_sleep_stages,
+    features_from_wav,
+    summarize_pauses,
+    summarize_snoring,
+)
+
 def analyze_sleep_audio(audio_data=None):
     """
     Analyze audio data to detect sleep patterns and disorders
-    For mid-submission: generates realistic mock analysis data
+    
+    WAV recordings (bytes or a path) go through the DSP feature pipeline in
+    audio_features; without audio, realistic mock data is generated.
+    
+    Args:
+        audio_data: WAV bytes or path (optional)
+        
+    Returns:
+        dict: Sleep analysis results
+    """
+    if audio_data is None:
+        return _mock_sleep_analysis()
+    return analyze_audio_features(features_from_wav(audio_data))
+
+def analyze_audio_features(features):
+    """
+    Sleep analysis results from precomputed audio features (e.g. computed
+    incrementally while the recording was uploading)
     
     Args:
-        audio_data: Binary audio data (optional)
+        features: AudioFeatures from backend.models.audio_features
         
     Returns:
         dict: Sleep analysis results
     """
-    # Mock analysis with realistic distributions
+    sleep_stages = estimate_sleep_stages(features)
+    total_minutes = max(sum(sleep_stages.values()), 1)
+    sleep_efficiency = round(1 - sleep_stages["wake"] / total_minutes, 2)
+    pauses = breathing_pauses(features)
+    apnea_events = len(pauses)
+
+    return {
+        "sleep_efficiency": sleep_efficiency,
+        "total_sleep_time": round(features.duration_seconds / 3600.0, 1),
+        "recorded_seconds": round(features.duration_seconds, 1),
+        "sleep_stages": sleep_stages,
+        "apnea_events": apnea_events,
+        "risk_assessment": _risk(apnea_events, sleep_efficiency),
+        "analysis_timestamp": datetime.now().isoformat(),
+        "audio_events": {
+            "snoring": summarize_snoring(features),
+            "bruxism": bruxism_events(features).to_dict(),
+            "breathing_pauses": pauses.to_dict(),
+        },
+    }
+
+def _mock_sleep_analysis():
+    """Mock analysis with realistic distributions (no audio supplied)"""
     sleep_efficiency = round(random.uniform(0.75, 0.95), 2)
     total_sleep_time = round(random.uniform(6.0, 8.5), 1)
     
@@ -43,34 +91,61 @@ def analyze_sleep_audio(audio_data=None):
     apnea_baseline = 8 if sleep_efficiency < 0.8 else 3
     apnea_events = int(np.random.poisson(apnea_baseline))
     
-    # Risk assessment
-    if apnea_events > 15 or sleep_efficiency < 0.75:
-        risk = "high"
-    elif apnea_events > 5 or sleep_efficiency < 0.85:
-        risk = "moderate"
-    else:
-        risk = "low"
-    
     return {
         "sleep_efficiency": sleep_efficiency,
         "total_sleep_time": total_sleep_time,
         "sleep_stages": sleep_stages,
         "apnea_events": apnea_events,
-        "risk_assessment": risk,
+        "risk_assessment": _risk(apnea_events, sleep_efficiency),
         "analysis_timestamp": datetime.now().isoformat()
     }
 
+def _risk(apnea_events, sleep_efficiency):
+    """Risk assessment from apnea count and sleep efficiency"""
+    if apnea_events > 15 or sleep_efficiency < 0.75:
+        return "high"
+    elif apnea_events > 5 or sleep_efficiency < 0.85:
+        return "moderate"
+    return "low"
+
 def detect_snoring(audio_segment=None):
-    """Detect snoring patterns (400-800 Hz signature)"""
+    """
+    Detect snoring patterns (400-800 Hz signature)
+    
+    Uses the snoring model's long-recording timeline when WAV bytes are given
+    and the model is configured, otherwise snoring-band energy from the DSP
+    pipeline; returns mock values without audio.
+
+    Loudness comes in two keys with fixed units: ``loudness_dbfs`` is the mean
+    level of snoring segments in dB relative to digital full scale (<= 0),
+    and ``loudness_db`` a sound pressure level in dB SPL. Recordings are not
+    calibrated, so measured audio reports ``loudness_db`` as None.
+    """
+    if audio_segment is not None:
+        from backend.models.snoring_inference import analyze_long_wav, is_configured
+        if is_configured():
+            summary = analyze_long_wav(audio_segment)["summary"]
+            return {
+                "snoring_detected": summary["snoring_episodes"] > 0,
+                "snoring_episodes": summary["snoring_episodes"],
+                "total_snoring_duration_minutes": round(summary["total_snoring_seconds"] / 60.0, 1),
+                "longest_episode_seconds": summary["longest_episode_seconds"],
+                "loudness_db": None,
+                "loudness_dbfs": summary["loudness_dbfs"],
+            }
+        return summarize_snoring(features_from_wav(audio_segment))
     return {
         "snoring_detected": random.choice([True, False]),
         "snoring_episodes": random.randint(0, 20),
         "total_snoring_duration_minutes": random.randint(0, 60),
-        "loudness_db": random.randint(45, 65)
+        "loudness_db": random.randint(45, 65),
+        "loudness_dbfs": random.randint(-40, -20)
     }
 
 def detect_apnea_events(audio_data=None):
     """Detect apnea events (breathing pauses >10 seconds)"""
+    if audio_data is not None:
+        return summarize_pauses(breathing_pauses(features_from_wav(audio_data)))
     return {
         "events_detected": random.randint(0, 30),
         "average_duration_seconds": random.randint(10, 30),
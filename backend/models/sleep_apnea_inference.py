@@ -5,16 +5,61 @@ No API, no server - just pure inference.
 """
 
 import numpy as np
-import pandas as pd
 from pathlib import Path
-from typing import Tuple, Dict, Union, Optional
-import tensorflow as tf
-from tensorflow.keras.models import load_model
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Dict, Union, Optional, Iterable, Iterator, Sequence, Callable
 import json
+import logging
 import warnings
 
+try:
+    from backend.models.events import EventTimeline, events_per_hour, extract_events
+    from backend.models.model_executor import DEFAULT_BUCKETS, BucketedExecutor
+    from backend.models.registry import registry as model_registry
+    from backend.models.signal_cache import SignalCache, default_cache
+    from backend.models.streaming import RunningStats, StreamWindower
+    from backend.models.windowing import PAD_SHORT, default_hop, sliding_windows, zscore
+    from backend.utils.telemetry import get_logger, log_event
+except ImportError:  # running as a standalone script from backend/models
+    import sys
+    sys.path.append(str(Path(__file__).resolve().parent.parent / "utils"))
+    from events import EventTimeline, events_per_hour, extract_events
+    from model_executor import DEFAULT_BUCKETS, BucketedExecutor
+    from registry import registry as model_registry
+    from signal_cache import SignalCache, default_cache
+    from streaming import RunningStats, StreamWindower
+    from windowing import PAD_SHORT, default_hop, sliding_windows, zscore
+    from telemetry import get_logger, log_event
+
 warnings.filterwarnings('ignore')
 
+logger = get_logger("sleep_apnea_inference")
+
+ENSEMBLE_METHODS = ('weighted_average', 'max', 'min', 'majority_vote')
+
+
+def configure_tf_threads(intra_op: Optional[int] = None, inter_op: Optional[int] = None) -> bool:
+    """
+    Set TensorFlow intra-/inter-op thread pool sizes.
+    
+    Must run before the TF runtime initializes (i.e. before the first model is
+    loaded in this process). Returns False if the settings could not be applied.
+    """
+    if intra_op is None and inter_op is None:
+        return True
+    try:
+        import tensorflow as tf  # deferred: TF takes seconds to import
+        if intra_op is not None:
+            tf.config.threading.set_intra_op_parallelism_threads(intra_op)
+        if inter_op is not None:
+            tf.config.threading.set_inter_op_parallelism_threads(inter_op)
+        return True
+    except RuntimeError as e:
+        log_event(logger, logging.WARNING, "tf_threads_not_applied", reason=str(e))
+        return False
+
 
 class SleepApneaInference:
     """
@@ -27,7 +72,15 @@ class SleepApneaInference:
         ecg_model_path: str,
         spo2_model_path: str,
         ecg_weight: float = 0.5,
-        spo2_weight: float = 0.5
+        spo2_weight: float = 0.5,
+        signal_cache: Optional[SignalCache] = None,
+        batch_buckets: Optional[Sequence[int]] = DEFAULT_BUCKETS,
+        parallel_branches: bool = False,
+        intra_op_threads: Optional[int] = None,
+        inter_op_threads: Optional[int] = None,
+        ecg_fs: float = 100.0,
+        event_threshold: float = 0.5,
+        min_event_seconds: float = 10.0
     ):
         """
         Initialize the inference engine with pre-trained models.
@@ -37,20 +90,46 @@ class SleepApneaInference:
             spo2_model_path: Path to SpO2 model HDF5 file
             ecg_weight: Weight for ECG model in ensemble (default 0.5)
             spo2_weight: Weight for SpO2 model in ensemble (default 0.5)
+            signal_cache: Cache used by the file loaders (default: shared cache)
+            batch_buckets: Batch sizes traced at load time for direct model calls;
+                None falls back to ``model.predict``
+            parallel_branches: Run the ECG and SpO2 branches of ``infer``
+                concurrently (default False)
+            intra_op_threads: TensorFlow intra-op thread count (None = TF default)
+            inter_op_threads: TensorFlow inter-op thread count (None = TF default)
+            ecg_fs: ECG sampling rate in Hz; ensemble windows are timed on the ECG axis
+            event_threshold: Window probability above which a window counts as apneic
+            min_event_seconds: Minimum apnea event length (default 10 s)
         """
         self.ecg_model_path = ecg_model_path
         self.spo2_model_path = spo2_model_path
+        self.signal_cache = signal_cache or default_cache()
+        self.parallel_branches = parallel_branches
+        self.ecg_fs = float(ecg_fs)
+        self.event_threshold = event_threshold
+        self.min_event_seconds = min_event_seconds
+        self._branch_pool: Optional[ThreadPoolExecutor] = None
         
         # Normalize ensemble weights
         total = ecg_weight + spo2_weight
         self.ecg_weight = ecg_weight / total
         self.spo2_weight = spo2_weight / total
         
-        # Load models
-        print("Loading pre-trained models...")
+        # Thread pools must be sized before the TF runtime starts (first model load)
+        configure_tf_threads(intra_op_threads, inter_op_threads)
+        
+        # Load models (shared with every other user of the process-wide registry)
+        self._model_handles = []
         self.ecg_model = self._load_model(ecg_model_path, "ECG")
         self.spo2_model = self._load_model(spo2_model_path, "SpO2")
-        print("✓ Models loaded successfully\n")
+        
+        # Trace and warm every batch bucket now so the first request is not slower
+        self.ecg_executor = None
+        self.spo2_executor = None
+        if batch_buckets:
+            self.ecg_executor = model_registry.warmup(ecg_model_path, batch_buckets)
+            self.spo2_executor = model_registry.warmup(spo2_model_path, batch_buckets)
+            log_event(logger, logging.INFO, "models_warmed", buckets=list(self.ecg_executor.buckets))
         
         # AHI severity thresholds
         self.ahi_thresholds = {
@@ -60,89 +139,84 @@ class SleepApneaInference:
         }
 
     def _load_model(self, model_path: str, model_type: str):
-        """Load pre-trained model from HDF5 file."""
+        """Load pre-trained model from HDF5 file (via the shared model registry)."""
         try:
             if not Path(model_path).exists():
                 raise FileNotFoundError(f"{model_type} model not found at {model_path}")
             
-            model = load_model(model_path, compile=False)
-            print(f"  ✓ {model_type} model loaded: {model_path}")
-            print(f"    - Input shape: {model.input_shape}")
-            print(f"    - Output shape: {model.output_shape}")
-            print(f"    - Parameters: {model.count_params():,}")
+            handle = model_registry.acquire(model_path)
+            self._model_handles.append(handle)
+            model = handle.model
+            log_event(
+                logger, logging.INFO, "model_loaded",
+                modality=model_type, path=str(model_path),
+                input_shape=model.input_shape, output_shape=model.output_shape,
+                parameters=model.count_params()
+            )
             
             return model
         except Exception as e:
-            print(f"✗ Error loading {model_type} model: {str(e)}")
+            log_event(logger, logging.ERROR, "model_load_failed", modality=model_type, error=str(e))
+            raise
+
+    def _load_signal(self, data_path: Union[str, Path, np.ndarray, list], label: str) -> np.ndarray:
+        """Load a signal through the memory-mapped signal cache."""
+        try:
+            if isinstance(data_path, (list, np.ndarray)):
+                data = np.asarray(data_path).flatten()
+            else:
+                data = self.signal_cache.load(data_path)
+            
+            log_event(logger, logging.DEBUG, "signal_loaded", modality=label, samples=data.shape[0])
+            return data
+        except Exception as e:
+            log_event(logger, logging.ERROR, "signal_load_failed", modality=label, error=str(e))
             raise
 
     def load_ecg_data(self, data_path: str) -> np.ndarray:
         """
         Load ECG data from file (CSV, NPY, or MAT format).
         
+        The file is parsed once and served from the signal cache afterwards.
+        
         Args:
             data_path: Path to ECG data file
             
         Returns:
-            ECG data as numpy array
+            ECG data as a read-only float32 array
         """
-        data_path = Path(data_path)
-        
-        try:
-            if data_path.suffix == '.csv':
-                data = pd.read_csv(data_path).values.flatten()
-            elif data_path.suffix == '.npy':
-                data = np.load(data_path).flatten()
-            elif data_path.suffix == '.mat':
-                from scipy.io import loadmat
-                mat_data = loadmat(data_path)
-                key = [k for k in mat_data.keys() if not k.startswith('__')][0]
-                data = mat_data[key].flatten()
-            elif isinstance(data_path, (list, np.ndarray)):
-                data = np.array(data_path).flatten()
-            else:
-                raise ValueError(f"Unsupported format: {data_path.suffix}")
-            
-            print(f"ECG data loaded: {data.shape[0]} samples")
-            return data
-        except Exception as e:
-            print(f"✗ Error loading ECG data: {str(e)}")
-            raise
+        return self._load_signal(data_path, "ECG")
 
     def load_spo2_data(self, data_path: str) -> np.ndarray:
         """
         Load SpO2 data from file (CSV, NPY, or MAT format).
         
+        The file is parsed once and served from the signal cache afterwards.
+        
         Args:
             data_path: Path to SpO2 data file
             
         Returns:
-            SpO2 data as numpy array
+            SpO2 data as a read-only float32 array
+        """
+        return self._load_signal(data_path, "SpO2")
+
+    def _window_signal(
+        self,
+        signal: np.ndarray,
+        window_size: int,
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
         """
-        data_path = Path(data_path)
+        Standardize a raw signal and frame it into model-sized windows.
         
-        try:
-            if data_path.suffix == '.csv':
-                data = pd.read_csv(data_path).values.flatten()
-            elif data_path.suffix == '.npy':
-                data = np.load(data_path).flatten()
-            elif data_path.suffix == '.mat':
-                from scipy.io import loadmat
-                mat_data = loadmat(data_path)
-                key = [k for k in mat_data.keys() if not k.startswith('__')][0]
-                data = mat_data[key].flatten()
-            elif isinstance(data_path, (list, np.ndarray)):
-                data = np.array(data_path).flatten()
-            else:
-                raise ValueError(f"Unsupported format: {data_path.suffix}")
-            
-            print(f"SpO2 data loaded: {data.shape[0]} samples")
-            return data
-        except Exception as e:
-            print(f"✗ Error loading SpO2 data: {str(e)}")
-            raise
+        Uses 50% overlap and zero-pads recordings shorter than one window.
+        """
+        normalized = zscore(signal)
+        hop = default_hop(window_size, overlap=0.5)
+        return sliding_windows(normalized, window_size, hop=hop, pad=PAD_SHORT, out=out)
 
-    def preprocess_ecg(self, ecg_data: np.ndarray) -> np.ndarray:
+    def preprocess_ecg(self, ecg_data: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Preprocess ECG signal for model inference.
         - Standardization (zero mean, unit variance)
@@ -150,53 +224,20 @@ class SleepApneaInference:
         
         Args:
             ecg_data: Raw ECG signal
+            out: Optional preallocated (n_windows, window_size) float32 buffer
             
         Returns:
             Preprocessed ECG data ready for model
         """
         try:
-            # Ensure 1D array
-            ecg_data = np.array(ecg_data).flatten()
-            
-            # Standardization
-            mean = np.mean(ecg_data)
-            std = np.std(ecg_data)
-            if std > 0:
-                ecg_normalized = (ecg_data - mean) / std
-            else:
-                ecg_normalized = ecg_data - mean
-            
-            # Expected window size from model
-            expected_size = self.ecg_model.input_shape[-1]
-            
-            # Create windows with sliding approach
-            if len(ecg_normalized) >= expected_size:
-                # Multiple windows
-                windows = []
-                step = int(expected_size * 0.5)  # 50% overlap
-                
-                for start in range(0, len(ecg_normalized) - expected_size + 1, step):
-                    window = ecg_normalized[start:start + expected_size]
-                    windows.append(window)
-                
-                ecg_processed = np.array(windows)
-            else:
-                # Pad if too short
-                padded = np.pad(
-                    ecg_normalized,
-                    (0, expected_size - len(ecg_normalized)),
-                    mode='constant',
-                    constant_values=0
-                )
-                ecg_processed = padded.reshape(1, -1)
-            
-            print(f"ECG preprocessed: {ecg_processed.shape}")
+            ecg_processed = self._window_signal(ecg_data, self.ecg_model.input_shape[-1], out=out)
+            log_event(logger, logging.DEBUG, "preprocessed", modality="ECG", shape=ecg_processed.shape)
             return ecg_processed
         except Exception as e:
-            print(f"✗ Error preprocessing ECG: {str(e)}")
+            log_event(logger, logging.ERROR, "preprocess_failed", modality="ECG", error=str(e))
             raise
 
-    def preprocess_spo2(self, spo2_data: np.ndarray) -> np.ndarray:
+    def preprocess_spo2(self, spo2_data: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Preprocess SpO2 signal for model inference.
         - Standardization (zero mean, unit variance)
@@ -204,51 +245,26 @@ class SleepApneaInference:
         
         Args:
             spo2_data: Raw SpO2 signal
+            out: Optional preallocated (n_windows, window_size) float32 buffer
             
         Returns:
             Preprocessed SpO2 data ready for model
         """
         try:
-            # Ensure 1D array
-            spo2_data = np.array(spo2_data).flatten()
-            
-            # Standardization
-            mean = np.mean(spo2_data)
-            std = np.std(spo2_data)
-            if std > 0:
-                spo2_normalized = (spo2_data - mean) / std
-            else:
-                spo2_normalized = spo2_data - mean
-            
-            # Expected window size from model
-            expected_size = self.spo2_model.input_shape[-1]
-            
-            # Create windows
-            if len(spo2_normalized) >= expected_size:
-                windows = []
-                step = int(expected_size * 0.5)  # 50% overlap
-                
-                for start in range(0, len(spo2_normalized) - expected_size + 1, step):
-                    window = spo2_normalized[start:start + expected_size]
-                    windows.append(window)
-                
-                spo2_processed = np.array(windows)
-            else:
-                # Pad if too short
-                padded = np.pad(
-                    spo2_normalized,
-                    (0, expected_size - len(spo2_normalized)),
-                    mode='constant',
-                    constant_values=0
-                )
-                spo2_processed = padded.reshape(1, -1)
-            
-            print(f"SpO2 preprocessed: {spo2_processed.shape}")
+            spo2_processed = self._window_signal(spo2_data, self.spo2_model.input_shape[-1], out=out)
+            log_event(logger, logging.DEBUG, "preprocessed", modality="SpO2", shape=spo2_processed.shape)
             return spo2_processed
         except Exception as e:
-            print(f"✗ Error preprocessing SpO2: {str(e)}")
+            log_event(logger, logging.ERROR, "preprocess_failed", modality="SpO2", error=str(e))
             raise
 
+    @staticmethod
+    def _run_model(model, executor: Optional[BucketedExecutor], x: np.ndarray) -> np.ndarray:
+        """Call the bucketed executor if available, otherwise ``model.predict``."""
+        if executor is not None:
+            return executor(x)
+        return model.predict(x, verbose=0)
+
     def predict_ecg(self, ecg_preprocessed: np.ndarray) -> np.ndarray:
         """
         Generate ECG model predictions.
@@ -260,11 +276,11 @@ class SleepApneaInference:
             Model predictions (probabilities or scores)
         """
         try:
-            ecg_pred = self.ecg_model.predict(ecg_preprocessed, verbose=0)
-            print(f"ECG predictions: {ecg_pred.shape}")
+            ecg_pred = self._run_model(self.ecg_model, self.ecg_executor, ecg_preprocessed)
+            log_event(logger, logging.DEBUG, "predicted", modality="ECG", shape=ecg_pred.shape)
             return ecg_pred
         except Exception as e:
-            print(f"✗ Error generating ECG predictions: {str(e)}")
+            log_event(logger, logging.ERROR, "predict_failed", modality="ECG", error=str(e))
             raise
 
     def predict_spo2(self, spo2_preprocessed: np.ndarray) -> np.ndarray:
@@ -278,13 +294,40 @@ class SleepApneaInference:
             Model predictions (probabilities or scores)
         """
         try:
-            spo2_pred = self.spo2_model.predict(spo2_preprocessed, verbose=0)
-            print(f"SpO2 predictions: {spo2_pred.shape}")
+            spo2_pred = self._run_model(self.spo2_model, self.spo2_executor, spo2_preprocessed)
+            log_event(logger, logging.DEBUG, "predicted", modality="SpO2", shape=spo2_pred.shape)
             return spo2_pred
         except Exception as e:
-            print(f"✗ Error generating SpO2 predictions: {str(e)}")
+            log_event(logger, logging.ERROR, "predict_failed", modality="SpO2", error=str(e))
             raise
 
+    def _combine_predictions(
+        self,
+        ecg_pred: np.ndarray,
+        spo2_pred: np.ndarray,
+        method: str
+    ) -> np.ndarray:
+        """Apply an ensemble method to equally sized prediction arrays."""
+        if method == 'weighted_average':
+            # Weighted averaging
+            return ecg_pred * self.ecg_weight + spo2_pred * self.spo2_weight
+        
+        elif method == 'max':
+            # Maximum ensemble
+            return np.maximum(ecg_pred, spo2_pred)
+        
+        elif method == 'min':
+            # Minimum ensemble
+            return np.minimum(ecg_pred, spo2_pred)
+        
+        elif method == 'majority_vote':
+            # Majority voting (for binary classification)
+            ecg_class = (ecg_pred > 0.5).astype(int)
+            spo2_class = (spo2_pred > 0.5).astype(int)
+            return ((ecg_class + spo2_class) / 2).reshape(-1, 1)
+        
+        raise ValueError(f"Unknown ensemble method: {method}")
+
     def ensemble_predictions(
         self,
         ecg_pred: np.ndarray,
@@ -308,29 +351,7 @@ class SleepApneaInference:
             ecg_pred = ecg_pred[:min_samples]
             spo2_pred = spo2_pred[:min_samples]
             
-            if method == 'weighted_average':
-                # Weighted averaging
-                ensemble_pred = (
-                    ecg_pred * self.ecg_weight +
-                    spo2_pred * self.spo2_weight
-                )
-            
-            elif method == 'max':
-                # Maximum ensemble
-                ensemble_pred = np.maximum(ecg_pred, spo2_pred)
-            
-            elif method == 'min':
-                # Minimum ensemble
-                ensemble_pred = np.minimum(ecg_pred, spo2_pred)
-            
-            elif method == 'majority_vote':
-                # Majority voting (for binary classification)
-                ecg_class = (ecg_pred > 0.5).astype(int)
-                spo2_class = (spo2_pred > 0.5).astype(int)
-                ensemble_pred = ((ecg_class + spo2_class) / 2).reshape(-1, 1)
-            
-            else:
-                raise ValueError(f"Unknown ensemble method: {method}")
+            ensemble_pred = self._combine_predictions(ecg_pred, spo2_pred, method)
             
             # Calculate statistics
             stats = {
@@ -345,45 +366,85 @@ class SleepApneaInference:
                 'spo2_weight': self.spo2_weight
             }
             
-            print(f"Ensemble method: {method}")
-            print(f"  ECG  - Mean: {stats['ecg_mean']:.4f}, Std: {stats['ecg_std']:.4f}")
-            print(f"  SpO2 - Mean: {stats['spo2_mean']:.4f}, Std: {stats['spo2_std']:.4f}")
-            print(f"  Ensemble - Mean: {stats['ensemble_mean']:.4f}, Std: {stats['ensemble_std']:.4f}")
+            log_event(logger, logging.DEBUG, "ensemble_complete", **stats)
             
             return ensemble_pred, stats
         except Exception as e:
-            print(f"✗ Error in ensemble prediction: {str(e)}")
+            log_event(logger, logging.ERROR, "ensemble_failed", method=method, error=str(e))
             raise
 
-    def calculate_ahi_score(self, ensemble_pred: np.ndarray) -> float:
+    def ecg_window_timing(self) -> Tuple[float, float]:
+        """(window_seconds, hop_seconds) of the ECG windows the ensemble is aligned to."""
+        window_size = self.ecg_model.input_shape[-1]
+        return window_size / self.ecg_fs, default_hop(window_size, overlap=0.5) / self.ecg_fs
+
+    def detect_apnea_events(self, ensemble_pred: np.ndarray) -> EventTimeline:
+        """
+        Extract apnea events from per-window ensemble probabilities.
+        
+        Adjacent windows above ``event_threshold`` are merged into one event;
+        events shorter than ``min_event_seconds`` are discarded.
+        
+        Args:
+            ensemble_pred: Combined model predictions, one per ECG window
+            
+        Returns:
+            EventTimeline (start/end seconds and peak probability arrays)
+        """
+        window_seconds, hop_seconds = self.ecg_window_timing()
+        return extract_events(
+            ensemble_pred,
+            hop_seconds=hop_seconds,
+            window_seconds=window_seconds,
+            threshold=self.event_threshold,
+            min_duration=self.min_event_seconds
+        )
+
+    def calculate_ahi_score(
+        self,
+        ensemble_pred: np.ndarray,
+        timeline: Optional[EventTimeline] = None,
+        duration_seconds: Optional[float] = None
+    ) -> float:
         """
         Calculate AHI (Apnea-Hypopnea Index) score from ensemble predictions.
         
         AHI = number of apnea/hypopnea events per hour
         
+        When the recording duration is known, events are extracted from the
+        per-window probabilities and counted per hour of recording. Without a
+        duration, falls back to the legacy estimate (mean probability x 100).
+        
         Args:
             ensemble_pred: Combined model predictions
+            timeline: Precomputed event timeline (extracted if omitted)
+            duration_seconds: Recording length in seconds
             
         Returns:
-            Estimated AHI score (0-100)
+            AHI score (events/hour)
         """
         try:
-            # Get average prediction (apnea probability)
-            apnea_probability = np.mean(ensemble_pred)
-            
-            # Scale probability to AHI range
-            # Assuming: prob 0 = AHI 0, prob 1 = AHI 100
-            ahi_score = apnea_probability * 100
-            
-            print(f"Apnea probability: {apnea_probability:.4f}")
-            print(f"AHI Score: {ahi_score:.2f} events/hour")
-            
+            if duration_seconds is None:
+                # Legacy estimate: prob 0 = AHI 0, prob 1 = AHI 100
+                apnea_probability = np.mean(ensemble_pred)
+                ahi_score = apnea_probability * 100
+                log_event(logger, logging.DEBUG, "ahi_calculated", method="mean_probability", ahi_score=float(ahi_score))
+                return float(ahi_score)
+            
+            if timeline is None:
+                timeline = self.detect_apnea_events(ensemble_pred)
+            ahi_score = events_per_hour(timeline, duration_seconds)
+            log_event(
+                logger, logging.DEBUG, "ahi_calculated",
+                method="events_per_hour", events=len(timeline),
+                duration_seconds=float(duration_seconds), ahi_score=ahi_score
+            )
             return float(ahi_score)
         except Exception as e:
-            print(f"✗ Error calculating AHI score: {str(e)}")
+            log_event(logger, logging.ERROR, "ahi_failed", error=str(e))
             raise
 
-    def diagnose_osa(self, ahi_score: float) -> Dict:
+    def diagnose_osa(self, ahi_score: float, timeline: Optional[EventTimeline] = None) -> Dict:
         """
         Generate OSA (Obstructive Sleep Apnea) diagnosis based on AHI score.
         
@@ -395,6 +456,7 @@ class SleepApneaInference:
         
         Args:
             ahi_score: Calculated AHI index
+            timeline: Optional apnea event timeline to summarize in the diagnosis
             
         Returns:
             Diagnosis dictionary with severity and recommendations
@@ -426,97 +488,234 @@ class SleepApneaInference:
             'recommendation': recommendation
         }
         
+        if timeline is not None:
+            durations = timeline.duration
+            diagnosis['events_detected'] = len(timeline)
+            diagnosis['longest_event_seconds'] = round(float(durations.max()), 1) if len(timeline) else 0.0
+            diagnosis['mean_event_seconds'] = round(float(durations.mean()), 1) if len(timeline) else 0.0
+        
         return diagnosis
 
+    def _run_branch(
+        self,
+        data: Union[str, np.ndarray, list],
+        load_fn: Callable[[str], np.ndarray],
+        preprocess_fn: Callable[[np.ndarray], np.ndarray],
+        predict_fn: Callable[[np.ndarray], np.ndarray]
+    ) -> Tuple[np.ndarray, Dict[str, float], int]:
+        """Run load -> preprocess -> predict for one modality, timing each stage."""
+        timings = {}
+        
+        start = time.perf_counter()
+        if isinstance(data, (str, Path)):
+            signal = load_fn(data)
+        else:
+            signal = np.array(data).flatten()
+        timings['load'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        processed = preprocess_fn(signal)
+        timings['preprocess'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        predictions = predict_fn(processed)
+        timings['predict'] = time.perf_counter() - start
+        
+        timings['total'] = sum(timings.values())
+        if logger.isEnabledFor(logging.DEBUG):
+            log_event(logger, logging.DEBUG, "branch_complete", **{f"{k}_ms": round(v * 1e3, 3) for k, v in timings.items()})
+        return predictions, timings, signal.shape[0]
+
+    def _get_branch_pool(self) -> ThreadPoolExecutor:
+        if self._branch_pool is None:
+            self._branch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="somnia-branch")
+        return self._branch_pool
+
     def infer(
         self,
         ecg_data: Union[str, np.ndarray, list],
         spo2_data: Union[str, np.ndarray, list],
-        ensemble_method: str = 'weighted_average'
+        ensemble_method: str = 'weighted_average',
+        parallel: Optional[bool] = None
     ) -> Dict:
         """
         Complete inference pipeline: load, preprocess, predict, ensemble, and diagnose.
         
+        The ECG and SpO2 branches are independent until the ensemble step; in
+        parallel mode they run concurrently on a two-thread pool (TF kernels
+        release the GIL), so latency approaches the slower branch.
+        
         Args:
             ecg_data: ECG data (file path, array, or list)
             spo2_data: SpO2 data (file path, array, or list)
             ensemble_method: Method to combine predictions
+            parallel: Run modality branches concurrently (default: constructor setting)
             
         Returns:
-            Complete inference result with AHI score and diagnosis
+            Complete inference result with AHI score, diagnosis and per-stage timings
         """
-        print("\n" + "="*70)
-        print("MULTIMODAL SLEEP APNEA DETECTION - INFERENCE")
-        print("="*70 + "\n")
+        if parallel is None:
+            parallel = self.parallel_branches
         
         try:
-            # Step 1: Load data
-            print("[STEP 1/6] Loading signals...")
-            print("-" * 70)
-            if isinstance(ecg_data, str):
-                ecg_signal = self.load_ecg_data(ecg_data)
+            started = time.perf_counter()
+            
+            # Steps 1-3: Load, preprocess and score each modality
+            ecg_branch = (ecg_data, self.load_ecg_data, self.preprocess_ecg, self.predict_ecg)
+            spo2_branch = (spo2_data, self.load_spo2_data, self.preprocess_spo2, self.predict_spo2)
+            if parallel:
+                pool = self._get_branch_pool()
+                ecg_future = pool.submit(self._run_branch, *ecg_branch)
+                spo2_future = pool.submit(self._run_branch, *spo2_branch)
+                ecg_predictions, ecg_timings, ecg_samples = ecg_future.result()
+                spo2_predictions, spo2_timings, _ = spo2_future.result()
             else:
-                ecg_signal = np.array(ecg_data).flatten()
+                ecg_predictions, ecg_timings, ecg_samples = self._run_branch(*ecg_branch)
+                spo2_predictions, spo2_timings, _ = self._run_branch(*spo2_branch)
+            branches_done = time.perf_counter()
             
-            if isinstance(spo2_data, str):
-                spo2_signal = self.load_spo2_data(spo2_data)
-            else:
-                spo2_signal = np.array(spo2_data).flatten()
-            
-            # Step 2: Preprocess signals
-            print("\n[STEP 2/6] Preprocessing ECG signal...")
-            print("-" * 70)
-            ecg_processed = self.preprocess_ecg(ecg_signal)
-            
-            print("\n[STEP 3/6] Preprocessing SpO2 signal...")
-            print("-" * 70)
-            spo2_processed = self.preprocess_spo2(spo2_signal)
-            
-            # Step 4: Generate predictions
-            print("\n[STEP 4/6] ECG model inference...")
-            print("-" * 70)
-            ecg_predictions = self.predict_ecg(ecg_processed)
-            
-            print("\n[STEP 5/6] SpO2 model inference...")
-            print("-" * 70)
-            spo2_predictions = self.predict_spo2(spo2_processed)
-            
-            # Step 5: Ensemble predictions
-            print("\n[STEP 5.5/6] Ensemble predictions...")
-            print("-" * 70)
+            # Step 2: Ensemble predictions
             ensemble_pred, ensemble_stats = self.ensemble_predictions(
                 ecg_predictions,
                 spo2_predictions,
                 method=ensemble_method
             )
             
-            # Step 6: Calculate AHI and diagnose
-            print("\n[STEP 6/6] Calculating AHI score and diagnosis...")
-            print("-" * 70)
-            ahi_score = self.calculate_ahi_score(ensemble_pred)
-            diagnosis = self.diagnose_osa(ahi_score)
+            # Step 3: Extract events, calculate AHI and diagnose
+            # Rates use the span the ensemble windows actually cover, which is
+            # shorter than the recording when one modality yields fewer windows.
+            window_seconds, hop_seconds = self.ecg_window_timing()
+            duration_seconds = ecg_samples / self.ecg_fs
+            analyzed_seconds = min(duration_seconds, (len(ensemble_pred) - 1) * hop_seconds + window_seconds)
+            timeline = self.detect_apnea_events(ensemble_pred)
+            ahi_score = self.calculate_ahi_score(ensemble_pred, timeline, analyzed_seconds)
+            diagnosis = self.diagnose_osa(ahi_score, timeline)
+            finished = time.perf_counter()
             
             # Compile results
             result = {
                 'ahi_score': ahi_score,
                 'diagnosis': diagnosis,
                 'ensemble_stats': ensemble_stats,
+                'duration_seconds': duration_seconds,
+                'analyzed_seconds': analyzed_seconds,
+                'events': timeline.to_dict(),
                 'raw_predictions': {
                     'ecg_mean': float(np.mean(ecg_predictions)),
                     'spo2_mean': float(np.mean(spo2_predictions)),
                     'ensemble_mean': float(np.mean(ensemble_pred))
+                },
+                'timings': {
+                    'parallel': parallel,
+                    'ecg': ecg_timings,
+                    'spo2': spo2_timings,
+                    'branches': branches_done - started,
+                    'ensemble_and_diagnosis': finished - branches_done,
+                    'total': finished - started
                 }
             }
             
-            self._print_diagnosis(result)
+            log_event(
+                logger, logging.INFO, "inference_complete",
+                ahi_score=ahi_score, severity=diagnosis['severity'], parallel=parallel,
+                ecg_ms=round(ecg_timings['total'] * 1e3, 3),
+                spo2_ms=round(spo2_timings['total'] * 1e3, 3),
+                total_ms=round((finished - started) * 1e3, 3)
+            )
             return result
             
         except Exception as e:
-            print(f"\n✗ Inference failed: {str(e)}")
+            log_event(logger, logging.ERROR, "inference_failed", error=str(e))
             return {'status': 'error', 'message': str(e)}
 
+    def close(self):
+        """Shut down the branch thread pool and release the shared model handles."""
+        if self._branch_pool is not None:
+            self._branch_pool.shutdown(wait=True)
+            self._branch_pool = None
+        for handle in self._model_handles:
+            handle.release()
+        self._model_handles = []
+
+    def infer_stream(
+        self,
+        chunks: Iterable[Tuple[Optional[np.ndarray], Optional[np.ndarray]]],
+        ensemble_method: str = 'weighted_average'
+    ) -> Iterator[Dict]:
+        """
+        Streaming inference over a recording delivered in chunks.
+        
+        Each chunk is an ``(ecg_chunk, spo2_chunk)`` pair; either side may be
+        None or empty when only one modality has new samples. Signals are
+        z-scored with running (Welford) statistics instead of global ones, window
+        overlap is carried across chunk boundaries, and a result is yielded as
+        soon as both modalities have produced the i-th window. Sample buffers
+        are bounded by the chunk size; only the per-window predictions of the
+        modality that is ahead wait for the other one (one float per window),
+        and that backlog grows with the recording when one modality yields more
+        windows than the other.
+        
+        Args:
+            chunks: Iterable of (ECG samples, SpO2 samples) chunks
+            ensemble_method: Method to combine predictions
+            
+        Yields:
+            Per-window dicts with index, time span (ECG axis) and ECG/SpO2/ensemble
+            apnea probabilities
+        """
+        if ensemble_method not in ENSEMBLE_METHODS:
+            raise ValueError(f"Unknown ensemble method: {ensemble_method}")
+        
+        branches = {
+            'ecg': (self.predict_ecg, StreamWindower(self.ecg_model.input_shape[-1]), RunningStats()),
+            'spo2': (self.predict_spo2, StreamWindower(self.spo2_model.input_shape[-1]), RunningStats()),
+        }
+        # Only per-window scalar predictions wait here for the other modality
+        pending = {'ecg': deque(), 'spo2': deque()}
+        emitted = 0
+        window_seconds, hop_seconds = self.ecg_window_timing()
+        
+        def run(name: str, windows: np.ndarray):
+            if windows.shape[0]:
+                predict = branches[name][0]
+                pending[name].extend(np.asarray(predict(windows)).ravel())
+        
+        def drain():
+            nonlocal emitted
+            count = min(len(pending['ecg']), len(pending['spo2']))
+            if count == 0:
+                return
+            ecg_pred = np.array([pending['ecg'].popleft() for _ in range(count)]).reshape(-1, 1)
+            spo2_pred = np.array([pending['spo2'].popleft() for _ in range(count)]).reshape(-1, 1)
+            ensemble_pred = self._combine_predictions(ecg_pred, spo2_pred, ensemble_method).ravel()
+            for i in range(count):
+                yield {
+                    'window': emitted,
+                    'start_seconds': emitted * hop_seconds,
+                    'end_seconds': emitted * hop_seconds + window_seconds,
+                    'ecg_probability': float(ecg_pred[i, 0]),
+                    'spo2_probability': float(spo2_pred[i, 0]),
+                    'apnea_probability': float(ensemble_pred[i])
+                }
+                emitted += 1
+        
+        for chunk in chunks:
+            for name, samples in zip(('ecg', 'spo2'), chunk):
+                if samples is None:
+                    continue
+                _, windower, stats = branches[name]
+                samples = np.asarray(samples, dtype=np.float32).ravel()
+                stats.update(samples)
+                windows = windower.push(samples)
+                run(name, stats.normalize(windows) if windows.shape[0] else windows)
+            yield from drain()
+        
+        for name, (_, windower, stats) in branches.items():
+            run(name, windower.flush(transform=stats.normalize))
+        yield from drain()
+
     def _print_diagnosis(self, result: Dict):
-        """Print formatted diagnosis report."""
+        """Print formatted diagnosis report (console scripts only; not called by infer)."""
         diagnosis = result['diagnosis']
         
         print("\n" + "="*70)
@@ -646,6 +845,7 @@ if __name__ == "__main__":
         # Save synthetic data for testing
         np.save('synthetic_ecg.npy', ecg_synthetic)
         np.save('synthetic_spo2.npy', spo2_synthetic)
+        import pandas as pd
         pd.DataFrame(ecg_synthetic, columns=['ECG']).to_csv('synthetic_ecg.csv', index=False)
         pd.DataFrame(spo2_synthetic, columns=['SpO2']).to_csv('synthetic_spo2.csv', index=False)
         
@@ -662,6 +862,7 @@ if __name__ == "__main__":
             spo2_data=spo2_synthetic,
             ensemble_method=ENSEMBLE_METHOD
         )
+        inference._print_diagnosis(result_synthetic)
         
         print("\nResult (Synthetic):")
         print(json.dumps({
@@ -687,6 +888,7 @@ if __name__ == "__main__":
             spo2_data=spo2_normal,
             ensemble_method=ENSEMBLE_METHOD
         )
+        inference._print_diagnosis(result_normal)
         
         print("\nResult (Normal):")
         print(json.dumps({
@@ -6,12 +6,16 @@ Team: Chimpanzini Bananini
 
 from datetime import datetime
 
+from backend.models.events import events_per_hour, timeline_from_dict
+
 def generate_sleep_report(analysis_result, disorders_detected=None):
     """
     Generate comprehensive sleep report with recommendations
     
     Args:
-        analysis_result: Dictionary containing sleep analysis data
+        analysis_result: Dictionary containing sleep analysis data; an optional
+            "apnea_timeline" (EventTimeline) is used for the AHI when present,
+            otherwise the breathing pauses of an audio analysis are
         disorders_detected: List of detected disorders
         
     Returns:
@@ -42,10 +46,19 @@ def generate_sleep_report(analysis_result, disorders_detected=None):
     recommendations.append("Limit caffeine intake 6 hours before bedtime.")
     
     # Calculate clinical metrics
-    ahi = analysis_result["apnea_events"] / max(analysis_result["total_sleep_time"], 1)
+    timeline = analysis_result.get("apnea_timeline")
+    pauses = analysis_result.get("audio_events", {}).get("breathing_pauses")
+    if timeline is None and pauses is not None:
+        timeline = timeline_from_dict(pauses)
+    if timeline is not None:
+        # Event timeline (apnea models or audio breathing pauses): rate over the recorded duration
+        recorded = analysis_result.get("recorded_seconds") or analysis_result["total_sleep_time"] * 3600
+        ahi = events_per_hour(timeline, recorded)
+    else:
+        ahi = analysis_result["apnea_events"] / max(analysis_result["total_sleep_time"], 1)
     sleep_score = calculate_sleep_score(analysis_result)
     
-    return {
+    report = {
         "user_id": "demo_user",
         "date": datetime.now().strftime("%Y-%m-%d"),
         "summary": f"Sleep Quality: {get_sleep_quality_text(analysis_result)}",
@@ -58,6 +71,12 @@ def generate_sleep_report(analysis_result, disorders_detected=None):
             "sleep_score": sleep_score
         }
     }
+    if timeline is not None:
+        report["clinical_metrics"]["apnea_event_count"] = len(timeline)
+        report["clinical_metrics"]["longest_apnea_seconds"] = (
+            round(float(timeline.duration.max()), 1) if len(timeline) else 0.0
+        )
+    return report
 
 def get_sleep_quality_text(analysis):
     """Convert analysis to textual sleep quality rating"""
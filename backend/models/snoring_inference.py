@@ -15,7 +15,8 @@ Both are Apache-2.0 compatible, derived from TensorFlow examples.
 from __future__ import annotations
 
 import os
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Optional, Sequence
 
 import numpy as np
 
@@ -24,13 +25,23 @@ from backend.config import (
     SNORING_LABELS_PATH,
     SNORING_INPUT_TENSOR,
     SNORING_OUTPUT_TENSOR,
+    SNORING_FINGERPRINT_TENSOR,
+    SNORING_BATCH_INPUT_TENSOR,
+    SNORING_SAMPLE_RATE,
+    SNORING_CLIP_SECONDS,
+    SNORING_HOP_SECONDS,
+    SNORING_LABEL,
+    SNORING_PCM_TENSOR,
+    SNORING_SAMPLE_RATE_TENSOR,
 )
+from backend.models.audio_io import WavSource, encode_wav, read_wav_blocks
+from backend.models.events import extract_events
+from backend.models.streaming import StreamResampler, StreamWindower
 
 # Lazy TensorFlow import to avoid impacting app startup
 _TF = None  # type: ignore
-_GRAPH: Any = None
-_SESSION: Any = None
-_LABELS: List[str] = []
+_TF_LOCK = threading.Lock()
+_ENGINE_LOCK = threading.Lock()
 
 
 def is_configured() -> bool:
@@ -38,22 +49,24 @@ def is_configured() -> bool:
     return os.path.exists(SNORING_GRAPH_PATH) and os.path.exists(SNORING_LABELS_PATH)
 
 
-def _load_labels(filename: str) -> List[str]:
-    tf = _get_tf()
-    with tf.io.gfile.GFile(filename) as f:
-        return [line.rstrip() for line in f]
-
 def _get_tf():
     global _TF
     if _TF is None:
-        import tensorflow as tf  # type: ignore
-        tf.compat.v1.disable_eager_execution()
-        _TF = tf
+        with _TF_LOCK:
+            if _TF is None:
+                import tensorflow as tf  # type: ignore
+                tf.compat.v1.disable_eager_execution()
+                _TF = tf
     return _TF
 
 
+def _load_labels(filename: str) -> List[str]:
+    with open(filename, "r", encoding="utf-8") as f:
+        return [line.rstrip() for line in f]
+
+
 def _load_graph(filename: str):
-    """Unpersists a graph from file as the default graph and returns it."""
+    """Unpersists a graph from file and returns it."""
     tf = _get_tf()
     with tf.io.gfile.GFile(filename, "rb") as f:
         graph_def = tf.compat.v1.GraphDef()
@@ -65,17 +78,218 @@ def _load_graph(filename: str):
     return graph
 
 
-def _ensure_session():
-    global _GRAPH, _SESSION, _LABELS
-    if _GRAPH is None:
-        if not is_configured():
-            raise FileNotFoundError(
-                f"Snoring model not configured. Expected graph at {SNORING_GRAPH_PATH} and labels at {SNORING_LABELS_PATH}."
+def _static_size(tensor) -> Optional[int]:
+    """Number of elements per example of a tensor's static shape, if fully known."""
+    dims = tensor.shape.as_list() if tensor.shape.dims is not None else None
+    if not dims or any(d is None for d in dims[1:]):
+        return None
+    return int(np.prod(dims[1:])) if dims[0] in (None, 1) else None
+
+
+class SnoringEngine:
+    """
+    Frozen-graph snoring classifier with a persistent session.
+
+    The graph, labels, session and resolved tensors are created once (on first
+    use) and shared by all callers; ``Session.run`` is thread-safe, so
+    concurrent requests reuse the same session without extra locking.
+
+    Batch scoring: the frozen Speech Commands graph decodes a single scalar
+    ``wav_data`` string, so clips cannot be stacked at the input. When the
+    graph exposes the per-clip fingerprint (``SNORING_FINGERPRINT_TENSOR``) and
+    the batched classifier input it feeds (``SNORING_BATCH_INPUT_TENSOR``), the
+    fingerprints are computed per clip and the classifier runs once for the
+    whole batch; otherwise each clip is scored with its own run.
+    """
+
+    def __init__(
+        self,
+        graph_path: str = SNORING_GRAPH_PATH,
+        labels_path: str = SNORING_LABELS_PATH,
+        input_tensor_name: str = SNORING_INPUT_TENSOR,
+        output_tensor_name: str = SNORING_OUTPUT_TENSOR,
+        fingerprint_tensor_name: str = SNORING_FINGERPRINT_TENSOR,
+        batch_input_tensor_name: str = SNORING_BATCH_INPUT_TENSOR,
+        pcm_tensor_name: str = SNORING_PCM_TENSOR,
+        sample_rate_tensor_name: str = SNORING_SAMPLE_RATE_TENSOR,
+        sample_rate: int = SNORING_SAMPLE_RATE,
+        clip_seconds: float = SNORING_CLIP_SECONDS,
+    ):
+        self.graph_path = graph_path
+        self.labels_path = labels_path
+        self.input_tensor_name = input_tensor_name
+        self.output_tensor_name = output_tensor_name
+        self.fingerprint_tensor_name = fingerprint_tensor_name
+        self.batch_input_tensor_name = batch_input_tensor_name
+        self.pcm_tensor_name = pcm_tensor_name
+        self.sample_rate_tensor_name = sample_rate_tensor_name
+        self.sample_rate = sample_rate
+        self.clip_seconds = clip_seconds
+
+        self.graph: Any = None
+        self.session: Any = None
+        self.labels: List[str] = []
+        self._input = None
+        self._output = None
+        self._fingerprint = None
+        self._batch_input = None
+        self._pcm = None
+        self._pcm_rate = None
+        self._lock = threading.Lock()
+
+    def is_configured(self) -> bool:
+        return os.path.exists(self.graph_path) and os.path.exists(self.labels_path)
+
+    @property
+    def loaded(self) -> bool:
+        return self.session is not None
+
+    @property
+    def supports_batching(self) -> bool:
+        self.load()
+        return self._batch_input is not None
+
+    def load(self) -> "SnoringEngine":
+        """Parse the graph, read labels, open the session and resolve tensors (once)."""
+        if self.session is not None:
+            return self
+        with self._lock:
+            if self.session is not None:
+                return self
+            if not self.is_configured():
+                raise FileNotFoundError(
+                    f"Snoring model not configured. Expected graph at {self.graph_path} and labels at {self.labels_path}."
+                )
+            tf = _get_tf()
+            graph = _load_graph(self.graph_path)
+            self.labels = _load_labels(self.labels_path)
+            self._input = graph.get_tensor_by_name(self.input_tensor_name)
+            self._output = graph.get_tensor_by_name(self.output_tensor_name)
+            self._fingerprint, self._batch_input = self._resolve_batch_tensors(graph)
+            self._pcm, self._pcm_rate = self._resolve_pcm_tensors(graph)
+            self.graph = graph
+            self.session = tf.compat.v1.Session(graph=graph)
+        return self
+
+    def _resolve_batch_tensors(self, graph):
+        """Find the fingerprint/classifier-input pair, or (None, None) if unusable."""
+        if not self.fingerprint_tensor_name or not self.batch_input_tensor_name:
+            return None, None
+        try:
+            fingerprint = graph.get_tensor_by_name(self.fingerprint_tensor_name)
+            batch_input = graph.get_tensor_by_name(self.batch_input_tensor_name)
+        except (KeyError, ValueError):
+            return None, None
+        dims = batch_input.shape.as_list() if batch_input.shape.dims is not None else None
+        size = _static_size(fingerprint)
+        # Only trust the pair if the classifier input is [batch, fingerprint_size]
+        if not dims or len(dims) != 2 or dims[0] is not None or size is None or dims[1] != size:
+            return None, None
+        return fingerprint, batch_input
+
+    def _resolve_pcm_tensors(self, graph):
+        """Find the DecodeWav audio/sample-rate outputs, or (None, None)."""
+        if not self.pcm_tensor_name or not self.sample_rate_tensor_name:
+            return None, None
+        try:
+            return (
+                graph.get_tensor_by_name(self.pcm_tensor_name),
+                graph.get_tensor_by_name(self.sample_rate_tensor_name),
             )
-    _GRAPH = _load_graph(SNORING_GRAPH_PATH)
-    _LABELS = _load_labels(SNORING_LABELS_PATH)
-    tf = _get_tf()
-    _SESSION = tf.compat.v1.Session(graph=_GRAPH)
+        except (KeyError, ValueError):
+            return None, None
+
+    @property
+    def clip_samples(self) -> int:
+        """Samples per clip the graph expects (from the decoder shape if static)."""
+        self.load()
+        if self._pcm is not None and self._pcm.shape.dims is not None:
+            dims = self._pcm.shape.as_list()
+            if dims and dims[0]:
+                return int(dims[0])
+        return int(round(self.clip_seconds * self.sample_rate))
+
+    def score_clips(self, clips: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities, shape (n, n_classes), for (n, clip_samples) float32
+        PCM clips at ``sample_rate``.
+
+        Clips are fed straight into the decoder outputs when available, so no
+        WAV encoding/decoding happens per clip; otherwise each clip is encoded
+        to an in-memory WAV and scored with ``score_batch``.
+        """
+        self.load()
+        clips = np.asarray(clips, dtype=np.float32)
+        if clips.shape[0] == 0:
+            return np.empty((0, len(self.labels)), dtype=np.float32)
+        if self._pcm is None:
+            return self.score_batch([encode_wav(clip, self.sample_rate) for clip in clips])
+
+        def feed(clip):
+            return {self._pcm: clip.reshape(-1, 1), self._pcm_rate: self.sample_rate}
+
+        if self._batch_input is None:
+            return np.stack([
+                np.asarray(self.session.run(self._output, feed(clip))).ravel() for clip in clips
+            ])
+        fingerprints = np.stack([
+            np.asarray(self.session.run(self._fingerprint, feed(clip))).ravel() for clip in clips
+        ])
+        return np.asarray(self.session.run(self._output, {self._batch_input: fingerprints})).reshape(clips.shape[0], -1)
+
+    def label_index(self, label: str = SNORING_LABEL) -> int:
+        """Index of ``label`` in the model outputs (last class if not found)."""
+        self.load()
+        return self.labels.index(label) if label in self.labels else len(self.labels) - 1
+
+    def score(self, wav_data: bytes) -> np.ndarray:
+        """Class probabilities for one WAV buffer."""
+        self.load()
+        return np.squeeze(self.session.run(self._output, {self._input: wav_data}))
+
+    def score_batch(self, wav_buffers: Sequence[bytes]) -> np.ndarray:
+        """Class probabilities, shape (n, n_classes), for many WAV buffers."""
+        self.load()
+        if not wav_buffers:
+            return np.empty((0, len(self.labels)), dtype=np.float32)
+        if self._batch_input is None:
+            return np.stack([self.score(buf) for buf in wav_buffers])
+        fingerprints = np.stack([
+            np.asarray(self.session.run(self._fingerprint, {self._input: buf})).ravel()
+            for buf in wav_buffers
+        ])
+        return np.asarray(self.session.run(self._output, {self._batch_input: fingerprints})).reshape(len(wav_buffers), -1)
+
+    def top_k(self, probabilities: np.ndarray, how_many_labels: int = 2) -> Dict:
+        """Format probabilities as {"top": [(label, score), ...], "label": str, "score": float}."""
+        probabilities = np.asarray(probabilities).ravel()
+        top_k_indices = probabilities.argsort()[-how_many_labels:][::-1]
+        top = [
+            (str(self.labels[i] if i < len(self.labels) else i), float(probabilities[i]))
+            for i in top_k_indices
+        ]
+        label, score = top[0]
+        return {"top": top, "label": label, "score": score}
+
+    def close(self):
+        with self._lock:
+            if self.session is not None:
+                self.session.close()
+            self.session = None
+            self.graph = None
+
+
+_ENGINE: Optional[SnoringEngine] = None
+
+
+def get_engine() -> SnoringEngine:
+    """Process-wide engine built from backend.config settings."""
+    global _ENGINE
+    if _ENGINE is None:
+        with _ENGINE_LOCK:
+            if _ENGINE is None:
+                _ENGINE = SnoringEngine()
+    return _ENGINE
 
 
 def infer_wav(
@@ -89,36 +303,158 @@ def infer_wav(
 
     Returns a dict: {"top": [(label, score), ...], "label": str, "score": float}
     """
-    _ensure_session()
-    assert _GRAPH is not None and _SESSION is not None
-    tf = _get_tf()
-
-    # Read WAV bytes
-    if not tf.io.gfile.exists(wav_path):
+    if not os.path.exists(wav_path):
         raise FileNotFoundError(f"Audio file not found: {wav_path}")
     with open(wav_path, "rb") as wav_file:
         wav_data = wav_file.read()
 
-    input_name = input_tensor_name
-    output_name = output_tensor_name
+    engine = get_engine()
+    if (input_tensor_name, output_tensor_name) != (engine.input_tensor_name, engine.output_tensor_name):
+        # Non-default tensors: keep a dedicated engine so the shared one stays untouched
+        engine = _custom_engine(input_tensor_name, output_tensor_name)
+    return engine.top_k(engine.score(wav_data), how_many_labels)
+
+
+def infer_wav_bytes(wav_data: bytes, how_many_labels: int = 2) -> Dict:
+    """
+    Run snoring detection on an in-memory WAV buffer (no temp file).
+
+    Returns a dict: {"top": [(label, score), ...], "label": str, "score": float}
+    """
+    if not wav_data:
+        raise ValueError("Empty audio buffer")
+    engine = get_engine()
+    return engine.top_k(engine.score(wav_data), how_many_labels)
+
+
+def infer_batch(wav_buffers: Sequence[bytes], how_many_labels: int = 2) -> List[Dict]:
+    """Score many WAV buffers with the shared engine; one result dict per buffer."""
+    engine = get_engine()
+    return [engine.top_k(p, how_many_labels) for p in engine.score_batch(list(wav_buffers))]
+
+
+def _rebatch(chunks, batch_size: int):
+    """Regroup a stream of (n_i, w) window arrays into (batch_size, w) batches (the last may be short)."""
+    pending, n = [], 0
+    for chunk in chunks:
+        if not chunk.shape[0]:
+            continue
+        pending.append(chunk)
+        n += chunk.shape[0]
+        if n >= batch_size:
+            merged = np.concatenate(pending) if len(pending) > 1 else pending[0]
+            full = n - n % batch_size
+            for start in range(0, full, batch_size):
+                yield merged[start:start + batch_size]
+            pending, n = [merged[full:]], n - full
+    if n:
+        yield np.concatenate(pending)
+
+
+def analyze_long_wav(
+    source: WavSource,
+    hop_seconds: float = SNORING_HOP_SECONDS,
+    threshold: float = 0.5,
+    min_episode_seconds: float = 1.0,
+    batch_size: int = 256,
+    engine: Optional[SnoringEngine] = None,
+    include_probabilities: bool = False,
+    block_seconds: float = 60.0,
+) -> Dict:
+    """
+    Snoring timeline for a long (e.g. overnight) WAV recording.
+
+    ``source`` is WAV bytes or a path. The file is decoded ``block_seconds`` at
+    a time, each block resampled to the model rate and framed into
+    overlapping clips of the model's input length across block boundaries;
+    clips are scored ``batch_size`` at a time, so memory stays bounded by one
+    block and one batch however long the recording is. Consecutive snoring
+    clips are merged into episodes.
+
+    Returns:
+        Dict with the episode timeline and summary, plus per-segment snoring
+        probabilities when ``include_probabilities`` is set
+    """
+    engine = (engine or get_engine()).load()
+    clip = engine.clip_samples
+    hop = max(1, int(round(hop_seconds * engine.sample_rate)))
+    snore_idx = engine.label_index()
+    resampled = 0
+
+    def windows():
+        nonlocal resampled
+        resampler = None
+        windower = StreamWindower(clip, hop)
+        for block, rate in read_wav_blocks(source, block_seconds):
+            if resampler is None:
+                resampler = StreamResampler(rate, engine.sample_rate)
+            samples = resampler.push(block)
+            resampled += samples.shape[0]
+            yield windower.push(samples)
+        if resampler is not None:
+            samples = resampler.flush()
+            resampled += samples.shape[0]
+            yield windower.push(samples)
+        # A recording shorter than one clip is scored as a single zero-padded clip
+        yield windower.flush()
+
+    probs, rms = [], []
+    for batch in _rebatch(windows(), batch_size):
+        probs.append(np.asarray(engine.score_clips(batch))[:, snore_idx].astype(np.float32))
+        rms.append(np.sqrt(np.mean(np.square(batch), axis=1)))
+    probs = np.concatenate(probs) if probs else np.empty(0, dtype=np.float32)
+    rms = np.concatenate(rms) if rms else np.empty(0, dtype=np.float32)
+    n = probs.shape[0]
+    duration = resampled / float(engine.sample_rate)
+
+    episodes = extract_events(
+        probs,
+        hop_seconds=hop / engine.sample_rate,
+        window_seconds=clip / engine.sample_rate,
+        threshold=threshold,
+        min_duration=min_episode_seconds,
+    )
+    durations = episodes.duration
+    snoring = probs > threshold
+    loudness = float(20.0 * np.log10(max(float(rms[snoring].mean()), 1e-6))) if snoring.any() else None
+    result = {
+        "segment_seconds": clip / engine.sample_rate,
+        "hop_seconds": hop / engine.sample_rate,
+        "episodes": episodes.to_dict(),
+        "summary": {
+            "duration_seconds": round(duration, 2),
+            "segments": int(n),
+            "snoring_episodes": len(episodes),
+            "total_snoring_seconds": round(float(durations.sum()), 2),
+            "longest_episode_seconds": round(float(durations.max()), 2) if len(episodes) else 0.0,
+            "snoring_fraction": round(float(snoring.mean()), 4) if n else 0.0,
+            "loudness_dbfs": round(loudness, 1) if loudness is not None else None,
+        },
+    }
+    if include_probabilities:
+        result["probabilities"] = np.round(probs, 3).tolist()
+    return result
 
-    # Fetch tensors
-    output_operation = _GRAPH.get_tensor_by_name(output_name)
-    input_operation = _GRAPH.get_tensor_by_name(input_name)
 
-    results = _SESSION.run(output_operation, {input_operation: wav_data})
-    results = np.squeeze(results)
+_CUSTOM_ENGINES: Dict[tuple, SnoringEngine] = {}
 
-    # Top-k
-    top_k_indices = results.argsort()[-how_many_labels:][::-1]
-    top = [(str(_LABELS[i] if i < len(_LABELS) else i), float(results[i])) for i in top_k_indices]
 
-    label, score = top[0]
-    return {"top": top, "label": label, "score": score}
+def _custom_engine(input_tensor_name: str, output_tensor_name: str) -> SnoringEngine:
+    key = (input_tensor_name, output_tensor_name)
+    engine = _CUSTOM_ENGINES.get(key)
+    if engine is None:
+        engine = _CUSTOM_ENGINES[key] = SnoringEngine(
+            input_tensor_name=input_tensor_name,
+            output_tensor_name=output_tensor_name,
+        )
+    return engine
 
 
 def close():
-    global _SESSION
-    if _SESSION is not None:
-        _SESSION.close()
-        _SESSION = None
+    global _ENGINE
+    if _ENGINE is not None:
+        _ENGINE.close()
+        _ENGINE = None
+    for engine in _CUSTOM_ENGINES.values():
+        engine.close()
+    _CUSTOM_ENGINES.clear()
@@ -0,0 +1,158 @@
+"""
+Streaming Signal Primitives
+Running normalization statistics and chunk-boundary-aware windowing for
+overnight recordings that arrive in pieces (file readers, websockets).
+Team: Chimpanzini Bananini
+"""
+
+from typing import Callable, Optional
+
+import numpy as np
+
+try:
+    from backend.models.windowing import default_hop, sliding_windows
+except ImportError:  # running as a standalone script from backend/models
+    from windowing import default_hop, sliding_windows
+
+
+class RunningStats:
+    """
+    Welford running mean/variance, updated a whole chunk at a time.
+
+    Chunks are merged with Chan et al.'s parallel update so each call costs
+    one vectorized pass over the chunk, independent of the samples seen so far.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, chunk: np.ndarray) -> None:
+        chunk = np.asarray(chunk, dtype=np.float64).ravel()
+        n = chunk.shape[0]
+        if n == 0:
+            return
+        chunk_mean = float(chunk.mean())
+        chunk_m2 = float(np.square(chunk - chunk_mean).sum())
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+    def normalize(self, values: np.ndarray, dtype=np.float32) -> np.ndarray:
+        """Z-score ``values`` with the statistics seen so far."""
+        out = np.array(values, dtype=dtype)
+        out -= self.mean
+        std = self.std
+        if std > 0:
+            out /= std
+        return out
+
+
+class StreamWindower:
+    """
+    Emit fixed-size windows from a stream of chunks.
+
+    Samples that may still belong to a future window (the overlap region and any
+    partial window) are carried over to the next chunk, so the windows are
+    identical to framing the concatenated recording in one go. The carry never
+    exceeds one window, so memory is bounded by the chunk size.
+    """
+
+    def __init__(self, window_size: int, hop: Optional[int] = None):
+        self.window_size = window_size
+        self.hop = hop if hop is not None else default_hop(window_size)
+        self.emitted = 0
+        self._carry = np.empty(0, dtype=np.float32)
+
+    def push(self, chunk: np.ndarray) -> np.ndarray:
+        """Add a chunk and return the (n, window_size) windows it completes."""
+        chunk = np.asarray(chunk, dtype=np.float32).ravel()
+        buffer = np.concatenate((self._carry, chunk)) if self._carry.size else chunk
+        if buffer.shape[0] < self.window_size:
+            self._carry = buffer
+            return np.empty((0, self.window_size), dtype=np.float32)
+
+        windows = sliding_windows(buffer, self.window_size, hop=self.hop, pad="none")
+        n = windows.shape[0]
+        self._carry = buffer[n * self.hop:].copy()
+        self.emitted += n
+        # Materialize: the view would otherwise pin the whole chunk in memory.
+        return np.ascontiguousarray(windows)
+
+    def flush(self, transform: Optional[Callable[[np.ndarray], np.ndarray]] = None) -> np.ndarray:
+        """
+        Finish the stream.
+
+        Mirrors the batch 'short' padding policy: a recording shorter than one
+        window still yields a single zero-padded window; otherwise trailing
+        samples that do not fill a window are dropped. ``transform`` (e.g.
+        normalization) is applied to the samples before zero-padding.
+        """
+        carry, self._carry = self._carry, np.empty(0, dtype=np.float32)
+        if self.emitted or carry.size == 0:
+            return np.empty((0, self.window_size), dtype=np.float32)
+        if transform is not None:
+            carry = transform(carry)
+        self.emitted += 1
+        return sliding_windows(carry, self.window_size, hop=self.hop, pad="short")
+
+
+class StreamResampler:
+    """
+    Linear-interpolation resampling of a chunked stream.
+
+    Produces the samples audio_io.resample would for the concatenated
+    recording (the final length may differ by one sample, since the total is
+    only known at the end). Output positions are computed per chunk and only
+    the last input sample is carried over, so memory is bounded by the chunk.
+    """
+
+    def __init__(self, orig_rate: int, target_rate: int):
+        self.orig_rate = int(orig_rate)
+        self.target_rate = int(target_rate)
+        self.step = self.orig_rate / self.target_rate
+        self.consumed = 0
+        self.produced = 0
+        self._last = None
+
+    def push(self, chunk: np.ndarray) -> np.ndarray:
+        """Add a chunk and return the output samples it completes."""
+        chunk = np.asarray(chunk, dtype=np.float32).ravel()
+        if self.orig_rate == self.target_rate:
+            self.consumed += chunk.shape[0]
+            self.produced += chunk.shape[0]
+            return chunk
+        if chunk.size == 0:
+            return chunk
+        if self._last is None:
+            offset, x = 0, chunk
+        else:
+            offset, x = self.consumed - 1, np.concatenate((self._last, chunk))
+        self.consumed += chunk.shape[0]
+        # Outputs whose position falls at or before the last input sample seen
+        stop = max(self.produced, int((self.consumed - 1) / self.step) + 1)
+        positions = np.arange(self.produced, stop, dtype=np.float64) * self.step - offset
+        out = np.interp(positions, np.arange(x.shape[0]), x).astype(np.float32)
+        self.produced = stop
+        self._last = x[-1:]
+        return out
+
+    def flush(self) -> np.ndarray:
+        """Remaining output samples; past the last input they repeat it, as np.interp does."""
+        if self.orig_rate == self.target_rate or self._last is None:
+            return np.empty(0, dtype=np.float32)
+        total = int(round(self.consumed * self.target_rate / self.orig_rate))
+        n = max(0, total - self.produced)
+        self.produced += n
+        return np.full(n, self._last[0], dtype=np.float32)
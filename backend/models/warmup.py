@@ -0,0 +1,106 @@
+"""
+Background Model Warmup
+Loads the SpO2 / ECG models and traces their batch buckets on a background
+thread once the server is up, so workers answer health checks immediately and
+TensorFlow is imported off the startup path. Until warmup finishes the
+inference endpoints answer from the mock predictors; GET /api/v1/ready reports
+when the models are hot.
+Team: Chimpanzini Bananini
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from backend.utils.telemetry import get_logger, log_event, stage_timer
+
+IDLE = "idle"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+logger = get_logger("warmup")
+
+
+class ModelWarmup:
+    """One-shot model initialization with a readiness state."""
+
+    def __init__(self):
+        self.state = IDLE
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self, spo2_path: Optional[str] = None, ecg_path: Optional[str] = None,
+              background: bool = True, enabled: bool = True) -> bool:
+        """
+        Initialize the models at the given paths (missing files are skipped),
+        on a daemon thread unless ``background`` is False. With ``enabled``
+        False (ENABLE_ML_MODELS off) no model is loaded and the warmup is ready
+        at once in mock mode. Only the first call does anything; returns whether
+        this call started the warmup.
+        """
+        with self._lock:
+            if self.state != IDLE:
+                return False
+            self.state = WARMING
+            self.started_at = time.time()
+        if not enabled:
+            self.state = READY
+            self.finished_at = time.time()
+            self._done.set()
+            log_event(logger, logging.INFO, "ml_models_disabled", fallback="mock")
+            return True
+        paths = {"spo2_path": spo2_path if spo2_path and os.path.exists(spo2_path) else None,
+                 "ecg_path": ecg_path if ecg_path and os.path.exists(ecg_path) else None}
+        if background:
+            threading.Thread(target=self._run, kwargs=paths, name="somnia-warmup", daemon=True).start()
+        else:
+            self._run(**paths)
+        return True
+
+    def _run(self, spo2_path: Optional[str], ecg_path: Optional[str]) -> None:
+        try:
+            from backend.models import inference
+            with stage_timer("startup.init_models", logger, spo2_model=spo2_path, ecg_model=ecg_path):
+                inference.init_models(spo2_path=spo2_path, ecg_path=ecg_path)
+            self.state = READY
+            log_event(logger, logging.INFO, "ml_models_initialized", **self.models())
+        except Exception as e:
+            self.error = str(e)
+            self.state = FAILED
+            log_event(logger, logging.WARNING, "ml_models_init_failed", fallback="mock", error=str(e))
+        finally:
+            self.finished_at = time.time()
+            self._done.set()
+
+    @property
+    def ready(self) -> bool:
+        """True once warmup has finished (models that failed to load fall back to mock)."""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def models(self) -> Dict[str, str]:
+        """Whether each model is served by loaded weights or the mock predictor."""
+        from backend.models import inference
+        return {"spo2": "mock" if inference.SPO2_MODEL is None else "loaded",
+                "ecg": "mock" if inference.ECG_MODEL is None else "loaded"}
+
+    def status(self) -> Dict:
+        end = self.finished_at or time.time()
+        return {
+            "ready": self.ready,
+            "state": self.state,
+            "models": self.models() if self.ready else None,
+            "warmup_seconds": round(end - self.started_at, 3) if self.started_at else None,
+            "error": self.error,
+        }
+
+
+model_warmup = ModelWarmup()
@@ -0,0 +1,121 @@
+"""
+Signal Windowing Engine
+Zero-copy sliding windows over 1-D physiological signals (ECG, SpO2, audio).
+Team: Chimpanzini Bananini
+
+Windows are produced as strided views with ``sliding_window_view`` so no sample
+is copied while framing. A single float32 copy is made only when the caller
+asks for a contiguous array or passes a preallocated ``out`` buffer.
+"""
+
+from typing import Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Padding policies
+PAD_SHORT = "short"  # zero-pad only when the signal is shorter than one window
+PAD_TAIL = "tail"    # zero-pad the trailing partial window as well
+PAD_NONE = "none"    # never pad; trailing samples that do not fill a window are dropped
+
+PAD_POLICIES = (PAD_SHORT, PAD_TAIL, PAD_NONE)
+
+
+def default_hop(window_size: int, overlap: float = 0.5) -> int:
+    """Hop length (in samples) for a window size and fractional overlap."""
+    return max(1, int(window_size * (1.0 - overlap)))
+
+
+def num_windows(n_samples: int, window_size: int, hop: int, pad: str = PAD_SHORT) -> int:
+    """Number of windows ``sliding_windows`` produces for a signal of ``n_samples``."""
+    if pad not in PAD_POLICIES:
+        raise ValueError(f"Unknown padding policy: {pad}")
+    if n_samples >= window_size:
+        count = (n_samples - window_size) // hop + 1
+        if pad == PAD_TAIL and (count - 1) * hop + window_size < n_samples:
+            count += 1
+        return count
+    if pad == PAD_NONE or n_samples == 0:
+        return 0
+    return 1
+
+
+def zscore(signal: np.ndarray, dtype=np.float32) -> np.ndarray:
+    """
+    Standardize a signal to zero mean and unit variance as a new ``dtype`` array.
+
+    Constant signals are only mean-centered (same behaviour as the original
+    preprocessing code).
+    """
+    out = np.array(signal, dtype=dtype).ravel()
+    if out.size == 0:
+        return out
+    mean = out.mean(dtype=np.float64)
+    std = out.std(dtype=np.float64)
+    out -= mean
+    if std > 0:
+        out /= std
+    return out
+
+
+def sliding_windows(
+    signal: np.ndarray,
+    window_size: int,
+    hop: Optional[int] = None,
+    pad: str = PAD_SHORT,
+    out: Optional[np.ndarray] = None,
+    dtype=np.float32,
+) -> np.ndarray:
+    """
+    Frame a 1-D signal into (possibly overlapping) windows.
+
+    Args:
+        signal: 1-D input signal
+        window_size: Samples per window
+        hop: Samples between window starts (default: 50% overlap)
+        pad: Padding policy ('short', 'tail' or 'none')
+        out: Optional preallocated (n_windows, window_size) buffer to fill
+        dtype: Output dtype (default float32)
+
+    Returns:
+        Array of shape (n_windows, window_size). When no padding is needed and
+        ``out`` is not given, this is a read-only strided view of ``signal``.
+    """
+    if window_size <= 0:
+        raise ValueError("window_size must be positive")
+    if hop is None:
+        hop = default_hop(window_size)
+    if hop <= 0:
+        raise ValueError("hop must be positive")
+
+    signal = np.asarray(signal, dtype=dtype).ravel()
+    n = num_windows(signal.shape[0], window_size, hop, pad)
+    shape = (n, window_size)
+
+    if out is not None:
+        if out.shape != shape:
+            raise ValueError(f"Output buffer has shape {out.shape}, expected {shape}")
+        if out.dtype != np.dtype(dtype):
+            raise ValueError(f"Output buffer has dtype {out.dtype}, expected {np.dtype(dtype)}")
+
+    if n == 0:
+        return out if out is not None else np.empty(shape, dtype=dtype)
+
+    needed = (n - 1) * hop + window_size
+    if needed > signal.shape[0]:
+        # Only the last window (or the single short window) needs padding;
+        # frame the full windows as a view and pad a copy of the tail.
+        full = 0 if signal.shape[0] < window_size else (signal.shape[0] - window_size) // hop + 1
+        result = out if out is not None else np.empty(shape, dtype=dtype)
+        if full:
+            result[:full] = sliding_window_view(signal, window_size)[::hop][:full]
+        tail = signal[full * hop:]
+        result[full:, :tail.shape[0]] = tail
+        result[full:, tail.shape[0]:] = 0
+        return result
+
+    view = sliding_window_view(signal[:needed], window_size)[::hop]
+    if out is not None:
+        np.copyto(out, view)
+        return out
+    return view
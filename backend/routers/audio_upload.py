@@ -0,0 +1,179 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile
+from pydantic import BaseModel
+from typing import Dict, Optional
+import wave
+
+from backend.config import AUDIO_UPLOAD_CHUNK_SIZE
+from backend.utils.auth import get_current_user
+from backend.utils.executors import ExecutorBusy, run_inference, run_io
+from backend.utils.uploads import (
+    OffsetMismatch,
+    UploadNotFound,
+    UploadStateError,
+    UploadTooLarge,
+    get_upload_store,
+)
+
+router = APIRouter(prefix="/api/v1/upload/audio", tags=["Upload"])
+
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.m4a', '.flac')
+
+
+class UploadSessionRequest(BaseModel):
+    filename: str
+    total_size: Optional[int] = None
+
+
+def _http_error(e: Exception) -> HTTPException:
+    if isinstance(e, UploadNotFound):
+        return HTTPException(status_code=404, detail="Upload not found")
+    if isinstance(e, OffsetMismatch):
+        return HTTPException(status_code=409, detail={"message": str(e), "expected_offset": e.expected})
+    if isinstance(e, UploadTooLarge):
+        return HTTPException(status_code=413, detail=str(e))
+    return HTTPException(status_code=409, detail=str(e))
+
+
+def _check_extension(filename: Optional[str]) -> None:
+    if not (filename or "").lower().endswith(AUDIO_EXTENSIONS):
+        raise HTTPException(status_code=400, detail="Invalid audio format")
+
+
+def _analyze_completed(record: Dict) -> Optional[Dict]:
+    """Finish the incremental analysis (or analyze the stored WAV in one pass)."""
+    from backend.models.sleep_analyzer import analyze_audio_features, analyze_sleep_audio
+    analyzer = record.get("analyzer")
+    try:
+        if analyzer is not None:
+            analysis = analyze_audio_features(analyzer.finish())
+        elif record["filename"].lower().endswith(".wav"):
+            analysis = analyze_sleep_audio(record["path"])
+        else:
+            return None
+    except (ValueError, wave.Error, EOFError):
+        # Not a PCM WAV we can decode (float samples, no RIFF header,
+        # truncated); the upload is still stored
+        return None
+    get_upload_store().set_analysis(record["file_id"], analysis)
+    return analysis
+
+
+async def _finalize(file_id: str) -> Dict:
+    store = get_upload_store()
+    try:
+        record = await run_io(store.complete, file_id)
+    except (UploadNotFound, UploadStateError) as e:
+        raise _http_error(e)
+    analysis = record.get("analysis")
+    if analysis is None:
+        analysis = await run_inference(_analyze_completed, record)
+    return {
+        "file_id": file_id,
+        "filename": record["filename"],
+        "size": record["received"],
+        "status": record["status"],
+        "analysis_ready": analysis is not None,
+    }
+
+
+async def _append(file_id: str, offset: int, data: bytes) -> Dict:
+    """Store a chunk on the I/O pool, then analyze it on the inference pool."""
+    store = get_upload_store()
+    record = await run_io(store.append, file_id, offset, data)
+    # Incremental FFT analysis is CPU work; it must not tie up I/O workers
+    await run_inference(store.feed, file_id, offset, data)
+    return record
+
+
+async def ingest_upload(file: UploadFile, user_id: str) -> Dict:
+    """Stream a single multipart upload into the store chunk by chunk and finalize it."""
+    _check_extension(file.filename)
+    store = get_upload_store()
+    record = await run_io(store.create, file.filename, user_id)
+    offset = 0
+    try:
+        while True:
+            chunk = await file.read(AUDIO_UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            await _append(record["file_id"], offset, chunk)
+            offset += len(chunk)
+    except UploadTooLarge as e:
+        await run_io(store.discard, record["file_id"])
+        raise _http_error(e)
+    except ExecutorBusy:
+        # The I/O pool may be the one that is full: clean up inline
+        store.discard(record["file_id"])
+        raise
+    finally:
+        await file.close()
+    if offset == 0:
+        await run_io(store.discard, record["file_id"])
+        raise HTTPException(status_code=400, detail="Empty audio file")
+    return await _finalize(record["file_id"])
+
+
+@router.post("/sessions", status_code=201)
+async def create_upload_session(
+    body: UploadSessionRequest,
+    current_user: dict = Depends(get_current_user),
+):
+    """Start a resumable upload; send chunks with PUT, then POST .../complete"""
+    _check_extension(body.filename)
+    try:
+        record = await run_io(get_upload_store().create, body.filename, current_user.get("id", "demo_user"),
+                              body.total_size)
+    except UploadTooLarge as e:
+        raise _http_error(e)
+    return {
+        "file_id": record["file_id"],
+        "filename": record["filename"],
+        "received": 0,
+        "chunk_size": AUDIO_UPLOAD_CHUNK_SIZE,
+    }
+
+
+@router.put("/sessions/{file_id}")
+async def upload_chunk(
+    file_id: str,
+    offset: int,
+    request: Request,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Append the raw request body at ``offset``. On 409 resume from ``expected_offset``.
+    """
+    data = bytearray()
+    async for piece in request.stream():
+        data += piece
+        if len(data) > AUDIO_UPLOAD_CHUNK_SIZE:
+            raise HTTPException(status_code=413, detail=f"Chunks are limited to {AUDIO_UPLOAD_CHUNK_SIZE} bytes")
+    try:
+        record = await _append(file_id, offset, bytes(data))
+    except (UploadNotFound, OffsetMismatch, UploadTooLarge, UploadStateError) as e:
+        raise _http_error(e)
+    return {"file_id": file_id, "received": record["received"]}
+
+
+@router.get("/sessions/{file_id}")
+async def upload_status(file_id: str, current_user: dict = Depends(get_current_user)):
+    """Upload progress: bytes received (the offset to resume from) and seconds analyzed"""
+    try:
+        return get_upload_store().status(file_id)
+    except UploadNotFound as e:
+        raise _http_error(e)
+
+
+@router.post("/sessions/{file_id}/complete")
+async def complete_upload(file_id: str, current_user: dict = Depends(get_current_user)):
+    """Finalize the upload; the returned file_id can be passed to /api/v1/analyze"""
+    return await _finalize(file_id)
+
+
+@router.delete("/sessions/{file_id}", status_code=204)
+async def discard_upload(file_id: str, current_user: dict = Depends(get_current_user)):
+    """Abort an upload and delete its data"""
+    try:
+        await run_io(get_upload_store().discard, file_id)
+    except UploadNotFound as e:
+        raise _http_error(e)
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from typing import Dict, List, Optional
+import json
+import math
+
+from backend.config import BREATHING_PAUSE_SECONDS, BREATHING_REPORT_SECONDS, BREATHING_WINDOW_SECONDS
+from backend.models.breathing_monitor import BreathingRateEstimator, chest_from_landmarks
+
+router = APIRouter(prefix="/api/v1", tags=["Video", "Breathing"])
+
+
+def _chest_sample(frame: Dict) -> float:
+    """Chest height from one client frame: ``chest_y`` directly or full pose ``landmarks``."""
+    if frame.get("chest_y") is not None:
+        return float(frame["chest_y"])
+    landmarks = frame.get("landmarks")
+    return chest_from_landmarks(landmarks) if landmarks else math.nan
+
+
+def _frames(message) -> List[Dict]:
+    if isinstance(message, dict) and isinstance(message.get("frames"), list):
+        return message["frames"]
+    if isinstance(message, dict):
+        return [message]
+    raise ValueError("Expected a frame object or {\"frames\": [...]}")
+
+
+@router.websocket("/breathing/ws")
+async def breathing_monitor(websocket: WebSocket, fps: float = 30.0, pause_seconds: Optional[float] = None,
+                            window_seconds: Optional[float] = None):
+    """
+    Live breathing rate and pause alerts from per-frame pose keypoints.
+
+    The app sends one JSON object per frame, ``{"t": seconds, "landmarks":
+    [[x, y, visibility], ...]}`` (MediaPipe's 33 pose landmarks) or
+    ``{"t": seconds, "chest_y": y}``, optionally batched as ``{"frames": [...]}``.
+    The server replies with ``pause_start``/``pause_end`` events as they
+    happen and a ``rate`` status every BREATHING_REPORT_SECONDS of feed time.
+    """
+    try:
+        estimator = BreathingRateEstimator(
+            sample_rate=fps,
+            window_seconds=window_seconds or BREATHING_WINDOW_SECONDS,
+            pause_seconds=pause_seconds or BREATHING_PAUSE_SECONDS,
+        )
+    except ValueError as e:
+        # Reject the handshake: fps etc. must be positive
+        await websocket.close(code=1008, reason=str(e))
+        return
+    await websocket.accept()
+    next_report = 0.0
+    try:
+        while True:
+            message = await websocket.receive_text()
+            try:
+                frames = _frames(json.loads(message))
+                events = []
+                for frame in frames:
+                    events.extend(estimator.update(_chest_sample(frame), frame.get("t")))
+            except (TypeError, ValueError, AttributeError) as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+                continue
+            for event in events:
+                await websocket.send_json(event)
+            if estimator.time >= next_report:
+                await websocket.send_json({"type": "rate", **estimator.state()})
+                # Half a frame of slack so batches of exactly one interval each get a report
+                next_report = estimator.time + BREATHING_REPORT_SECONDS - 0.5 / fps
+    except WebSocketDisconnect:
+        pass
@@ -1,16 +1,22 @@
-from fastapi import APIRouter, Body, HTTPException, Depends
-from typing import Optional, Dict, Any
+from fastapi import APIRouter, Body, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional, Dict, Any, List, Tuple
 from ..utils.auth import get_current_user
-from ..models.inference import init_models, predict_spo2, predict_ecg, fuse_modalities
-import os
+from ..utils.batching import batcher_stats, get_batcher
+from ..utils.executors import ExecutorBusy, run_inference
+from ..models.inference import (
+    fuse_modalities, fuse_modalities_columns, predict_ecg_columns, predict_spo2_columns,
+)
+from ..models.fusion import get_profiles
+from ..config import INFER_BULK_MAX_RECORDS
+import io
+import json
+import numpy as np
 
 router = APIRouter(prefix="/api/v1", tags=["Inference"])
 
-# initialize models at import (fastest for demo)
-SPO2_PATH = os.path.join(os.getcwd(), "backend", "models", "SpO2_weights.hdf5")
-ECG_PATH = os.path.join(os.getcwd(), "backend", "models", "ecg_weights.hdf5")
-init_models(spo2_path=SPO2_PATH if os.path.exists(SPO2_PATH) else None,
-            ecg_path=ECG_PATH if os.path.exists(ECG_PATH) else None)
+# Models are loaded by the app's background warmup (models/warmup.py); until it
+# finishes these endpoints answer from the mock predictors
 
 @router.post("/infer/spo2")
 async def infer_spo2(payload: Dict[str, Any] = Body(...), current_user: Dict = Depends(get_current_user)):
@@ -19,8 +25,10 @@ async def infer_spo2(payload: Dict[str, Any] = Body(...), current_user: Dict = D
     { "avg_spo2": 95.1, "min_spo2": 92, "X": [ ... optional preprocessed array ... ] }
     """
     try:
-        res = predict_spo2(payload)
+        res = await get_batcher("spo2").submit(payload)
         return {"ok": True, "result": res}
+    except ExecutorBusy:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -31,11 +39,18 @@ async def infer_ecg(payload: Dict[str, Any] = Body(...), current_user: Dict = De
     { "rmssd": 25.0, "avg_hr": 78, "X": [ ... ] }
     """
     try:
-        res = predict_ecg(payload)
+        res = await get_batcher("ecg").submit(payload)
         return {"ok": True, "result": res}
+    except ExecutorBusy:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/infer/batching")
+async def infer_batching_stats():
+    """Micro-batching statistics per model, including the batch-size histogram"""
+    return {"batchers": batcher_stats()}
+
 class FusionRequest:
     # accepted fields: audio_prob, video_score, wearable_risk
     pass
@@ -47,3 +62,107 @@ async def infer_multimodal(body: Dict[str, Any] = Body(...), current_user: Dict
     wearable_risk = body.get("wearable_risk")
     fusion = fuse_modalities(audio_prob, video_score, wearable_risk)
     return {"ok": True, "fusion": fusion}
+
+# ==================== BULK SCORING ====================
+
+BATCH_FIELDS = ("avg_spo2", "min_spo2", "rmssd", "avg_hrv", "avg_hr", "audio_prob", "video_score", "wearable_risk")
+BATCH_TASKS = ("spo2", "ecg", "fusion")
+NDJSON_CHUNK_ROWS = 1000
+
+def _parse_batch(body: bytes, content_type: str) -> Tuple[Dict[str, np.ndarray], Optional[list], int]:
+    """
+    Feature columns (float64, NaN = missing), optional ids and row count from a
+    bulk body: NumPy .npz (one array per field), JSON columns
+    {"columns": {"avg_spo2": [...], ...}} or JSON rows {"records": [{...}, ...]}.
+    """
+    n = None
+    if "npz" in content_type or "octet-stream" in content_type:
+        with np.load(io.BytesIO(body), allow_pickle=False) as npz:
+            raw = {name: npz[name] for name in npz.files}
+    else:
+        payload = json.loads(body)
+        if not isinstance(payload, dict):
+            raise ValueError("Expected {\"columns\": {...}} or {\"records\": [...]}")
+        if isinstance(payload.get("records"), list):
+            rows = payload["records"]
+            n = len(rows)
+            raw = {f: [r.get(f) for r in rows] for f in BATCH_FIELDS + ("id",) if any(f in r for r in rows)}
+        elif isinstance(payload.get("columns"), dict):
+            raw = payload["columns"]
+        else:
+            raise ValueError("Expected {\"columns\": {...}} or {\"records\": [...]}")
+    lengths = {len(v) for v in raw.values()}
+    if len(lengths) > 1:
+        raise ValueError("All columns must have the same length")
+    if n is None:
+        n = lengths.pop() if lengths else 0
+    columns = {f: np.asarray(raw[f], dtype=np.float64).reshape(n) for f in BATCH_FIELDS if f in raw}
+    ids = raw.get("id")
+    return columns, (np.asarray(ids).tolist() if ids is not None else None), n
+
+def _score_batch(columns: Dict[str, np.ndarray], n: int, tasks: List[str],
+                 profile: Optional[str] = None) -> Dict[str, tuple]:
+    """Vectorized predictions and fusion over the whole batch."""
+    results = {}
+    if "spo2" in tasks:
+        results["spo2"] = predict_spo2_columns(columns, n)
+    if "ecg" in tasks:
+        results["ecg"] = predict_ecg_columns(columns, n)
+    if "fusion" in tasks:
+        nan = np.full(n, np.nan)
+        results["fusion"] = fuse_modalities_columns(
+            columns.get("audio_prob", nan), columns.get("video_score", nan), columns.get("wearable_risk", nan),
+            profile=profile,
+        )
+    return results
+
+def _ndjson_lines(results: Dict[str, tuple], ids: Optional[list], n: int):
+    """One JSON object per record, in the same shape as the single-record endpoints."""
+    labels = {"spo2": ("low", "normal"), "ecg": ("abnormal", "normal")}
+    for start in range(0, n, NDJSON_CHUNK_ROWS):
+        stop = min(n, start + NDJSON_CHUNK_ROWS)
+        rows = [{"index": i} for i in range(start, stop)]
+        if ids is not None:
+            for row, record_id in zip(rows, ids[start:stop]):
+                row["id"] = record_id
+        for task, (high, low) in labels.items():
+            if task in results:
+                probs, model = results[task]
+                for row, p in zip(rows, probs[start:stop].tolist()):
+                    row[task] = {"probability": round(p, 3), "label": high if p > 0.5 else low, "model": model}
+        if "fusion" in results:
+            scores, levels = results["fusion"]
+            for row, score, level in zip(rows, scores[start:stop].tolist(), levels[start:stop].tolist()):
+                # NaN (no modality present) -> null, as in fuse_modalities
+                row["fusion"] = {"fusion_score": round(score, 3) if score == score else None, "fusion_level": level}
+        yield "".join(json.dumps(row) + "\n" for row in rows)
+
+@router.post("/infer/batch")
+async def infer_batch(request: Request, tasks: str = ",".join(BATCH_TASKS), profile: Optional[str] = None,
+                      current_user: Dict = Depends(get_current_user)):
+    """
+    Score many records in one request and stream results as NDJSON.
+
+    Body: JSON {"columns": {"avg_spo2": [...], "min_spo2": [...], "rmssd": [...],
+    "avg_hr": [...], "audio_prob": [...], "video_score": [...], "wearable_risk": [...],
+    "id": [...]}} (any subset; null = missing), JSON {"records": [{...}, ...]}, or a
+    NumPy .npz with the same array names (Content-Type application/x-npz).
+    tasks: comma-separated subset of spo2,ecg,fusion
+    profile: fusion weight/threshold profile (default FUSION_PROFILE)
+    """
+    selected = [t for t in tasks.split(",") if t]
+    unknown = set(selected) - set(BATCH_TASKS)
+    if unknown or not selected:
+        raise HTTPException(status_code=400, detail=f"tasks must be a subset of {','.join(BATCH_TASKS)}")
+    body = await request.body()
+    try:
+        columns, ids, n = await run_inference(_parse_batch, body, request.headers.get("content-type", ""))
+    except (ValueError, TypeError, KeyError, AttributeError, OSError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid batch body: {e}")
+    if n > INFER_BULK_MAX_RECORDS:
+        raise HTTPException(status_code=413, detail=f"At most {INFER_BULK_MAX_RECORDS} records per request")
+    if profile is not None and profile not in get_profiles():
+        raise HTTPException(status_code=400, detail=f"Unknown fusion profile: {profile}")
+    results = await run_inference(_score_batch, columns, n, selected, profile)
+    return StreamingResponse(_ndjson_lines(results, ids, n), media_type="application/x-ndjson",
+                             headers={"X-Record-Count": str(n)})
@@ -1,13 +1,18 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from pathlib import Path
-import shutil
-import uuid
-from typing import Dict
+from typing import Dict, Optional
+import wave
 
 from backend.config import (
+    MAX_UPLOAD_SIZE,
     SNORING_GRAPH_PATH,
     SNORING_LABELS_PATH,
+    SNORING_PERSIST_UPLOADS,
+    SNORING_RETENTION_HOURS,
+    SNORING_RETENTION_MAX_FILES,
+    SNORING_UPLOAD_DIR,
 )
+from backend.utils.executors import ExecutorBusy, run_inference, run_io
+from backend.utils.storage import persist_upload, prune_directory
 
 router = APIRouter(prefix="/api/v1", tags=["Audio", "Snoring"])
 
@@ -20,12 +25,44 @@ async def snoring_status() -> Dict:
         "configured": is_configured(),
         "graph": SNORING_GRAPH_PATH,
         "labels": SNORING_LABELS_PATH,
+        "persist_uploads": SNORING_PERSIST_UPLOADS,
     }
 
 
+async def _read_wav_upload(file: UploadFile) -> bytes:
+    """Validate and read a WAV upload into memory (bounded by MAX_UPLOAD_SIZE)."""
+    if not file.filename.lower().endswith('.wav'):
+        raise HTTPException(status_code=400, detail="Please upload a WAV file (.wav)")
+    try:
+        # UploadFile is already spooled to a temp file by the multipart parser
+        # above its in-memory threshold; read one byte past the cap to detect
+        # oversized uploads without loading them fully.
+        data = await file.read(MAX_UPLOAD_SIZE + 1)
+    finally:
+        await file.close()
+    if len(data) > MAX_UPLOAD_SIZE:
+        raise HTTPException(status_code=413, detail=f"Audio file exceeds {MAX_UPLOAD_SIZE} bytes")
+    if not data:
+        raise HTTPException(status_code=400, detail="Empty audio file")
+    return data
+
+
+def _maybe_persist(data: bytes, filename: str):
+    """Persist the upload only when SNORING_PERSIST_UPLOADS is enabled."""
+    if not SNORING_PERSIST_UPLOADS:
+        return None
+    path = persist_upload(data, SNORING_UPLOAD_DIR, filename)
+    prune_directory(
+        SNORING_UPLOAD_DIR,
+        max_age_seconds=SNORING_RETENTION_HOURS * 3600,
+        max_files=SNORING_RETENTION_MAX_FILES,
+    )
+    return str(path)
+
+
 @router.post("/snoring/detect")
 async def detect_snoring(file: UploadFile = File(...), current_user: dict = Depends(lambda: {"id": "demo_user"})):
-    from ..models.snoring_inference import infer_wav, is_configured
+    from ..models.snoring_inference import infer_wav_bytes, is_configured
     if not is_configured():
         raise HTTPException(
             status_code=501,
@@ -36,28 +73,90 @@ async def detect_snoring(file: UploadFile = File(...), current_user: dict = Depe
             ),
         )
 
-    if not file.filename.lower().endswith('.wav'):
-        raise HTTPException(status_code=400, detail="Please upload a WAV file (.wav)")
-
-    # Save uploaded file temporarily
-    uploads = Path("uploads") / "audio"
-    uploads.mkdir(parents=True, exist_ok=True)
-    unique_name = f"{uuid.uuid4().hex}_{file.filename}"
-    wav_path = uploads / unique_name
+    wav_data = await _read_wav_upload(file)
 
     try:
-        with open(wav_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-    finally:
-        file.file.close()
-
-    try:
-        result = infer_wav(str(wav_path))
+        result = await run_inference(infer_wav_bytes, wav_data)
+    except ExecutorBusy:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Inference failed: {e}")
 
-    return {
+    response = {
         "user_id": current_user.get("id", "demo_user"),
         "filename": file.filename,
         "prediction": result,
     }
+    stored = await run_io(_maybe_persist, wav_data, file.filename)
+    if stored:
+        response["stored_path"] = stored
+    return response
+
+
+def _resolve_recording(file_id: str) -> Dict:
+    """Completed upload record from the audio upload store (404 unknown, 409 still uploading)"""
+    from backend.utils.uploads import UploadNotFound, UploadStateError, get_upload_store
+    store = get_upload_store()
+    try:
+        store.resolve(file_id)
+        return store.get(file_id)
+    except UploadNotFound:
+        raise HTTPException(status_code=404, detail=f"Audio file {file_id} not found")
+    except UploadStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.post("/snoring/analyze")
+async def analyze_snoring_recording(
+    file: Optional[UploadFile] = File(None),
+    file_id: Optional[str] = None,
+    threshold: float = 0.5,
+    probabilities: bool = False,
+    current_user: dict = Depends(lambda: {"id": "demo_user"}),
+):
+    """
+    Score a long (e.g. overnight) WAV recording in overlapping clips.
+
+    Overnight recordings exceed MAX_UPLOAD_SIZE: upload them through the
+    resumable /api/v1/upload/audio/sessions endpoints and pass ``file_id``;
+    the stored file is decoded block by block rather than loaded into memory.
+    A direct multipart ``file`` is accepted for shorter clips.
+    probabilities: include the per-clip snoring probabilities (one per hop)
+    """
+    from ..models.snoring_inference import analyze_long_wav, is_configured
+    if not is_configured():
+        raise HTTPException(status_code=501, detail="Snoring model not configured")
+    if (file is None) == (file_id is None):
+        raise HTTPException(status_code=400, detail="Provide either a WAV file or the file_id of a completed upload")
+
+    if file_id is not None:
+        record = await run_io(_resolve_recording, file_id)
+        if not record["filename"].lower().endswith(".wav"):
+            raise HTTPException(status_code=400, detail="Please upload a WAV file (.wav)")
+        source, filename, wav_data = record["path"], record["filename"], None
+    else:
+        wav_data = await _read_wav_upload(file)
+        source, filename = wav_data, file.filename
+
+    try:
+        result = await run_inference(analyze_long_wav, source, threshold=threshold,
+                                     include_probabilities=probabilities)
+    except ExecutorBusy:
+        raise
+    except (ValueError, wave.Error, EOFError) as e:
+        raise HTTPException(status_code=400, detail=f"Unsupported WAV file: {e}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {e}")
+
+    response = {
+        "user_id": current_user.get("id", "demo_user"),
+        "filename": filename,
+        "analysis": result,
+    }
+    if file_id is not None:
+        response["file_id"] = file_id
+    else:
+        stored = await run_io(_maybe_persist, wav_data, filename)
+        if stored:
+            response["stored_path"] = stored
+    return response
@@ -2,25 +2,95 @@ from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
 from pathlib import Path
 import shutil
 import uuid
-from ..models.extract_pose_features import run_on_video
+
+from backend.config import (
+    VIDEO_POSE_INFERENCE_WIDTH,
+    VIDEO_POSE_MODEL_COMPLEXITY,
+    VIDEO_POSE_ROI_TRACKING,
+    VIDEO_POSE_WORKERS,
+)
+from backend.utils.executors import run_io
+from backend.utils.jobs import SUCCEEDED, FAILED, JobNotFound, QueueFull, get_job_queue
 
 router = APIRouter(prefix="/api/v1", tags=["Video"])
 
-@router.post("/upload/video-pose")
-async def upload_video_pose(file: UploadFile = File(...), current_user: dict = Depends(lambda: {"id":"demo_user"})):
-    # Save uploaded file temporarily
+# Runs in a worker process, so MediaPipe/OpenCV are never imported by the API
+POSE_JOB = "video_pose"
+get_job_queue().register(POSE_JOB, "backend.models.extract_pose_features:pose_job")
+
+
+@router.on_event("startup")
+async def resume_pose_jobs():
+    # Jobs queued or running when the server stopped are restarted
+    get_job_queue().recover()
+
+
+@router.on_event("shutdown")
+async def stop_pose_workers():
+    get_job_queue().shutdown(wait=False)
+
+
+def _save_upload(file: UploadFile) -> Path:
     uploads = Path("uploads") / "videos"
     uploads.mkdir(parents=True, exist_ok=True)
-    unique_name = f"{uuid.uuid4().hex}_{file.filename}"
-    out_path = uploads / unique_name
-
+    out_path = uploads / f"{uuid.uuid4().hex}_{Path(file.filename or 'video').name}"
     with open(out_path, "wb") as buffer:
         shutil.copyfileobj(file.file, buffer)
+    return out_path
 
-    # run extraction (sync call) - consider background task for large files
+
+@router.post("/upload/video-pose", status_code=202)
+async def upload_video_pose(file: UploadFile = File(...), current_user: dict = Depends(lambda: {"id":"demo_user"})):
+    """Queue pose extraction for an uploaded video and return the job id at once"""
+    queue = get_job_queue()
+    if queue.pending >= queue.max_pending:
+        raise HTTPException(status_code=503, detail="Pose extraction queue is full, retry later",
+                            headers={"Retry-After": "30"})
+
+    out_path = await run_io(_save_upload, file)
     try:
-        csv_path, json_path = run_on_video(str(out_path), str(Path("data/video_features")))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        job = queue.submit(POSE_JOB, {
+            "video_path": str(out_path),
+            "out_dir": str(Path("data/video_features")),
+            "sample_rate": 1,
+            "workers": VIDEO_POSE_WORKERS,
+            "inference_width": VIDEO_POSE_INFERENCE_WIDTH or None,
+            "model_complexity": VIDEO_POSE_MODEL_COMPLEXITY,
+            "roi_tracking": VIDEO_POSE_ROI_TRACKING,
+            "user_id": current_user.get("id", "demo_user"),
+        })
+    except QueueFull:
+        out_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=503, detail="Pose extraction queue is full, retry later",
+                            headers={"Retry-After": "30"})
+
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "video_path": str(out_path),
+        "status_url": f"/api/v1/video-pose/jobs/{job['id']}",
+        "result_url": f"/api/v1/video-pose/jobs/{job['id']}/result",
+    }
+
 
-    return {"video_path": str(out_path), "frames_csv": str(csv_path), "summary_json": str(json_path)}
\ No newline at end of file
+@router.get("/video-pose/jobs/{job_id}")
+async def pose_job_status(job_id: str):
+    """Job state and progress (frames processed out of total)"""
+    try:
+        return get_job_queue().status(job_id)
+    except JobNotFound:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+
+@router.get("/video-pose/jobs/{job_id}/result")
+async def pose_job_result(job_id: str):
+    """Extraction outputs once the job has succeeded (409 while still running)"""
+    try:
+        job = get_job_queue().result(job_id)
+    except JobNotFound:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] == FAILED:
+        raise HTTPException(status_code=500, detail=job.get("error") or "Pose extraction failed")
+    if job["status"] != SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return {"job_id": job_id, "video_path": job["params"]["video_path"], **job["result"]}
@@ -52,3 +52,17 @@ def test_analyze_requires_auth_and_returns_result():
     assert "sleep_stages" in data
     assert "apnea_events" in data
     assert "recommendations" in data
+
+
+def test_metrics_records_analysis_stages():
+    payload = {
+        "duration_hours": 7.0,
+        "user_id": "demo_user",
+        "recording_date": "2025-10-19T08:00:00Z",
+    }
+    assert client.post("/api/v1/analyze", json=payload).status_code == 200
+    r = client.get("/api/v1/metrics")
+    assert r.status_code == 200
+    stages = r.json()["stages"]
+    assert stages["analyze.audio"]["count"] >= 1
+    assert "analyze.report" in stages
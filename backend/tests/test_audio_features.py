@@ -0,0 +1,60 @@
+import numpy as np
+
+from backend.models.audio_features import (
+    breathing_pauses,
+    compute_features,
+    features_from_wav,
+    snoring_events,
+)
+from backend.models.audio_io import encode_wav
+from backend.models.sleep_analyzer import analyze_sleep_audio, detect_apnea_events, detect_snoring
+
+RATE = 8000
+
+
+def _night(seconds=120, pause=(50.0, 70.0), snore=(90.0, 100.0)):
+    """Breathing noise at 15 breaths/min with one silent pause and one snoring stretch."""
+    rng = np.random.default_rng(0)
+    t = np.arange(seconds * RATE) / RATE
+    breathing = 0.05 * (0.6 + 0.4 * np.sin(2 * np.pi * 0.25 * t)) * rng.standard_normal(t.shape[0])
+    signal = breathing + 0.001 * rng.standard_normal(t.shape[0])
+    signal[(t >= pause[0]) & (t < pause[1])] = 0.001 * rng.standard_normal(int((pause[1] - pause[0]) * RATE))
+    in_snore = (t >= snore[0]) & (t < snore[1])
+    signal[in_snore] += 0.3 * np.sin(2 * np.pi * 500 * t[in_snore])
+    return signal.astype(np.float32)
+
+
+def test_features_find_pause_and_snoring():
+    features = compute_features(_night(), RATE)
+    pauses = breathing_pauses(features)
+    assert len(pauses) == 1
+    assert abs(pauses.start[0] - 50) < 1.5 and abs(pauses.end[0] - 70) < 1.5
+
+    snoring = snoring_events(features)
+    assert snoring.start.min() >= 89 and snoring.end.max() <= 101
+    assert snoring.duration.sum() > 8
+
+
+def test_streamed_wav_matches_in_memory_features():
+    signal = _night(seconds=30, pause=(10, 20), snore=(25, 28))
+    streamed = features_from_wav(encode_wav(signal, RATE))
+    direct = compute_features(np.clip(signal, -1, 1), RATE)
+    assert len(streamed) == len(direct)
+    assert np.allclose(streamed.rms, direct.rms, atol=1e-3)
+
+
+def test_analyze_sleep_audio_keeps_result_shape():
+    wav = encode_wav(_night(), RATE)
+    result = analyze_sleep_audio(wav)
+    assert set(result["sleep_stages"]) == {"wake", "light", "deep", "rem"}
+    assert result["apnea_events"] == 1
+    assert result["total_sleep_time"] == 0.0
+    assert 0 <= result["sleep_efficiency"] <= 1
+    assert detect_apnea_events(wav)["events_detected"] == 1
+
+
+def test_snoring_loudness_keeps_its_units_on_every_path():
+    measured = detect_snoring(encode_wav(_night(), RATE))
+    assert measured["loudness_dbfs"] < 0 and measured["loudness_db"] is None
+    mock = detect_snoring()
+    assert 45 <= mock["loudness_db"] <= 65 and mock["loudness_dbfs"] < 0
@@ -0,0 +1,35 @@
+import numpy as np
+
+from backend.models.audio_io import decode_wav, encode_wav, resample, rms_db
+
+
+def test_wav_round_trip_and_resample():
+    t = np.arange(800) / 8000.0
+    tone = 0.5 * np.sin(2 * np.pi * 440 * t).astype(np.float32)
+    samples, rate = decode_wav(encode_wav(tone, 8000))
+    assert rate == 8000
+    assert np.allclose(samples, tone, atol=1e-4)
+    assert resample(samples, 8000, 16000).shape == (1600,)
+    assert np.isclose(rms_db(tone), 20 * np.log10(0.5 / np.sqrt(2)), atol=0.1)
+    assert rms_db(np.zeros(10)) == -120.0
+
+
+def test_stream_decoder_matches_whole_file_decode():
+    from backend.models.audio_io import WavStreamDecoder
+
+    stereo = np.stack([np.linspace(-0.5, 0.5, 1001), np.zeros(1001)], axis=1)
+    import io, wave
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(8000)
+        wav.writeframes((stereo * 32767).astype("<i2").tobytes())
+    data = buf.getvalue()
+
+    decoder = WavStreamDecoder()
+    pieces = [decoder.feed(data[i:i + 7]) for i in range(0, len(data), 7)]
+    streamed = np.concatenate(pieces)
+    expected, rate = decode_wav(data)
+    assert decoder.sample_rate == rate == 8000
+    assert np.array_equal(streamed, expected)
@@ -0,0 +1,109 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from backend.models import inference
+from backend.utils.batching import MicroBatcher
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_concurrent_items_share_batches_and_keep_their_results():
+    calls = []
+
+    def double(items):
+        calls.append(len(items))
+        return [2 * x for x in items]
+
+    batcher = MicroBatcher("double", double, max_batch_size=8, max_wait_ms=20)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(20)))
+
+    assert _run(main()) == [2 * i for i in range(20)]
+    assert calls == [8, 8, 4]
+    stats = batcher.stats()
+    assert stats["batch_size_histogram"] == {"4": 1, "8": 2}
+    assert stats["mean_batch_size"] == pytest.approx(20 / 3, abs=1e-3)
+
+    # A lone request is dispatched after max_wait_ms without company
+    assert _run(batcher.submit(5)) == 10 and calls[-1] == 1
+
+
+def test_batch_errors_reach_every_caller():
+    def broken(items):
+        raise ValueError("bad batch")
+
+    batcher = MicroBatcher("broken", broken, max_batch_size=4, max_wait_ms=1)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in _run(main()))
+
+
+def test_cancelled_caller_does_not_strand_the_batch():
+    calls = []
+
+    def double(items):
+        calls.append(list(items))
+        return [2 * x for x in items]
+
+    batcher = MicroBatcher("double", double, max_batch_size=8, max_wait_ms=50)
+
+    async def main():
+        tasks = [asyncio.ensure_future(batcher.submit(i)) for i in range(3)]
+        await asyncio.sleep(0)
+        tasks[0].cancel()
+        return await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 2)
+
+    first, *rest = _run(main())
+    assert isinstance(first, asyncio.CancelledError) and rest == [2, 4]
+    assert calls == [[1, 2]]
+
+
+def test_bad_item_fails_alone(monkeypatch):
+    batcher = MicroBatcher("spo2", inference.predict_spo2_batch, max_batch_size=2, max_wait_ms=50)
+
+    async def main():
+        return await asyncio.gather(batcher.submit({"avg_spo2": 95}), batcher.submit({"avg_spo2": "bad"}),
+                                    return_exceptions=True)
+
+    good, bad = _run(main())
+    assert good == inference.predict_spo2({"avg_spo2": 95}) and isinstance(bad, TypeError)
+    assert batcher.stats()["isolated_batches"] == 1
+
+    # In model mode the good item keeps its model prediction instead of falling back to mock
+    monkeypatch.setattr(inference, "USE_MOCK", False)
+    class FakeModel:
+        def predict(self, arr, verbose=0):
+            return arr[:, :1] / 100
+
+    monkeypatch.setattr(inference, "SPO2_MODEL", FakeModel())
+    monkeypatch.setattr(inference, "SPO2_EXECUTOR", None)
+    good, bad = _run(main())
+    assert good["model"] == "spo2_model" and isinstance(bad, TypeError)
+
+
+def test_model_batch_matches_single_predictions(monkeypatch):
+    class FakeModel:
+        def __init__(self):
+            self.batches = []
+
+        def predict(self, arr, verbose=0):
+            self.batches.append(arr.shape[0])
+            return 1 / (1 + np.exp(-(arr[:, :1] - 95)))
+
+    model = FakeModel()
+    monkeypatch.setattr(inference, "USE_MOCK", False)
+    monkeypatch.setattr(inference, "SPO2_MODEL", model)
+    monkeypatch.setattr(inference, "SPO2_EXECUTOR", None)
+    features = [{"avg_spo2": v, "min_spo2": v - 2} for v in (90.0, 95.5, 99.0)] + [{"X": [93.0, 91.0, 1.0]}]
+
+    batched = inference.predict_spo2_batch(features)
+    assert model.batches == [3, 1]  # the ragged vector runs on its own
+    assert batched == [inference.predict_spo2(f) for f in features]
+    assert [r["label"] for r in batched] == ["normal", "low", "low", "normal"]
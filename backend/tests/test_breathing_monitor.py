@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from backend.main import app
+from backend.models.breathing_monitor import PAUSE_END, PAUSE_START, BreathingRateEstimator, RingBuffer
+
+FPS = 30
+
+
+def _chest(seconds=120, bpm=15.0, flat=(60, 80)):
+    """Chest height breathing at ``bpm`` with slow drift, jitter and a flat stretch."""
+    rng = np.random.default_rng(0)
+    t = np.arange(0, seconds, 1 / FPS)
+    y = 0.5 + 0.01 * t / seconds + 0.0008 * rng.standard_normal(t.size)
+    breathing = (t < flat[0]) | (t >= flat[1])
+    y[breathing] += 0.004 * np.sin(2 * np.pi * bpm / 60 * t[breathing])
+    return t, y
+
+
+def test_ring_buffer_overwrites_oldest():
+    ring = RingBuffer(3)
+    for v in range(5):
+        ring.append(v)
+    assert len(ring) == 3 and ring.first == 2 and ring.last == 4
+    assert ring.popleft() == 2 and list(ring.values()) == [3, 4]
+
+
+def test_rate_and_pause_events_from_streamed_samples():
+    t, y = _chest()
+    estimator = BreathingRateEstimator(sample_rate=FPS, pause_seconds=10)
+    events, rates = [], []
+    for value, ts in zip(y, t):
+        events.extend(estimator.update(value, ts))
+        if ts in (50.0, 110.0):
+            rates.append(estimator.rate_bpm)
+
+    assert all(abs(r - 15.0) < 1.0 for r in rates)
+    assert [e["type"] for e in events] == [PAUSE_START, PAUSE_END]
+    start, end = events
+    assert 59 <= start["start"] <= 62 and start["time"] - start["start"] >= 10
+    assert 20 <= end["duration"] <= 27
+
+
+def test_missing_detections_are_not_pauses():
+    t, y = _chest(seconds=60, flat=(0, 0))
+    y[(t >= 20) & (t < 45)] = np.nan  # sleeper out of view
+    estimator = BreathingRateEstimator(sample_rate=FPS, pause_seconds=30)
+    assert estimator.feed(y) == []
+
+
+def test_websocket_streams_rate_and_events():
+    t, y = _chest(seconds=90, flat=(40, 70))
+    client = TestClient(app)
+    messages = []
+    with client.websocket_connect(f"/api/v1/breathing/ws?fps={FPS}&pause_seconds=10") as ws:
+        for i in range(0, t.size, 2 * FPS):
+            ws.send_json({"frames": [{"t": float(ts), "chest_y": float(v)} for ts, v in zip(t[i:i + 2 * FPS], y[i:i + 2 * FPS])]})
+            message = ws.receive_json()
+            while message["type"] != "rate":
+                messages.append(message)
+                message = ws.receive_json()
+            messages.append(message)
+        ws.send_json([1, 2])
+        assert ws.receive_json()["type"] == "error"
+        ws.send_text("not json")
+        assert ws.receive_json()["type"] == "error"
+        ws.send_json({"t": 200.0, "chest_y": 0.5})  # the socket is still open
+        assert ws.receive_json()["type"] in ("rate", PAUSE_START, PAUSE_END)
+
+    types = [m["type"] for m in messages]
+    assert PAUSE_START in types and PAUSE_END in types
+    assert messages[types.index(PAUSE_START) + 1]["paused"] is True
+    assert abs(messages[-1]["rate_bpm"] - 15.0) < 1.5
+
+
+def test_websocket_rejects_non_positive_fps():
+    client = TestClient(app)
+    with pytest.raises(WebSocketDisconnect) as excinfo:
+        with client.websocket_connect("/api/v1/breathing/ws?fps=0"):
+            pass
+    assert excinfo.value.code == 1008
+    with pytest.raises(ValueError):
+        BreathingRateEstimator(sample_rate=0)
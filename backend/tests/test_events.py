@@ -0,0 +1,63 @@
+import numpy as np
+
+from backend.models.events import events_per_hour, extract_events, find_runs, timeline_from_dict
+from backend.models.sleep_report import generate_sleep_report
+
+
+def test_find_runs():
+    starts, ends = find_runs([0, 1, 1, 0, 1])
+    assert starts.tolist() == [1, 4]
+    assert ends.tolist() == [3, 5]
+
+
+def test_adjacent_windows_merge_and_short_events_drop():
+    # 10 s windows, 5 s hop: windows 1-3 form one 20 s event; windows 6 and 9 are
+    # 10 s events, kept at a 10 s minimum duration and dropped at 15 s
+    probs = np.array([0.1, 0.7, 0.9, 0.6, 0.2, 0.1, 0.8, 0.3, 0.2, 0.55])
+    timeline = extract_events(probs, hop_seconds=5.0, window_seconds=10.0, min_duration=10.0)
+    assert timeline.start.tolist() == [5.0, 30.0, 45.0]
+    assert timeline.end.tolist() == [25.0, 40.0, 55.0]
+    assert np.allclose(timeline.peak, [0.9, 0.8, 0.55])
+
+    longer = extract_events(probs, hop_seconds=5.0, window_seconds=10.0, min_duration=15.0)
+    assert longer.start.tolist() == [5.0] and longer.end.tolist() == [25.0]
+
+
+def test_events_per_hour_scales_with_duration():
+    probs = np.tile([0.9, 0.9, 0.1, 0.1], 30)
+    timeline = extract_events(probs, hop_seconds=5.0, window_seconds=10.0)
+    assert len(timeline) == 30
+    assert events_per_hour(timeline, 1800) == 60.0
+    assert events_per_hour(timeline, 7200) == 15.0
+
+
+def test_report_uses_timeline_for_ahi():
+    timeline = extract_events(np.tile([0.9, 0.9, 0.1], 14), hop_seconds=5.0, window_seconds=10.0)
+    analysis = {
+        "sleep_efficiency": 0.9,
+        "total_sleep_time": 7.0,
+        "sleep_stages": {"wake": 40, "light": 200, "deep": 90, "rem": 90},
+        "apnea_events": len(timeline),
+        "apnea_timeline": timeline,
+    }
+    metrics = generate_sleep_report(analysis)["clinical_metrics"]
+    assert metrics["ahi_index"] == 2.0
+    assert metrics["apnea_event_count"] == 14
+    assert metrics["longest_apnea_seconds"] == 15.0
+
+
+def test_report_uses_breathing_pauses_of_an_audio_analysis():
+    from backend.models.audio_io import encode_wav
+    from backend.models.sleep_analyzer import analyze_sleep_audio
+    rate = 8000
+    rng = np.random.default_rng(1)
+    t = np.arange(90 * rate) / rate
+    signal = 0.05 * (0.6 + 0.4 * np.sin(2 * np.pi * 0.25 * t)) * rng.standard_normal(t.shape[0])
+    signal[(t >= 40) & (t < 60)] *= 0.02  # one 20 s pause
+
+    analysis = analyze_sleep_audio(encode_wav(signal, rate))
+    pauses = timeline_from_dict(analysis["audio_events"]["breathing_pauses"])
+    assert len(pauses) == 1 and analysis["recorded_seconds"] == 90.0
+    metrics = generate_sleep_report(analysis)["clinical_metrics"]
+    assert metrics["apnea_event_count"] == 1 and metrics["ahi_index"] == 40.0
+    assert metrics["longest_apnea_seconds"] == round(float(pauses.duration[0]), 1)
@@ -0,0 +1,46 @@
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.utils import executors
+from backend.utils.executors import BoundedExecutor, ExecutorBusy
+
+client = TestClient(app)
+AUTH = {"Authorization": "Bearer test"}
+
+
+def test_bounded_executor_rejects_beyond_capacity_and_tracks_waits():
+    pool = BoundedExecutor("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+    running = pool.submit(release.wait)
+    queued = pool.submit(lambda: 42)
+    with pytest.raises(ExecutorBusy):
+        pool.submit(lambda: 0)
+
+    stats = pool.stats()
+    assert (stats["running"], stats["queued"], stats["rejected"]) == (1, 1, 1)
+    release.set()
+    assert running.result(timeout=5) is True and queued.result(timeout=5) == 42
+    stats = pool.stats()
+    assert stats["completed"] == 2 and stats["queued"] == 0 and stats["max_wait_ms"] > 0
+    pool.shutdown()
+
+
+def test_full_pool_returns_503_and_stats_endpoint(monkeypatch):
+    busy = BoundedExecutor(executors.INFERENCE, max_workers=1, max_queue=0)
+    release = threading.Event()
+    busy.submit(release.wait)
+    monkeypatch.setitem(executors._EXECUTORS, executors.INFERENCE, busy)
+    try:
+        r = client.post("/api/v1/upload/wearable", json={"samples": [{"ts": 1, "hr": 60}]}, headers=AUTH)
+        assert r.status_code == 503
+        assert r.headers["retry-after"] == "1" and r.json()["pool"] == "inference"
+
+        stats = client.get("/api/v1/executors").json()["executors"]
+        assert stats["inference"]["running"] == 1 and stats["inference"]["rejected"] == 1
+        assert set(stats["io"]) >= {"queued", "mean_wait_ms"}
+    finally:
+        release.set()
+        busy.shutdown()
@@ -0,0 +1,199 @@
+import importlib
+import importlib.util
+import sys
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from backend.models.frame_store import FrameColumns
+
+MODULE = "backend.models.extract_pose_features"
+TOTAL_FRAMES = 1000
+FPS = 25.0
+
+
+@pytest.fixture
+def module(monkeypatch):
+    """extract_pose_features imported without requiring cv2 / mediapipe."""
+    # cv2 / mediapipe are only needed at import time here; everything that
+    # touches them is replaced by the tests
+    if importlib.util.find_spec("cv2") is None:
+        monkeypatch.setitem(sys.modules, "cv2", types.ModuleType("cv2"))
+    if importlib.util.find_spec("mediapipe") is None:
+        mediapipe = types.ModuleType("mediapipe")
+        mediapipe.solutions = types.SimpleNamespace(pose=None)
+        monkeypatch.setitem(sys.modules, "mediapipe", mediapipe)
+    monkeypatch.delitem(sys.modules, MODULE, raising=False)
+    yield importlib.import_module(MODULE)
+    sys.modules.pop(MODULE, None)
+
+
+@pytest.fixture
+def pose(module, monkeypatch):
+    """extract_pose_features with VideoCapture and pose extraction replaced by fakes."""
+
+    class FakeCapture:
+        def __init__(self, path):
+            pass
+
+        def isOpened(self):
+            return True
+
+        def get(self, prop):
+            return {"fps": FPS, "count": TOTAL_FRAMES}[prop]
+
+        def release(self):
+            pass
+
+    def fake_range(video_path, start_frame=0, end_frame=None, sample_rate=1, progress=None, sink=None, **options):
+        rows = FrameColumns(sink=sink)
+        end = TOTAL_FRAMES if end_frame is None else end_frame
+        for frame_idx in range(start_frame, end):
+            if progress is not None:
+                progress(frame_idx + 1 - start_frame, TOTAL_FRAMES - start_frame)
+            if frame_idx % sample_rate == 0:
+                rows.append(frame_idx + 1, frame_idx / FPS, np.sin(frame_idx / 7), np.cos(frame_idx / 11), 1.0)
+        return rows.arrays(), FPS, TOTAL_FRAMES
+
+    class InProcessPool(ThreadPoolExecutor):
+        # Spawned workers would re-import the real cv2/mediapipe; run shards on threads
+        def __init__(self, max_workers, mp_context=None, **kwargs):
+            super().__init__(max_workers=max_workers, **kwargs)
+
+    monkeypatch.setattr(module, "cv2", types.SimpleNamespace(
+        VideoCapture=FakeCapture, CAP_PROP_FPS="fps", CAP_PROP_FRAME_COUNT="count"))
+    monkeypatch.setattr(module, "_extract_range", fake_range)
+    monkeypatch.setattr(module, "ProcessPoolExecutor", InProcessPool)
+    return module
+
+
+def test_sharded_extraction_matches_a_single_pass(pose):
+    single, fps, _ = pose._extract_range("night.mp4", sample_rate=3)
+    seen = []
+    sharded, sharded_fps = pose._extract_sharded("night.mp4", 3, 4, progress=lambda done, total: seen.append(done))
+    assert sharded_fps == fps == FPS
+    assert set(sharded) == set(single)
+    for name in single:
+        assert np.array_equal(sharded[name], single[name])
+    assert seen and seen[-1] == TOTAL_FRAMES
+
+
+# Synthetic 100x200 video: a bright 20x20 "torso" patch at (x, y) pixel offsets per frame
+PATCH_A, PATCH_B = (50, 30), (150, 70)
+FRAMES = [PATCH_A, None, None, PATCH_A, None, None, PATCH_B, None, None, None, None, None, PATCH_B]
+
+
+def _frame(patch):
+    frame = np.zeros((100, 200, 3), dtype=np.uint8)
+    if patch is not None:
+        x, y = patch
+        frame[y:y + 20, x:x + 20] = 255
+    return frame
+
+
+class FakeVideo:
+    """cv2.VideoCapture over FRAMES, recording which frames are decoded."""
+
+    instances = []
+
+    def __init__(self, path):
+        self.pos = 0
+        self.retrieved = []
+        FakeVideo.instances.append(self)
+
+    def isOpened(self):
+        return True
+
+    def get(self, prop):
+        return {"fps": 10.0, "count": len(FRAMES)}[prop]
+
+    def set(self, prop, value):
+        assert prop == "pos"
+        self.pos = value
+
+    def grab(self):
+        if self.pos >= len(FRAMES):
+            return False
+        self.pos += 1
+        return True
+
+    def retrieve(self):
+        self.retrieved.append(self.pos - 1)
+        return True, _frame(FRAMES[self.pos - 1])
+
+    def release(self):
+        pass
+
+
+class FakePose:
+    """mp_pose.Pose that finds the bright patch in whatever image it is given."""
+
+    calls = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    def process(self, image):
+        FakePose.calls.append(image.shape[:2])
+        ys, xs = np.nonzero(image.max(axis=2))
+        if xs.size == 0:
+            return types.SimpleNamespace(pose_landmarks=None)
+        h, w = image.shape[:2]
+        x0, x1, y0, y1 = xs.min() / w, (xs.max() + 1) / w, ys.min() / h, (ys.max() + 1) / h
+        landmark = [types.SimpleNamespace(x=0.0, y=0.0, visibility=0.0) for _ in range(33)]
+        for index, (x, y) in zip((11, 12, 23, 24), ((x0, y0), (x1, y0), (x0, y1), (x1, y1))):
+            landmark[index] = types.SimpleNamespace(x=x, y=y, visibility=0.9)
+        return types.SimpleNamespace(pose_landmarks=types.SimpleNamespace(landmark=landmark))
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def video(module, monkeypatch):
+    def resize(frame, size, interpolation=None):
+        # Nearest neighbour keeps the patch edges on exact pixel boundaries
+        w, h = size
+        rows = np.arange(h) * frame.shape[0] // h
+        cols = np.arange(w) * frame.shape[1] // w
+        return frame[rows][:, cols]
+
+    FakeVideo.instances.clear()
+    FakePose.calls.clear()
+    monkeypatch.setattr(module, "cv2", types.SimpleNamespace(
+        VideoCapture=FakeVideo, CAP_PROP_FPS="fps", CAP_PROP_FRAME_COUNT="count", CAP_PROP_POS_FRAMES="pos",
+        resize=resize, INTER_AREA=None, cvtColor=lambda frame, code: frame[..., ::-1], COLOR_BGR2RGB=None))
+    monkeypatch.setattr(module, "mp_pose", types.SimpleNamespace(Pose=FakePose))
+    return module
+
+
+def test_extract_range_samples_frames_and_remaps_roi_crops(video):
+    columns, fps, total = video._extract_range("night.mp4", sample_rate=3, inference_width=100, roi_tracking=True)
+    assert (fps, total) == (10.0, len(FRAMES))
+    # Only sampled frames are decoded; frame numbers are 1-based
+    assert FakeVideo.instances[0].retrieved == [0, 3, 6, 9, 12]
+    assert columns["frame"].tolist() == [1, 4, 7, 10, 13]
+    np.testing.assert_allclose(columns["timestamp"], [0.0, 0.3, 0.6, 0.9, 1.2])
+
+    assert FakePose.calls == [
+        (50, 100),  # first frame: full frame downscaled to inference_width
+        (40, 40),   # torso crop around patch A
+        (40, 40),   # patch moved out of the crop ...
+        (50, 100),  # ... so the full frame is posed again
+        (40, 40),   # crop around patch B finds nothing ...
+        (50, 100),  # ... and neither does the full frame
+        (50, 100),  # no pose: tracking restarts from the full frame
+    ]
+    # Crop coordinates map back to the same full-frame chest position
+    np.testing.assert_allclose(columns["chest_x"], [0.3, 0.3, 0.8, np.nan, 0.8])
+    np.testing.assert_allclose(columns["chest_y"], [0.4, 0.4, 0.8, np.nan, 0.8])
+    np.testing.assert_allclose(columns["visibility"], [0.9, 0.9, 0.9, 0.0, 0.9])
+
+
+def test_extract_range_seeks_to_its_start_frame(video):
+    columns, _, _ = video._extract_range("night.mp4", start_frame=2, end_frame=8, sample_rate=3)
+    assert FakeVideo.instances[0].retrieved == [3, 6]
+    assert columns["frame"].tolist() == [4, 7]
+    assert FakePose.calls == [(100, 200), (100, 200)]  # no resize or crop unless asked for
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from backend.models.frame_store import FrameColumns, FrameStoreWriter, export_csv, load_frames
+from backend.models.pose_motion import compute_motion
+
+
+def _fill(columns, n):
+    for i in range(1, n + 1):
+        chest = np.nan if i % 7 == 0 else i / 100
+        columns.append(i, (i - 1) / 30.0, chest, chest / 2, 0.9)
+
+
+def test_buffered_rows_stream_to_writer_and_load_as_memmap(tmp_path):
+    writer = FrameStoreWriter(tmp_path / "frames")
+    columns = FrameColumns(capacity=16, sink=writer.write)
+    _fill(columns, 50)
+    assert columns.arrays()["frame"].size == 0  # everything went to the sink
+    assert writer.rows == 50
+
+    motion = compute_motion(writer.read_column("chest_x"), writer.read_column("chest_y"))
+    writer.write_column("motion", motion)
+    writer.close(fps=30.0, sample_rate=1)
+
+    frames = load_frames(tmp_path / "frames")
+    assert isinstance(frames["chest_x"], np.memmap)
+    assert frames["frame"].dtype == np.int32 and list(frames["frame"][:3]) == [1, 2, 3]
+    assert np.isnan(frames["chest_x"][6]) and frames["motion"].dtype == np.float32
+    assert np.allclose(frames["motion"], motion)
+
+    in_memory = FrameColumns(capacity=16)
+    _fill(in_memory, 50)
+    arrays = in_memory.arrays()
+    assert np.array_equal(arrays["timestamp"], frames["timestamp"])
+    with pytest.raises(ValueError):
+        FrameStoreWriter(tmp_path / "other").write_column("motion", np.zeros(3))
+
+
+def test_export_csv_and_incomplete_store(tmp_path):
+    writer = FrameStoreWriter(tmp_path / "frames")
+    writer.write({"frame": np.array([1, 2]), "chest_x": np.array([0.5, np.nan])})
+    with pytest.raises(FileNotFoundError):
+        load_frames(tmp_path / "frames")  # no meta.json until close
+    writer.close()
+
+    lines = export_csv(tmp_path / "frames", tmp_path / "frames.csv").read_text().splitlines()
+    assert lines == ["frame,chest_x", "1,0.5", "2,"]
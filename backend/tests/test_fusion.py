@@ -0,0 +1,54 @@
+import json
+
+import numpy as np
+import pytest
+
+from backend.models.fusion import PROFILES, FusionEngine, FusionProfile, load_profiles
+from backend.models.inference import fuse_modalities
+
+
+def test_full_rows_match_original_weighted_sum():
+    rng = np.random.default_rng(0)
+    audio, video, wearable = rng.random((3, 1000))
+    score, level = FusionEngine().fuse({"audio": audio, "video": video, "wearable": wearable})
+    original = audio * 0.5 + video * 0.2 + wearable * 0.3
+    assert np.array_equal(score, original)
+    assert list(level) == ["high" if s > 0.6 else "moderate" if s > 0.35 else "low" for s in original]
+
+
+def test_missing_modalities_renormalize_weights():
+    nan = np.nan
+    score, level = FusionEngine().fuse({
+        "audio": [0.8, nan, nan],
+        "video": [nan, nan, nan],
+        "wearable": [0.2, 0.9, nan],
+    })
+    assert score[0] == pytest.approx((0.8 * 0.5 + 0.2 * 0.3) / 0.8)
+    assert score[1] == pytest.approx(0.9) and np.isnan(score[2])
+    assert list(level) == ["moderate", "high", "unknown"]
+    assert fuse_modalities(0.8, None, None) == {"fusion_score": 0.8, "fusion_level": "high"}
+    assert fuse_modalities(None, None, None) == {"fusion_score": None, "fusion_level": "unknown"}
+
+
+def test_profiles_load_from_json(tmp_path):
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps({"profiles": {"strict": {"weights": {"audio": 1, "wearable": 1},
+                                                         "thresholds": {"high": 0.4, "moderate": 0.2}}}}))
+    profiles = load_profiles(path)
+    assert profiles["default"] == PROFILES["default"]
+    _, level = FusionEngine(profiles["strict"]).fuse({"audio": [0.5], "wearable": [0.4], "video": [0.0]})
+    assert level[0] == "high"  # video carries no weight in this profile
+    with pytest.raises(ValueError):
+        FusionProfile.from_dict({"weights": {"eeg": 1.0}})
+
+
+def test_degenerate_profiles_are_rejected():
+    with pytest.raises(ValueError, match="zero"):
+        FusionProfile.from_dict({"weights": {"audio": 0.0, "video": 0.0}})
+    with pytest.raises(ValueError, match="below"):
+        FusionProfile.from_dict({"weights": {"audio": 1.0}, "thresholds": {"high": 0.3, "moderate": 0.3}})
+    with pytest.raises(ValueError):
+        fuse_modalities(0.5, 0.5, 0.5, weights={"audio": 0, "video": 0, "wearable": 0})
+    # Caller weights are relative
+    assert fuse_modalities(0.8, None, 0.2, weights={"audio": 2, "video": 2, "wearable": 2}) == \
+        fuse_modalities(0.8, None, 0.2, weights={"audio": 1, "video": 1, "wearable": 1})
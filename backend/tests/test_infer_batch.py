@@ -0,0 +1,63 @@
+import io
+import json
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.models.inference import fuse_modalities, predict_ecg, predict_spo2
+
+client = TestClient(app)
+AUTH = {"Authorization": "Bearer test"}
+
+
+def _records(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    records = []
+    for i in range(n):
+        r = {"id": f"night-{i}", "avg_spo2": round(float(rng.uniform(82, 100)), 2), "min_spo2": float(rng.uniform(75, 95)),
+             "rmssd": float(rng.choice([0.0, rng.uniform(5, 80)])), "avg_hrv": float(rng.uniform(10, 70)),
+             "audio_prob": float(rng.random()), "wearable_risk": float(rng.random())}
+        if i % 4 == 0:
+            del r["avg_spo2"]
+        if i % 3 == 0:
+            r["video_score"] = float(rng.random())
+        records.append(r)
+    return records
+
+
+def _ndjson(response):
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_batch_rows_match_single_record_scoring():
+    records = _records()
+    rows = _ndjson(client.post("/api/v1/infer/batch", json={"records": records}, headers=AUTH))
+    assert [row["index"] for row in rows] == list(range(len(records)))
+    for record, row in zip(records, rows):
+        assert row["id"] == record["id"]
+        assert row["spo2"] == predict_spo2(record)
+        assert row["ecg"] == predict_ecg(record)
+        assert row["fusion"] == fuse_modalities(record.get("audio_prob"), record.get("video_score"),
+                                                record.get("wearable_risk"))
+
+
+def test_columnar_json_and_npz_bodies():
+    columns = {"id": [7, 8, 9], "avg_spo2": [97.0, None, 88.0], "min_spo2": [95.0, 84.0, 80.0]}
+    rows = _ndjson(client.post("/api/v1/infer/batch?tasks=spo2", json={"columns": columns}, headers=AUTH))
+    assert [r["id"] for r in rows] == [7, 8, 9] and set(rows[0]) == {"index", "id", "spo2"}
+    assert rows[1]["spo2"] == predict_spo2({"min_spo2": 84.0})
+
+    buffer = io.BytesIO()
+    np.savez(buffer, avg_spo2=np.array([97.0, np.nan, 88.0]), min_spo2=np.array([95.0, 84.0, 80.0]))
+    npz_rows = _ndjson(client.post("/api/v1/infer/batch?tasks=spo2", content=buffer.getvalue(),
+                                   headers={**AUTH, "Content-Type": "application/x-npz"}))
+    assert [r["spo2"] for r in npz_rows] == [r["spo2"] for r in rows]
+
+
+def test_batch_rejects_bad_requests():
+    assert client.post("/api/v1/infer/batch?tasks=spo2,xray", json={"records": []}, headers=AUTH).status_code == 400
+    ragged = {"columns": {"avg_spo2": [97.0], "min_spo2": [95.0, 90.0]}}
+    assert client.post("/api/v1/infer/batch", json=ragged, headers=AUTH).status_code == 400
@@ -0,0 +1,64 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.utils.jobs import FAILED, QUEUED, SUCCEEDED, JobQueue, JobStore, QueueFull
+
+release = threading.Event()
+
+
+def count_frames(params, progress):
+    for i in range(1, params["frames"] + 1):
+        progress(i, params["frames"])
+    if params.get("wait"):
+        release.wait(5)
+    if params.get("fail"):
+        raise RuntimeError("decode error")
+    return {"frames": params["frames"]}
+
+
+def _queue(tmp_path, **kwargs):
+    queue = JobQueue(JobStore(tmp_path), executor_factory=lambda n: ThreadPoolExecutor(n),
+                     progress_interval=0.0, **kwargs)
+    queue.register("count", count_frames)
+    return queue
+
+
+def test_job_runs_in_background_and_reports_progress(tmp_path):
+    queue = _queue(tmp_path)
+    ok = queue.submit("count", {"frames": 40})
+    bad = queue.submit("count", {"frames": 3, "fail": True})
+    queue.shutdown(wait=True)
+
+    status = queue.status(ok["id"])
+    assert status["status"] == SUCCEEDED
+    assert status["progress"] == {"done": 40, "total": 40}
+    assert queue.result(ok["id"])["result"] == {"frames": 40}
+    assert queue.status(bad["id"])["status"] == FAILED
+    assert "decode error" in queue.status(bad["id"])["error"]
+
+
+def test_queue_depth_is_capped(tmp_path):
+    release.clear()
+    queue = _queue(tmp_path, max_workers=1, max_pending=2)
+    queue.submit("count", {"frames": 1, "wait": True})
+    queue.submit("count", {"frames": 1})
+    with pytest.raises(QueueFull):
+        queue.submit("count", {"frames": 1})
+    release.set()
+    queue.shutdown(wait=True)
+    assert queue.pending == 0
+
+
+def test_unfinished_jobs_resume_after_restart(tmp_path):
+    store = JobStore(tmp_path)
+    store.save({"id": "left-over", "kind": "count", "status": "running", "params": {"frames": 5}, "created_at": 0})
+    store.save({"id": "done", "kind": "count", "status": SUCCEEDED, "params": {"frames": 1}, "created_at": 0})
+
+    queue = _queue(tmp_path)
+    assert queue.recover() == ["left-over"]
+    queue.shutdown(wait=True)
+    assert store.load("left-over")["status"] == SUCCEEDED
+    assert store.load("left-over")["result"] == {"frames": 5}
+    assert QUEUED not in {r["status"] for r in store.all()}
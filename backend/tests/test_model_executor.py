@@ -0,0 +1,54 @@
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from backend.models.model_executor import BucketedExecutor
+
+
+class FakeModel:
+    """Keras stand-in: per-row weighted sum, recording every batch shape it is called with."""
+
+    input_shape = (None, 4, 1)
+    output_shape = (None, 2)
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, x, training=None):
+        assert training is False
+        self.calls.append(x.shape)
+        flat = x.reshape(x.shape[0], -1)
+        return np.stack([flat @ np.arange(1.0, 5.0), flat.sum(axis=1)], axis=1)
+
+
+@pytest.fixture
+def fake_tf(monkeypatch):
+    tf = types.ModuleType("tensorflow")
+    tf.function = lambda fn: fn
+    monkeypatch.setitem(sys.modules, "tensorflow", tf)
+
+
+def test_batches_are_padded_to_buckets_and_split_past_the_largest(fake_tf):
+    model = FakeModel()
+    executor = BucketedExecutor(model, buckets=(8, 1, 4), warmup=True)
+    assert executor.buckets == (1, 4, 8) and executor.input_shape == (4, 1)
+    assert model.calls == [(1, 4, 1), (4, 4, 1), (8, 4, 1)]  # every bucket traced at warmup
+    assert [executor.bucket_for(n) for n in (1, 2, 4, 5, 8, 30)] == [1, 4, 4, 8, 8, 8]
+
+    rng = np.random.default_rng(0)
+    for n, shapes in [(1, [1]), (3, [4]), (8, [8]), (19, [8, 8, 4])]:
+        model.calls.clear()
+        x = rng.standard_normal((n, 4)).astype(np.float32)  # flat rows are reshaped to the input shape
+        out = executor(x)
+        assert [shape[0] for shape in model.calls] == shapes
+        assert out.shape == (n, 2)
+        np.testing.assert_allclose(out, model(x.reshape(n, 4, 1), training=False), rtol=1e-6)
+
+    assert executor(np.empty((0, 4, 1))).shape == (0, 2)
+
+
+def test_buckets_are_required(fake_tf):
+    with pytest.raises(ValueError):
+        BucketedExecutor(FakeModel(), buckets=())
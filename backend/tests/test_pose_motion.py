@@ -0,0 +1,45 @@
+import numpy as np
+
+from backend.models.pose_motion import compute_motion, plan_shards
+
+
+def _loop_motion(xs, ys):
+    """The original per-frame loop in extract_pose_chest_motion."""
+    prev, out = None, []
+    for x, y in zip(xs, ys):
+        valid = not np.isnan(x) and not np.isnan(y)
+        out.append(float(np.linalg.norm(np.array([x, y]) - np.array(prev))) if prev is not None and valid else 0.0)
+        if valid:
+            prev = (x, y)
+    return out
+
+
+def test_motion_matches_sequential_loop_across_gaps():
+    rng = np.random.default_rng(0)
+    xs, ys = rng.random(500), rng.random(500)
+    xs[rng.random(500) < 0.2] = np.nan
+    ys[:3] = np.nan
+    assert np.allclose(compute_motion(xs, ys), _loop_motion(xs, ys))
+
+
+def test_shards_cover_sampled_frames_exactly():
+    for total, rate, n in [(1000, 3, 4), (10, 1, 4), (7, 5, 8), (800_000, 2, 6)]:
+        shards = plan_shards(total, rate, n)
+        assert shards[0][0] == 0 and shards[-1][1] == total
+        assert all(a % rate == 0 and a < b for a, b in shards)
+        assert all(shards[i][1] == shards[i + 1][0] for i in range(len(shards) - 1))
+        sampled = [f for a, b in shards for f in range(a, b) if f % rate == 0]
+        assert sampled == list(range(0, total, rate))
+    assert plan_shards(0, 2, 4) == []
+
+
+def test_torso_box_round_trips_crop_coordinates():
+    from backend.models.pose_motion import crop_to_frame, torso_box
+
+    xs, ys = [0.4, 0.6, 0.42, 0.58], [0.3, 0.31, 0.7, 0.69]
+    box = torso_box(xs, ys)
+    assert box[0] < 0.4 and box[2] > 0.6 and box[1] < 0.3 and box[3] > 0.7
+    # A landmark at crop-relative position maps back to where it was
+    cx = (0.5 - box[0]) / (box[2] - box[0])
+    assert np.isclose(crop_to_frame(cx, 0.0, box)[0], 0.5)
+    assert torso_box([0.99, 1.0], [0.0, 0.01])[2] == 1.0
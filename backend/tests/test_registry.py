@@ -0,0 +1,38 @@
+import threading
+
+from backend.models.registry import ModelRegistry
+
+
+class FakeModel:
+    def count_params(self):
+        return 10
+
+
+def test_models_load_once_and_are_shared(tmp_path):
+    path = tmp_path / "model.hdf5"
+    path.write_bytes(b"weights")
+    loads = []
+    registry = ModelRegistry(loader=lambda p: loads.append(p) or FakeModel())
+
+    handles = []
+    threads = [threading.Thread(target=lambda: handles.append(registry.acquire(str(path)))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(loads) == 1
+    assert len({id(h.model) for h in handles}) == 1
+    resident = registry.resident()
+    assert resident[0]["refcount"] == 8
+    assert resident[0]["bytes"] == 40
+
+
+def test_evict_respects_live_handles(tmp_path):
+    path = tmp_path / "model.hdf5"
+    path.write_bytes(b"weights")
+    registry = ModelRegistry(loader=lambda p: FakeModel())
+    with registry.acquire(str(path)):
+        assert registry.evict() == []
+    assert registry.evict() == [str(path.resolve())]
+    assert registry.stats()["count"] == 0
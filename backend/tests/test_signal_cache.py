@@ -0,0 +1,42 @@
+import numpy as np
+
+from backend.models.signal_cache import SignalCache
+
+
+def test_csv_is_parsed_once_and_memory_mapped(tmp_path):
+    src = tmp_path / "spo2.csv"
+    src.write_text("SpO2\n97.5\n96.0\n91.25\n")
+    cache = SignalCache(tmp_path / "cache")
+
+    first = cache.load(src)
+    second = cache.load(src)
+
+    assert isinstance(second, np.memmap)
+    assert second.dtype == np.float32
+    assert np.array_equal(first, [97.5, 96.0, 91.25])
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_identical_content_shares_an_entry(tmp_path):
+    a, b = tmp_path / "a.npy", tmp_path / "b.npy"
+    np.save(a, np.arange(10.0))
+    np.save(b, np.arange(10.0))
+    cache = SignalCache(tmp_path / "cache")
+    cache.load(a)
+    assert np.array_equal(cache.load(b), np.arange(10, dtype=np.float32))
+    assert cache.stats()["hits"] == 1
+
+
+def test_remembered_hashes_are_bounded(tmp_path):
+    cache = SignalCache(tmp_path / "cache", max_digests=2)
+    paths = []
+    for i in range(3):
+        paths.append(tmp_path / f"night{i}.npy")
+        np.save(paths[-1], np.arange(i + 1.0))
+    cache.content_hash(paths[0])
+    cache.content_hash(paths[1])
+    cache.content_hash(paths[0])  # most recently used again
+    cache.content_hash(paths[2])
+    assert len(cache._digests) == 2
+    assert {key[0] for key in cache._digests} == {str(paths[0].resolve()), str(paths[2].resolve())}
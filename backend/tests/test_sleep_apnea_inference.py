@@ -0,0 +1,151 @@
+import sys
+import threading
+import types
+
+import numpy as np
+import pytest
+
+from backend.models import sleep_apnea_inference as sai
+from backend.models.registry import ModelRegistry
+
+
+class FakeModel:
+    """Keras stand-in: one probability per window, from the window mean."""
+
+    def __init__(self, window):
+        self.input_shape = (None, window)
+        self.output_shape = (None, 1)
+        self.threads = set()
+        self.fail = False
+
+    def count_params(self):
+        return 10
+
+    def predict(self, x, verbose=0):
+        self.threads.add(threading.current_thread().name)
+        if self.fail:
+            raise RuntimeError("kernel failed")
+        return 1 / (1 + np.exp(-x.mean(axis=1, keepdims=True) * 4))
+
+
+@pytest.fixture
+def engine(monkeypatch, tmp_path):
+    models = {"ecg.hdf5": FakeModel(1000), "spo2.hdf5": FakeModel(100)}
+    for name in models:
+        (tmp_path / name).write_bytes(b"weights")
+    registry = ModelRegistry(loader=lambda path: models[path.rsplit("/", 1)[-1]])
+    monkeypatch.setattr(sai, "model_registry", registry)
+    inference = sai.SleepApneaInference(str(tmp_path / "ecg.hdf5"), str(tmp_path / "spo2.hdf5"), batch_buckets=None)
+    yield inference
+    inference.close()
+
+
+def _signals():
+    rng = np.random.default_rng(0)
+    t = np.arange(30_000) / 100.0
+    ecg = np.sin(2 * np.pi * t / 120) + 0.3 * rng.standard_normal(t.shape[0])
+    return ecg, np.sin(2 * np.pi * t[::10] / 120) + 0.1 * rng.standard_normal(3000)
+
+
+def test_parallel_and_sequential_branches_agree(engine):
+    ecg, spo2 = _signals()
+    sequential = engine.infer(ecg, spo2, parallel=False)
+    parallel = engine.infer(ecg, spo2, parallel=True)
+    assert "status" not in parallel and parallel["timings"]["parallel"]
+    for key in ("ahi_score", "diagnosis", "ensemble_stats", "events", "raw_predictions", "analyzed_seconds"):
+        assert parallel[key] == sequential[key]
+    # The parallel run scored both branches on the branch pool
+    assert all(any(name.startswith("somnia-branch") for name in m.threads)
+               for m in (engine.ecg_model, engine.spo2_model))
+
+
+def test_failing_branch_raises_and_fails_the_inference(engine):
+    ecg, spo2 = _signals()
+    engine.spo2_model.fail = True
+    with pytest.raises(RuntimeError, match="kernel failed"):
+        engine._run_branch(spo2, engine.load_spo2_data, engine.preprocess_spo2, engine.predict_spo2)
+    for parallel in (False, True):
+        result = engine.infer(ecg, spo2, parallel=parallel)
+        assert result == {"status": "error", "message": "kernel failed"}
+
+
+def test_close_releases_model_handles_and_branch_pool(engine):
+    ecg, spo2 = _signals()
+    engine.infer(ecg, spo2, parallel=True)
+    assert [entry["refcount"] for entry in sai.model_registry.resident()] == [1, 1]
+    pool = engine._branch_pool
+    engine.close()
+    assert [entry["refcount"] for entry in sai.model_registry.resident()] == [0, 0]
+    assert engine._branch_pool is None and pool._shutdown
+    engine.close()  # idempotent
+    assert [entry["refcount"] for entry in sai.model_registry.resident()] == [0, 0]
+
+
+def _chunks(signal, size):
+    return [signal[i:i + size] for i in range(0, signal.shape[0], size)]
+
+
+def test_stream_matches_batch_inference_across_chunk_boundaries(engine):
+    # 20 s cycles: window means vary, while the running statistics settle within a chunk
+    rng = np.random.default_rng(1)
+    t = np.arange(30_000) / 100.0
+    ecg = np.sin(2 * np.pi * t / 20) + 0.3 * rng.standard_normal(t.shape[0])
+    spo2 = np.sin(2 * np.pi * t[::10] / 20) + 0.1 * rng.standard_normal(3000)
+    ecg_batch = engine.predict_ecg(engine.preprocess_ecg(ecg)).ravel()
+    spo2_batch = engine.predict_spo2(engine.preprocess_spo2(spo2)).ravel()
+
+    # 60.5 s chunks end mid-window and mid-overlap for both modalities
+    results = list(engine.infer_stream(zip(_chunks(ecg, 6050), _chunks(spo2, 605))))
+    assert [r["window"] for r in results] == list(range(len(ecg_batch))) and len(ecg_batch) == len(spo2_batch)
+    window_seconds, hop_seconds = engine.ecg_window_timing()
+    assert results[1]["start_seconds"] == hop_seconds and results[1]["end_seconds"] == hop_seconds + window_seconds
+
+    streamed = {key: np.array([r[key] for r in results]) for key in ("ecg_probability", "spo2_probability")}
+    # Running statistics differ from whole-recording z-scoring only while they settle
+    np.testing.assert_allclose(streamed["ecg_probability"], ecg_batch, atol=0.05)
+    np.testing.assert_allclose(streamed["spo2_probability"], spo2_batch, atol=0.05)
+    np.testing.assert_allclose(streamed["ecg_probability"][10:], ecg_batch[10:], atol=0.01)
+    np.testing.assert_allclose([r["apnea_probability"] for r in results],
+                               engine.ecg_weight * streamed["ecg_probability"]
+                               + engine.spo2_weight * streamed["spo2_probability"], rtol=1e-6)
+
+
+def test_stream_pairs_modalities_that_arrive_separately(engine):
+    ecg, spo2 = _signals()
+    together = list(engine.infer_stream([(ecg, spo2)]))
+
+    sent = []
+
+    def ecg_first():
+        sent.append("ecg")
+        yield ecg, None
+        sent.append("spo2")
+        yield np.empty(0), spo2
+
+    separate = []
+    for result in engine.infer_stream(ecg_first()):
+        # Nothing is paired until the SpO2 windows arrive
+        assert sent == ["ecg", "spo2"]
+        separate.append(result)
+    assert separate == together
+
+
+def test_configure_tf_threads(monkeypatch):
+    calls = []
+    threading_config = types.SimpleNamespace(
+        set_intra_op_parallelism_threads=lambda n: calls.append(("intra", n)),
+        set_inter_op_parallelism_threads=lambda n: calls.append(("inter", n)),
+    )
+    tf = types.ModuleType("tensorflow")
+    tf.config = types.SimpleNamespace(threading=threading_config)
+    monkeypatch.setitem(sys.modules, "tensorflow", tf)
+
+    assert sai.configure_tf_threads() is True and calls == []
+    assert sai.configure_tf_threads(4, 2) is True
+    assert calls == [("intra", 4), ("inter", 2)]
+
+    def too_late(n):
+        raise RuntimeError("Intra op parallelism cannot be modified after initialization.")
+
+    threading_config.set_intra_op_parallelism_threads = too_late
+    assert sai.configure_tf_threads(intra_op=8) is False
@@ -0,0 +1,99 @@
+import numpy as np
+
+from backend.models.snoring_inference import SnoringEngine
+
+
+class FakeSession:
+    """Stands in for tf.compat.v1.Session: probabilities depend on the WAV bytes."""
+
+    def __init__(self):
+        self.runs = 0
+
+    def run(self, fetch, feed):
+        self.runs += 1
+        (value,) = feed.values()
+        p = len(value) / 10.0
+        return np.array([[1.0 - p, p]])
+
+
+def _engine():
+    engine = SnoringEngine(graph_path="unused.pb", labels_path="unused.txt")
+    engine.session = FakeSession()
+    engine.labels = ["no_snoring", "snoring"]
+    return engine
+
+
+def test_loaded_engine_reuses_its_session():
+    engine = _engine()
+    session = engine.session
+    engine.score(b"12345678")
+    engine.score(b"1")
+    assert engine.session is session and session.runs == 2
+
+
+def test_batch_falls_back_to_per_clip_runs_and_formats_top_k():
+    engine = _engine()
+    probs = engine.score_batch([b"123456789", b"12"])
+    assert probs.shape == (2, 2)
+    result = engine.top_k(probs[0])
+    assert result["label"] == "snoring"
+    assert result["top"][1][0] == "no_snoring"
+    assert np.isclose(result["score"], 0.9)
+
+
+class LoudnessEngine(SnoringEngine):
+    """Scores clips by RMS so the timeline can be checked without a graph."""
+
+    def __init__(self):
+        super().__init__(graph_path="unused.pb", labels_path="unused.txt", sample_rate=1000)
+        self.session = object()
+        self.labels = ["no_snoring", "snoring"]
+        self.batches = []
+
+    def score_clips(self, clips):
+        self.batches.append(clips.shape[0])
+        p = np.clip(np.sqrt(np.mean(clips ** 2, axis=1)) * 4, 0, 1)
+        return np.stack([1 - p, p], axis=1)
+
+
+def test_analyze_long_wav_merges_snoring_clips_into_episodes():
+    from backend.models.audio_io import encode_wav
+    from backend.models.snoring_inference import analyze_long_wav
+
+    rate = 2000  # resampled to the engine's 1 kHz
+    t = np.arange(20 * rate) / rate
+    signal = np.where((t >= 5) & (t < 11), 0.5 * np.sin(2 * np.pi * 300 * t), 0.001)
+    engine = LoudnessEngine()
+
+    result = analyze_long_wav(encode_wav(signal, rate), hop_seconds=0.5, batch_size=8, engine=engine)
+
+    summary = result["summary"]
+    assert summary["duration_seconds"] == 20.0
+    assert summary["segments"] == 39
+    assert max(engine.batches) == 8 and sum(engine.batches) == 39
+    assert summary["snoring_episodes"] == 1
+    assert result["episodes"]["start"][0] >= 4.0 and result["episodes"]["end"][0] <= 12.0
+    assert summary["loudness_dbfs"] < 0
+    assert "probabilities" not in result
+
+
+def test_long_wav_streams_blocks_from_disk(tmp_path):
+    from backend.models.audio_io import decode_wav, encode_wav, resample
+    from backend.models.snoring_inference import analyze_long_wav
+    from backend.models.windowing import sliding_windows
+
+    rate = 2205  # not a multiple of the engine's 1 kHz
+    rng = np.random.default_rng(3)
+    path = tmp_path / "night.wav"
+    path.write_bytes(encode_wav(0.2 * rng.standard_normal(30 * rate), rate))
+
+    engine = LoudnessEngine()
+    result = analyze_long_wav(str(path), hop_seconds=0.5, batch_size=16, engine=engine,
+                              include_probabilities=True, block_seconds=1.7)
+    assert max(engine.batches) == 16  # clips from several blocks share a batch
+
+    # Same clips as decoding, resampling and framing the whole file at once
+    samples = resample(*decode_wav(str(path)), 1000)
+    expected = LoudnessEngine().score_clips(sliding_windows(samples, 1000, hop=500, pad="none"))[:, 1]
+    assert result["summary"]["segments"] == expected.shape[0]
+    assert np.allclose(result["probabilities"], np.round(expected, 3), atol=1e-3)
@@ -0,0 +1,77 @@
+import os
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.models import snoring_inference
+from backend.routers import snoring
+from backend.utils.storage import prune_directory
+
+app = FastAPI()
+app.include_router(snoring.router)
+client = TestClient(app)
+
+
+def test_detect_scores_upload_in_memory(monkeypatch, tmp_path):
+    seen = []
+    monkeypatch.setattr(snoring_inference, "is_configured", lambda: True)
+    monkeypatch.setattr(snoring_inference, "infer_wav_bytes", lambda data: seen.append(data) or {"label": "snoring"})
+    monkeypatch.setattr(snoring, "SNORING_UPLOAD_DIR", str(tmp_path))
+
+    r = client.post("/api/v1/snoring/detect", files={"file": ("night.wav", b"RIFF....WAVE", "audio/wav")})
+
+    assert r.status_code == 200, r.text
+    assert r.json()["prediction"] == {"label": "snoring"}
+    assert seen == [b"RIFF....WAVE"]
+    assert "stored_path" not in r.json()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_detect_rejects_non_wav(monkeypatch):
+    monkeypatch.setattr(snoring_inference, "is_configured", lambda: True)
+    r = client.post("/api/v1/snoring/detect", files={"file": ("night.mp3", b"ID3", "audio/mpeg")})
+    assert r.status_code == 400
+
+
+def test_prune_directory_applies_age_and_count_limits(tmp_path):
+    for i in range(5):
+        path = tmp_path / f"{i}.wav"
+        path.write_bytes(b"x")
+        os.utime(path, (1000 + i, 1000 + i))
+    (tmp_path / "fresh.wav").write_bytes(b"x")
+
+    assert prune_directory(tmp_path, max_files=4) == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["2.wav", "3.wav", "4.wav", "fresh.wav"]
+    assert prune_directory(tmp_path, max_age_seconds=3600) == 3
+    assert [p.name for p in tmp_path.iterdir()] == ["fresh.wav"]
+
+
+def test_analyze_streams_a_stored_upload(monkeypatch, tmp_path):
+    import numpy as np
+
+    from backend.models.audio_io import encode_wav
+    from backend.utils import uploads
+
+    store = uploads.UploadStore(tmp_path, max_size=1024 * 1024)
+    monkeypatch.setattr(uploads, "_STORE", store)
+    record = store.create("night.wav", "demo_user")
+    data = encode_wav(np.zeros(8000, dtype=np.float32), 8000)
+    store.append(record["file_id"], 0, data)
+    store.complete(record["file_id"])
+
+    seen = []
+
+    def fake_analyze(source, threshold=0.5, include_probabilities=False):
+        seen.append((source, include_probabilities))
+        return {"summary": {"segments": 1}}
+
+    monkeypatch.setattr(snoring_inference, "is_configured", lambda: True)
+    monkeypatch.setattr(snoring_inference, "analyze_long_wav", fake_analyze)
+
+    r = client.post(f"/api/v1/snoring/analyze?file_id={record['file_id']}")
+    assert r.status_code == 200, r.text
+    assert r.json()["filename"] == "night.wav" and r.json()["file_id"] == record["file_id"]
+    assert seen == [(store.get(record["file_id"])["path"], False)]  # a path: decoded block by block
+
+    assert client.post("/api/v1/snoring/analyze?file_id=missing").status_code == 404
+    assert client.post("/api/v1/snoring/analyze").status_code == 400
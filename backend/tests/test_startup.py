@@ -0,0 +1,75 @@
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from backend.benchmarks.bench_import import HEAVY
+from backend.main import app
+from backend.models.warmup import READY, WARMING, ModelWarmup
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_importing_the_api_is_quiet_and_skips_heavy_dependencies():
+    probe = f"import sys, backend.main; print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True,
+                            cwd=REPO_ROOT, env=env)
+    assert result.stdout == "\n"  # no config banner, no heavy modules
+
+
+def test_ready_endpoint_reports_warm_models():
+    with TestClient(app) as client:
+        response = client.get("/api/v1/ready")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["ready"] and body["state"] == READY
+    assert body["models"] == {"spo2": "mock", "ecg": "mock"}
+
+
+def test_warmup_runs_once_in_the_background(monkeypatch):
+    from backend.models import inference
+    calls = []
+    release = threading.Event()
+
+    def slow_init(**paths):
+        calls.append(paths)
+        release.wait(5)
+
+    monkeypatch.setattr(inference, "init_models", slow_init)
+    warmup = ModelWarmup()
+    assert warmup.start(spo2_path="missing.hdf5")
+    assert warmup.status()["state"] == WARMING and not warmup.ready
+    assert not warmup.start()
+    release.set()
+    assert warmup.wait(5) and warmup.state == READY
+    assert calls == [{"spo2_path": None, "ecg_path": None}]
+
+
+def test_warmup_skips_models_when_ml_is_disabled(monkeypatch):
+    from backend.models import inference
+    calls = []
+    monkeypatch.setattr(inference, "init_models", lambda **paths: calls.append(paths))
+
+    disabled = ModelWarmup()
+    assert disabled.start(spo2_path="missing.hdf5", background=False, enabled=False)
+    assert disabled.ready and disabled.state == READY and calls == []
+    assert disabled.status()["models"] == {"spo2": "mock", "ecg": "mock"}
+
+    enabled = ModelWarmup()
+    assert enabled.start(background=False, enabled=True)
+    assert enabled.ready and calls == [{"spo2_path": None, "ecg_path": None}]
+
+
+def test_startup_passes_the_ml_flag_to_warmup(monkeypatch):
+    import backend.main as main
+    for flag in (False, True):
+        seen = []
+        monkeypatch.setattr(main, "ENABLE_ML_MODELS", flag)
+        monkeypatch.setattr(main.model_warmup, "start", lambda **kwargs: seen.append(kwargs["enabled"]))
+        with TestClient(app):
+            pass
+        assert seen == [flag]
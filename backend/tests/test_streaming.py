@@ -0,0 +1,41 @@
+import numpy as np
+
+from backend.models.audio_io import resample
+from backend.models.streaming import RunningStats, StreamResampler, StreamWindower
+from backend.models.windowing import sliding_windows
+
+
+def test_running_stats_match_batch():
+    rng = np.random.default_rng(1)
+    signal = rng.normal(98.0, 2.0, 1000)
+    stats = RunningStats()
+    for chunk in np.array_split(signal, 7):
+        stats.update(chunk)
+    assert stats.count == 1000
+    assert np.isclose(stats.mean, signal.mean())
+    assert np.isclose(stats.std, signal.std())
+
+
+def test_stream_windows_match_batch_across_chunk_boundaries():
+    signal = np.arange(1000, dtype=np.float32)
+    windower = StreamWindower(64)
+    streamed = [windower.push(chunk) for chunk in np.array_split(signal, 13)]
+    streamed.append(windower.flush())
+    assert np.array_equal(np.concatenate(streamed), sliding_windows(signal, 64))
+
+
+def test_short_stream_flushes_one_padded_window():
+    windower = StreamWindower(10)
+    assert windower.push(np.ones(4)).shape == (0, 10)
+    padded = windower.flush()
+    assert padded.shape == (1, 10) and padded.sum() == 4
+
+
+def test_stream_resampler_matches_batch_resampling():
+    rng = np.random.default_rng(2)
+    signal = rng.standard_normal(50_000).astype(np.float32)
+    for orig, target in [(44100, 16000), (8000, 16000), (16000, 16000)]:
+        resampler = StreamResampler(orig, target)
+        streamed = [resampler.push(chunk) for chunk in np.array_split(signal, 17)]
+        streamed.append(resampler.flush())
+        assert np.allclose(np.concatenate(streamed), resample(signal, orig, target))
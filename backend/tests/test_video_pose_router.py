@@ -0,0 +1,77 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routers import video_pose
+from backend.utils import jobs
+from backend.utils.jobs import JobQueue, JobStore
+
+app = FastAPI()
+app.include_router(video_pose.router)
+client = TestClient(app)
+release = threading.Event()
+VIDEO = {"file": ("night.mp4", b"\x00\x00\x00\x18ftypmp42", "video/mp4")}
+
+
+def fake_pose_job(params, progress):
+    progress(10, 10)
+    if params.get("wait"):
+        release.wait(5)
+    if "broken" in params["video_path"]:
+        raise RuntimeError("cannot open video")
+    return {"frames": 10, "features_path": "night_pose.parquet"}
+
+
+def _queue(monkeypatch, tmp_path, **kwargs):
+    monkeypatch.chdir(tmp_path)
+    queue = JobQueue(JobStore(tmp_path / "jobs"), executor_factory=lambda n: ThreadPoolExecutor(n),
+                     progress_interval=0.0, **kwargs)
+    queue.register(video_pose.POSE_JOB, fake_pose_job)
+    monkeypatch.setattr(jobs, "_QUEUE", queue)
+    return queue
+
+
+def test_pose_upload_queues_a_job_and_serves_its_result(monkeypatch, tmp_path):
+    queue = _queue(monkeypatch, tmp_path)
+    r = client.post("/api/v1/upload/video-pose", files=VIDEO)
+    assert r.status_code == 202, r.text
+    body = r.json()
+    job_id = body["job_id"]
+    assert body["status_url"] == f"/api/v1/video-pose/jobs/{job_id}"
+    assert (tmp_path / body["video_path"]).read_bytes() == VIDEO["file"][1]
+    queue.shutdown(wait=True)
+
+    status = client.get(body["status_url"]).json()
+    assert status["status"] == jobs.SUCCEEDED and status["progress"] == {"done": 10, "total": 10}
+    result = client.get(body["result_url"])
+    assert result.status_code == 200
+    assert result.json() == {"job_id": job_id, "video_path": body["video_path"], "frames": 10,
+                             "features_path": "night_pose.parquet"}
+
+
+def test_pose_job_errors(monkeypatch, tmp_path):
+    queue = _queue(monkeypatch, tmp_path)
+    assert client.get("/api/v1/video-pose/jobs/missing").status_code == 404
+    assert client.get("/api/v1/video-pose/jobs/missing/result").status_code == 404
+
+    r = client.post("/api/v1/upload/video-pose", files={"file": ("broken.mp4", b"x", "video/mp4")})
+    queue.shutdown(wait=True)
+    failed = client.get(r.json()["result_url"])
+    assert failed.status_code == 500 and "cannot open video" in failed.json()["detail"]
+
+    # Still queued: the result is not ready yet
+    queue.store.save({"id": "waiting", "kind": video_pose.POSE_JOB, "status": jobs.QUEUED, "params": {}})
+    assert client.get("/api/v1/video-pose/jobs/waiting/result").status_code == 409
+
+
+def test_full_queue_rejects_uploads(monkeypatch, tmp_path):
+    release.clear()
+    queue = _queue(monkeypatch, tmp_path, max_workers=1, max_pending=1)
+    queue.submit(video_pose.POSE_JOB, {"video_path": "held.mp4", "wait": True})
+    r = client.post("/api/v1/upload/video-pose", files=VIDEO)
+    assert r.status_code == 503 and r.headers["Retry-After"] == "30"
+    assert not (tmp_path / "uploads" / "videos").exists() or not any((tmp_path / "uploads" / "videos").iterdir())
+    release.set()
+    queue.shutdown(wait=True)
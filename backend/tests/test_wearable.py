@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from backend.utils.wearable import summarize_wearable_samples, wearable_columns
+
+
+def _reference_summary(samples):
+    """The original list-comprehension implementation of summarize_wearable_samples."""
+    hrs = [s.get("hr") for s in samples if s.get("hr") is not None]
+    spos = [s.get("spo2") for s in samples if s.get("spo2") is not None]
+    hrvs = [s.get("hrv") for s in samples if s.get("hrv") is not None]
+    summary = {
+        "sample_count": len(samples),
+        "min_spo2": float(min(spos)) if spos else None,
+        "avg_spo2": float(np.mean(spos)) if spos else None,
+        "min_hr": float(min(hrs)) if hrs else None,
+        "avg_hr": float(np.mean(hrs)) if hrs else None,
+        "hr_std": float(np.std(hrs)) if len(hrs) > 1 else None,
+        "avg_hrv": float(np.mean(hrvs)) if hrvs else None,
+        "spo2_drops": int(sum(1 for x in spos if x < 90)) if spos else 0,
+    }
+    risk = 0.0
+    if summary["min_spo2"] is not None:
+        risk += 0.6 if summary["min_spo2"] < 85 else 0.3 if summary["min_spo2"] < 90 else 0.0
+    if summary["spo2_drops"] > 3:
+        risk += 0.3
+    if summary["avg_hr"] > 100:
+        risk += 0.1
+    summary["risk_score"] = round(min(1.0, risk), 2)
+    summary["risk_level"] = "high" if summary["risk_score"] >= 0.6 else "moderate" if summary["risk_score"] >= 0.3 else "low"
+    return summary
+
+
+def _night(n=30_000, seed=0):
+    rng = np.random.default_rng(seed)
+    samples = []
+    for i in range(n):
+        sample = {"ts": 1698000000 + i, "hr": int(rng.integers(50, 120)), "spo2": round(float(rng.normal(95, 3)), 1)}
+        if i % 3:
+            sample["hrv"] = float(rng.normal(45, 8))
+        if i % 101 == 0:
+            sample["spo2"] = None
+        samples.append(sample)
+    return samples
+
+
+def test_summary_identical_to_original_for_rows_and_columns():
+    samples = _night()
+    expected = _reference_summary(samples)
+    assert summarize_wearable_samples(samples) == expected
+
+    columnar = {f: [s.get(f) for s in samples] for f in ("ts", "hr", "spo2", "hrv")}
+    assert summarize_wearable_samples(columnar) == expected
+
+
+def test_missing_heart_rate_and_ragged_columns():
+    summary = summarize_wearable_samples([{"ts": 1, "spo2": 84}, {"ts": 2, "spo2": 88}])
+    assert summary["avg_hr"] is None and summary["risk_level"] == "high"
+    assert summarize_wearable_samples({"hr": []}) == {"sample_count": 0}
+    assert np.isnan(wearable_columns({"hr": [60, 61]})["spo2"]).all()
+    with pytest.raises(ValueError):
+        wearable_columns({"hr": [60, 61], "spo2": [97]})
@@ -0,0 +1,69 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.utils import wearable_store
+from backend.utils.wearable_store import RecordNotFound, WearableStore, sqlite_path
+
+client = TestClient(app)
+AUTH = {"Authorization": "Bearer test"}
+
+
+def test_same_second_uploads_are_kept_and_raw_is_compressed(tmp_path):
+    store = WearableStore(tmp_path / "somnia.db")
+    samples = [{"ts": 1698000000 + i, "hr": 60 + i % 20, "spo2": 96} for i in range(2000)]
+    first = store.save("alice", {"avg_hr": 70.0}, {"device": "watch", "samples": samples})
+    second = store.save("alice", {"avg_hr": 71.0}, {"device": "watch", "samples": samples[:5]})
+    store.save("bob", {"avg_hr": 55.0}, None)
+
+    assert first["id"] != second["id"]
+    assert [r["summary"]["avg_hr"] for r in store.recent(limit=2)] == [55.0, 71.0]
+    assert [r["id"] for r in store.recent(limit=10, user_id="alice")] == [second["id"], first["id"]]
+    assert store.raw(first["id"])["samples"] == samples
+    assert store.raw(store.recent(1, user_id="bob")[0]["id"]) is None
+    with pytest.raises(RecordNotFound):
+        store.raw("missing")
+
+    blob_size = store._conn.execute("SELECT length(payload) FROM wearable_raw ORDER BY seq LIMIT 1").fetchone()[0]
+    assert blob_size < len(str(samples)) / 5
+
+
+def test_recent_queries_use_indexes(tmp_path):
+    store = WearableStore(tmp_path / "somnia.db")
+    plans = [
+        " ".join(row[-1] for row in store._conn.execute(f"EXPLAIN QUERY PLAN {query}", args))
+        for query, args in [
+            ("SELECT id FROM wearable_records ORDER BY seq DESC LIMIT 5", ()),
+            ("SELECT id FROM wearable_records WHERE user_id = ? ORDER BY created_at DESC, seq DESC LIMIT 5", ("a",)),
+        ]
+    ]
+    assert not any("TEMP B-TREE" in plan for plan in plans)
+    assert "idx_wearable_user_time" in plans[1]
+
+
+def test_wearable_endpoints_use_store(monkeypatch, tmp_path):
+    monkeypatch.setattr(wearable_store, "_STORE", WearableStore(tmp_path / "somnia.db"))
+    payload = {"user_id": "carol", "samples": {"ts": [1, 2, 3], "hr": [70, 72, None], "spo2": [97, 88, 86]}}
+    r = client.post("/api/v1/upload/wearable", json=payload, headers=AUTH)
+    assert r.status_code == 200
+    record_id = r.json()["saved"]["id"]
+
+    logs = client.get("/api/v1/wearable/logs", params={"user_id": "carol"}).json()
+    assert logs["count"] == 1 and logs["records"][0]["summary"]["min_spo2"] == 86.0
+    assert wearable_store.get_wearable_store().raw(record_id) == payload
+    # Raw health samples are not served over the API
+    assert client.get(f"/api/v1/wearable/records/{record_id}/raw").status_code == 404
+    assert sqlite_path("sqlite:///./somnia.db") == "./somnia.db"
+
+
+def test_database_url_is_checked_at_startup(monkeypatch, tmp_path):
+    from backend import config
+    assert sqlite_path("sqlite:///./data/somnia.db", tmp_path) == str(tmp_path / "data" / "somnia.db")
+    assert sqlite_path("sqlite:////var/somnia.db", tmp_path) == "/var/somnia.db"
+    monkeypatch.setattr(config, "DATABASE_BASE_DIR", str(tmp_path))
+    assert wearable_store.configured_path() == str(tmp_path / "somnia.db")
+
+    monkeypatch.setattr(config, "DATABASE_URL", "postgresql://db/somnia")
+    with pytest.raises(RuntimeError, match="DATABASE_URL"):
+        with TestClient(app):
+            pass
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from backend.models.windowing import num_windows, sliding_windows, zscore
+
+
+def test_matches_original_loop():
+    signal = np.arange(25, dtype=np.float64)
+    windows = sliding_windows(signal, 10, hop=5)
+    expected = np.array([signal[s:s + 10] for s in range(0, 16, 5)], dtype=np.float32)
+    assert windows.dtype == np.float32
+    assert np.array_equal(windows, expected)
+
+
+def test_short_signal_is_zero_padded():
+    windows = sliding_windows(np.ones(4), 10)
+    assert windows.shape == (1, 10)
+    assert windows[0, :4].sum() == 4 and windows[0, 4:].sum() == 0
+    assert sliding_windows(np.ones(4), 10, pad="none").shape == (0, 10)
+
+
+def test_tail_padding_and_out_buffer():
+    signal = np.arange(12, dtype=np.float32)
+    n = num_windows(12, 5, 5, pad="tail")
+    out = np.full((n, 5), -1.0, dtype=np.float32)
+    result = sliding_windows(signal, 5, hop=5, pad="tail", out=out)
+    assert result is out
+    assert np.array_equal(out[2], [10, 11, 0, 0, 0])
+    with pytest.raises(ValueError):
+        sliding_windows(signal, 5, hop=5, out=np.empty((1, 5), dtype=np.float32))
+
+
+def test_zscore_constant_signal():
+    assert np.array_equal(zscore(np.full(5, 3.0)), np.zeros(5, dtype=np.float32))
@@ -0,0 +1,163 @@
+"""
+Micro-batching
+Coalesces concurrent single-item inference requests into one batched model
+call: items wait up to ``max_wait_ms`` for company (or until ``max_batch_size``
+have arrived), the batch runs once on the inference pool (utils/executors.py),
+and every caller gets its own result back. If a batch raises, its items are
+retried one at a time so only the callers whose items fail see the error.
+Team: Chimpanzini Bananini
+
+Futures are ``concurrent.futures.Future`` objects set from the worker thread
+and awaited through ``asyncio.wrap_future``, so a batcher is safe to share
+between event loops (e.g. several test clients). A caller cancelled before its
+batch is dispatched (client disconnect, ``wait_for`` timeout) is dropped from
+the batch; once dispatched, futures can no longer be cancelled.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List
+
+from backend.utils.executors import INFERENCE, ExecutorBusy, get_executor
+
+
+class MicroBatcher:
+    """
+    Dynamic batcher around ``batch_fn(items) -> results`` (same length and order).
+
+    max_batch_size: dispatch as soon as this many items are pending
+    max_wait_ms: dispatch whatever is pending this long after the first item
+    """
+
+    def __init__(self, name: str, batch_fn: Callable[[List[Any]], List[Any]], max_batch_size: int = 32,
+                 max_wait_ms: float = 5.0, executor_name: str = INFERENCE):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1e3
+        self.executor_name = executor_name
+        self._lock = threading.Lock()
+        self._pending: List[tuple] = []
+        self._generation = 0
+        self._batches = 0
+        self._items = 0
+        self._wait_total = 0.0
+        self._histogram: Dict[int, int] = {}
+        self._isolated = 0
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and await its result."""
+        future: Future = Future()
+        batch = None
+        with self._lock:
+            self._pending.append((item, future, time.perf_counter()))
+            if len(self._pending) >= self.max_batch_size:
+                batch = self._take()
+            elif len(self._pending) == 1:
+                generation = self._generation
+                asyncio.get_running_loop().call_later(self.max_wait, self._flush_due, generation)
+        if batch:
+            self._dispatch(batch)
+        return await asyncio.wrap_future(future)
+
+    def _take(self) -> List[tuple]:
+        # Caller holds the lock; bumping the generation voids the pending timer
+        batch, self._pending = self._pending, []
+        self._generation += 1
+        return batch
+
+    def _flush_due(self, generation: int) -> None:
+        with self._lock:
+            if generation != self._generation or not self._pending:
+                return
+            batch = self._take()
+        self._dispatch(batch)
+
+    def _dispatch(self, batch: List[tuple]) -> None:
+        # Claim each future; cancelled callers are dropped so their futures are never set
+        batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            self._batches += 1
+            self._items += len(batch)
+            self._wait_total += sum(now - queued_at for _, _, queued_at in batch)
+            self._histogram[len(batch)] = self._histogram.get(len(batch), 0) + 1
+        try:
+            get_executor(self.executor_name).submit(self._run, batch)
+        except ExecutorBusy as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+
+    def _call(self, items: List[Any]) -> List[Any]:
+        results = self.batch_fn(items)
+        if len(results) != len(items):
+            raise RuntimeError(f"{self.name} batch returned {len(results)} results for {len(items)} items")
+        return results
+
+    def _run(self, batch: List[tuple]) -> None:
+        try:
+            results = self._call([item for item, _, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            # One bad item must not fail its neighbours: retry each item alone
+            with self._lock:
+                self._isolated += 1
+            for item, future, _ in batch:
+                try:
+                    future.set_result(self._call([item])[0])
+                except Exception as item_error:
+                    future.set_exception(item_error)
+            return
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": round(self.max_wait * 1e3, 3),
+                "pending": len(self._pending),
+                "batches": self._batches,
+                "items": self._items,
+                "mean_batch_size": round(self._items / self._batches, 3) if self._batches else 0.0,
+                "mean_wait_ms": round(self._wait_total / self._items * 1e3, 3) if self._items else 0.0,
+                "batch_size_histogram": {str(size): n for size, n in sorted(self._histogram.items())},
+                "isolated_batches": self._isolated,
+            }
+
+
+_BATCHERS: Dict[str, MicroBatcher] = {}
+_BATCHERS_LOCK = threading.Lock()
+
+
+def _batch_fn(name: str) -> Callable[[List[Any]], List[Any]]:
+    from backend.models import inference
+    functions = {"spo2": inference.predict_spo2_batch, "ecg": inference.predict_ecg_batch}
+    if name not in functions:
+        raise KeyError(f"Unknown batcher: {name}")
+    return functions[name]
+
+
+def get_batcher(name: str) -> MicroBatcher:
+    """Process-wide ``spo2`` or ``ecg`` batcher (created on first use)."""
+    batcher = _BATCHERS.get(name)
+    if batcher is None:
+        with _BATCHERS_LOCK:
+            batcher = _BATCHERS.get(name)
+            if batcher is None:
+                from backend.config import INFER_BATCH_MAX_SIZE, INFER_BATCH_MAX_WAIT_MS
+                batcher = _BATCHERS[name] = MicroBatcher(
+                    name, _batch_fn(name), INFER_BATCH_MAX_SIZE, INFER_BATCH_MAX_WAIT_MS
+                )
+    return batcher
+
+
+def batcher_stats() -> Dict[str, Dict]:
+    """Batch counts, mean batch size, queue wait and batch-size histogram per model."""
+    return {name: batcher.stats() for name, batcher in list(_BATCHERS.items())}
@@ -0,0 +1,153 @@
+"""
+Bounded Executors
+Keeps blocking work off the event loop: model inference and CPU-heavy
+signal processing run on the ``inference`` pool, file and database I/O on the
+``io`` pool. Each pool accepts at most ``max_workers + max_queue`` tasks;
+beyond that ``submit`` raises ExecutorBusy, which the API turns into a 503
+with Retry-After instead of letting requests pile up behind a slow one.
+Team: Chimpanzini Bananini
+
+Both pools are threads: Keras ``predict``, TF ``Session.run``, NumPy and file
+I/O release the GIL, and the models loaded in this process are shared rather
+than copied into worker processes (long pose extraction already runs in
+processes through utils/jobs.py).
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict
+
+INFERENCE = "inference"
+IO = "io"
+
+
+class ExecutorBusy(RuntimeError):
+    def __init__(self, name: str, limit: int):
+        super().__init__(f"The {name} pool is at capacity ({limit} tasks), retry later")
+        self.name = name
+        self.limit = limit
+
+
+class BoundedExecutor:
+    """ThreadPoolExecutor with a hard cap on queued work and wait/run time statistics."""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"somnia-{name}")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+        self._run_max = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _call(self, submitted_at: float, fn: Callable, args, kwargs):
+        started = time.perf_counter()
+        waited = started - submitted_at
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._run_total += elapsed
+                self._run_max = max(self._run_max, elapsed)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Schedule ``fn``; raises ExecutorBusy if the pool and its queue are full."""
+        with self._lock:
+            if self._queued + self._running >= self.capacity:
+                self._rejected += 1
+                raise ExecutorBusy(self.name, self.capacity)
+            self._queued += 1
+            self._submitted += 1
+        try:
+            return self._pool.submit(self._call, time.perf_counter(), fn, args, kwargs)
+        except RuntimeError:
+            with self._lock:
+                self._queued -= 1
+            raise
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """Await ``fn(*args, **kwargs)`` on this pool from async code."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._queued,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "mean_wait_ms": round(self._wait_total / started * 1e3, 3) if started else 0.0,
+                "max_wait_ms": round(self._wait_max * 1e3, 3),
+                "mean_run_ms": round(self._run_total / self._completed * 1e3, 3) if self._completed else 0.0,
+                "max_run_ms": round(self._run_max * 1e3, 3),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
+
+
+_EXECUTORS: Dict[str, BoundedExecutor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def get_executor(name: str) -> BoundedExecutor:
+    """Process-wide ``inference`` or ``io`` pool (created on first use)."""
+    executor = _EXECUTORS.get(name)
+    if executor is None:
+        with _EXECUTORS_LOCK:
+            executor = _EXECUTORS.get(name)
+            if executor is None:
+                from backend.config import INFERENCE_QUEUE, INFERENCE_WORKERS, IO_QUEUE, IO_WORKERS
+                sizes = {INFERENCE: (INFERENCE_WORKERS, INFERENCE_QUEUE), IO: (IO_WORKERS, IO_QUEUE)}
+                if name not in sizes:
+                    raise KeyError(f"Unknown executor: {name}")
+                executor = _EXECUTORS[name] = BoundedExecutor(name, *sizes[name])
+    return executor
+
+
+async def run_inference(fn: Callable, *args, **kwargs):
+    """Run model inference or CPU-heavy processing on the inference pool."""
+    return await get_executor(INFERENCE).run(fn, *args, **kwargs)
+
+
+async def run_io(fn: Callable, *args, **kwargs):
+    """Run blocking file or database I/O on the I/O pool."""
+    return await get_executor(IO).run(fn, *args, **kwargs)
+
+
+def executor_stats() -> Dict[str, Dict]:
+    """Queue depth, rejections and wait/run times per pool."""
+    return {name: get_executor(name).stats() for name in (INFERENCE, IO)}
+
+
+def shutdown_executors(wait: bool = False) -> None:
+    with _EXECUTORS_LOCK:
+        executors = list(_EXECUTORS.values())
+        _EXECUTORS.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
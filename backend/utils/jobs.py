@@ -0,0 +1,274 @@
+"""
+Background Job Queue
+Runs long extractions (e.g. video pose) in a bounded process pool, tracked by a
+local on-disk job store so submitters get a job id immediately and jobs survive
+a server restart.
+Team: Chimpanzini Bananini
+
+Each job is ``<job_id>.json`` (written atomically) plus ``<job_id>.progress``,
+which the worker rewrites as it goes. Job targets are ``"module:function"``
+strings resolved inside the worker, called as ``target(params, progress)``
+where ``progress(done, total)`` reports frames (or any unit) processed.
+"""
+
+import importlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+JobTarget = Union[str, Callable[[Dict, Callable[[int, int], None]], Dict]]
+
+
+class QueueFull(Exception):
+    """Raised when the number of queued + running jobs is at the cap."""
+
+
+class JobNotFound(Exception):
+    pass
+
+
+def _write_json(path: Path, data: Dict) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+class JobStore:
+    """Job records on local disk."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def _path(self, job_id: str, suffix: str = ".json") -> Path:
+        if not job_id or Path(job_id).name != job_id or job_id.startswith("."):
+            raise JobNotFound(job_id)
+        return self.directory / f"{job_id}{suffix}"
+
+    def save(self, record: Dict) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        record["updated_at"] = time.time()
+        _write_json(self._path(record["id"]), record)
+
+    def load(self, job_id: str) -> Dict:
+        try:
+            with open(self._path(job_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise JobNotFound(job_id)
+
+    def update(self, job_id: str, **fields) -> Dict:
+        record = self.load(job_id)
+        record.update(fields)
+        self.save(record)
+        return record
+
+    def write_progress(self, job_id: str, done: int, total: int) -> None:
+        _write_json(self._path(job_id, ".progress"), {"done": int(done), "total": int(total)})
+
+    def progress(self, job_id: str) -> Optional[Dict]:
+        try:
+            with open(self._path(job_id, ".progress"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def all(self) -> List[Dict]:
+        if not self.directory.exists():
+            return []
+        records = []
+        for path in self.directory.glob("*.json"):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    records.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return sorted(records, key=lambda r: r.get("created_at", 0))
+
+
+def _resolve_target(target: JobTarget):
+    if callable(target):
+        return target
+    module, _, name = target.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def _execute(store_dir: str, job_id: str, target: JobTarget, params: Dict, progress_interval: float) -> None:
+    """Worker entry point: run one job and record its outcome in the store."""
+    store = JobStore(store_dir)
+    store.update(job_id, status=RUNNING, started_at=time.time(), error=None)
+    last = [0.0]
+
+    def progress(done: int, total: int) -> None:
+        now = time.monotonic()
+        # Throttled: progress is a file rewrite, frames arrive at video rate
+        if now - last[0] >= progress_interval or (total and done >= total):
+            last[0] = now
+            store.write_progress(job_id, done, total)
+
+    try:
+        result = _resolve_target(target)(params, progress)
+    except Exception as e:
+        store.update(job_id, status=FAILED, finished_at=time.time(), error=f"{type(e).__name__}: {e}")
+        return
+    store.update(job_id, status=SUCCEEDED, finished_at=time.time(), result=result)
+
+
+class JobQueue:
+    """
+    Bounded background job queue.
+
+    Args:
+        store: Where job records live
+        max_workers: Worker processes
+        max_pending: Cap on queued + running jobs (submit raises QueueFull)
+        executor_factory: Builds the executor (default: ProcessPoolExecutor with
+            spawned workers; forking the threaded API process, possibly with
+            TensorFlow loaded, can deadlock and copies its models into each worker)
+        progress_interval: Minimum seconds between progress writes
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        max_workers: int = 2,
+        max_pending: int = 8,
+        executor_factory: Optional[Callable[[int], Executor]] = None,
+        progress_interval: float = 0.5,
+    ):
+        self.store = store
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.progress_interval = progress_interval
+        self._executor_factory = executor_factory or (
+            lambda n: ProcessPoolExecutor(max_workers=n, mp_context=multiprocessing.get_context("spawn"))
+        )
+        self._executor: Optional[Executor] = None
+        self._targets: Dict[str, JobTarget] = {}
+        self._active: set = set()
+        self._lock = threading.Lock()
+
+    def register(self, kind: str, target: JobTarget) -> None:
+        """Map a job kind to its ``"module:function"`` (or picklable callable) target."""
+        self._targets[kind] = target
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._executor_factory(self.max_workers)
+        return self._executor
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._active)
+
+    def submit(self, kind: str, params: Dict) -> Dict:
+        """Queue a job and return its record immediately."""
+        if kind not in self._targets:
+            raise ValueError(f"Unknown job kind: {kind}")
+        with self._lock:
+            if len(self._active) >= self.max_pending:
+                raise QueueFull(f"{len(self._active)} jobs pending (max {self.max_pending})")
+            record = {
+                "id": uuid.uuid4().hex,
+                "kind": kind,
+                "status": QUEUED,
+                "params": params,
+                "created_at": time.time(),
+                "result": None,
+                "error": None,
+            }
+            self.store.save(record)
+            self._active.add(record["id"])
+        self._dispatch(record)
+        return record
+
+    def _dispatch(self, record: Dict) -> None:
+        job_id = record["id"]
+        future = self._get_executor().submit(
+            _execute, str(self.store.directory), job_id, self._targets[record["kind"]],
+            record["params"], self.progress_interval,
+        )
+        future.add_done_callback(lambda f, job_id=job_id: self._on_done(job_id, f))
+
+    def _on_done(self, job_id: str, future) -> None:
+        with self._lock:
+            self._active.discard(job_id)
+        if future.cancelled():
+            # Shut down before it ran: still queued on disk, resumed by recover()
+            return
+        error = future.exception()
+        if error is not None:
+            # The worker died (e.g. BrokenProcessPool) before recording an outcome
+            try:
+                self.store.update(job_id, status=FAILED, finished_at=time.time(),
+                                  error=f"{type(error).__name__}: {error}")
+            except JobNotFound:
+                pass
+
+    def recover(self) -> List[str]:
+        """Re-queue jobs left queued or running by a previous process (run at startup)."""
+        resumed = []
+        for record in self.store.all():
+            if record.get("status") not in ACTIVE_STATES or record.get("kind") not in self._targets:
+                continue
+            with self._lock:
+                if record["id"] in self._active:
+                    continue
+                self._active.add(record["id"])
+            record = self.store.update(record["id"], status=QUEUED, resumed_at=time.time())
+            self._dispatch(record)
+            resumed.append(record["id"])
+        return resumed
+
+    def status(self, job_id: str) -> Dict:
+        """Public view of a job: state, progress and timing (without the result)."""
+        record = self.store.load(job_id)
+        progress = self.store.progress(job_id) or {"done": 0, "total": 0}
+        if record["status"] == SUCCEEDED and progress["total"]:
+            progress["done"] = progress["total"]
+        return {
+            "job_id": job_id,
+            "kind": record["kind"],
+            "status": record["status"],
+            "progress": progress,
+            "created_at": record.get("created_at"),
+            "started_at": record.get("started_at"),
+            "finished_at": record.get("finished_at"),
+            "error": record.get("error"),
+        }
+
+    def result(self, job_id: str) -> Dict:
+        return self.store.load(job_id)
+
+    def shutdown(self, wait: bool = False) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+_QUEUE: Optional[JobQueue] = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Process-wide job queue configured from backend.config (created on first use)."""
+    global _QUEUE
+    if _QUEUE is None:
+        with _QUEUE_LOCK:
+            if _QUEUE is None:
+                from backend.config import JOB_STORE_DIR, JOB_WORKERS, JOB_MAX_PENDING
+                _QUEUE = JobQueue(JobStore(JOB_STORE_DIR), max_workers=JOB_WORKERS, max_pending=JOB_MAX_PENDING)
+    return _QUEUE
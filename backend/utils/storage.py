@@ -0,0 +1,59 @@
+"""
+Upload Storage Helpers
+Opt-in persistence of uploaded files with a simple retention policy.
+Team: Chimpanzini Bananini
+"""
+
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+
+def safe_filename(filename: Optional[str], default: str = "upload") -> str:
+    """Strip directory components from a client-supplied filename."""
+    name = Path(filename or "").name
+    return name or default
+
+
+def persist_upload(data: bytes, directory, filename: Optional[str]) -> Path:
+    """Write ``data`` to ``directory/<uuid>_<filename>`` and return the path."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{uuid.uuid4().hex}_{safe_filename(filename)}"
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def prune_directory(directory, max_age_seconds: Optional[float] = None, max_files: Optional[int] = None) -> int:
+    """
+    Delete files older than ``max_age_seconds`` and then the oldest files beyond
+    ``max_files``. Returns the number of files removed.
+    """
+    directory = Path(directory)
+    if not directory.exists():
+        return 0
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.is_file():
+            entries.append((entry.stat().st_mtime, entry.path))
+    entries.sort()
+
+    now = time.time()
+    doomed = []
+    if max_age_seconds is not None:
+        doomed = [p for mtime, p in entries if now - mtime > max_age_seconds]
+        entries = [(m, p) for m, p in entries if now - m <= max_age_seconds]
+    if max_files is not None and len(entries) > max_files:
+        doomed.extend(p for _, p in entries[:len(entries) - max_files])
+
+    removed = 0
+    for path in doomed:
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
@@ -0,0 +1,139 @@
+"""
+Structured Logging & Stage Metrics
+Team: Chimpanzini Bananini
+
+All SOMNIA loggers live under the ``somnia`` namespace. Events carry their data
+as structured fields (rendered as one JSON object per line) instead of
+formatted text, and every call is gated on the logger level first so a
+disabled level costs a single integer comparison.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional
+
+ROOT_LOGGER = "somnia"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "WARNING").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()  # json | text
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+_configured = False
+
+
+class StructuredFormatter(logging.Formatter):
+    """Render a record and its ``fields`` extra as a single JSON line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        payload.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable ``event key=value ...`` lines for local development."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = getattr(record, "fields", None) or {}
+        parts = [f"{record.levelname:<7} {record.name}: {record.getMessage()}"]
+        parts.extend(f"{k}={v}" for k, v in fields.items())
+        line = " ".join(parts)
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None) -> logging.Logger:
+    """Attach a single stderr handler to the ``somnia`` logger (idempotent)."""
+    global _configured
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel((level or LOG_LEVEL).upper())
+    if not _configured:
+        handler = logging.StreamHandler()
+        handler.setFormatter(TextFormatter() if (fmt or LOG_FORMAT) == "text" else StructuredFormatter())
+        root.addHandler(handler)
+        root.propagate = False
+        _configured = True
+    return root
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the ``somnia`` namespace, e.g. get_logger("api")."""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def log_event(logger: logging.Logger, level: int, event: str, **fields) -> None:
+    """Emit ``event`` with structured ``fields`` if ``level`` is enabled."""
+    if logger.isEnabledFor(level):
+        logger.log(level, event, extra={"fields": fields})
+
+
+class StageMetrics:
+    """Thread-safe count / total / max duration per named stage."""
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stages: Dict[str, list] = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                self._stages[stage] = [1, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                if seconds > entry[2]:
+                    entry[2] = seconds
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                stage: {
+                    "count": count,
+                    "total_ms": round(total * 1e3, 3),
+                    "mean_ms": round(total / count * 1e3, 3),
+                    "max_ms": round(peak * 1e3, 3),
+                }
+                for stage, (count, total, peak) in self._stages.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+
+
+metrics = StageMetrics()
+
+
+@contextmanager
+def stage_timer(stage: str, logger: Optional[logging.Logger] = None, **fields) -> Iterator[Dict]:
+    """
+    Time a block, record it in ``metrics`` and log it at DEBUG.
+
+    Yields a dict the block may add fields to; ``duration_ms`` is filled in on exit.
+    """
+    extra: Dict = dict(fields)
+    start = time.perf_counter()
+    try:
+        yield extra
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.observe(stage, elapsed)
+        if logger is not None and logger.isEnabledFor(logging.DEBUG):
+            extra["duration_ms"] = round(elapsed * 1e3, 3)
+            logger.debug("stage_complete", extra={"fields": {"stage": stage, **extra}})
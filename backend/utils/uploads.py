@@ -0,0 +1,280 @@
+"""
+Resumable Upload Store
+Chunked, resumable uploads written straight to disk, with a persisted
+file_id -> storage mapping that later requests (e.g. /api/v1/analyze) resolve.
+Team: Chimpanzini Bananini
+
+Each upload is a ``<file_id>.part`` file that chunks are appended to at an
+explicit byte offset, plus a ``<file_id>.json`` record holding its state.
+Records are rewritten atomically, so a restarted server picks up where the
+client left off: the client asks for ``received`` and resends from there.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from backend.utils.storage import safe_filename
+
+STATUS_UPLOADING = "uploading"
+STATUS_COMPLETE = "complete"
+
+
+class UploadError(Exception):
+    """Base class for upload store errors."""
+
+
+class UploadNotFound(UploadError):
+    pass
+
+
+class OffsetMismatch(UploadError):
+    """A chunk was sent for the wrong offset; ``expected`` is where to resume."""
+
+    def __init__(self, expected: int):
+        super().__init__(f"Chunk offset does not match received bytes ({expected})")
+        self.expected = expected
+
+
+class UploadTooLarge(UploadError):
+    pass
+
+
+class UploadStateError(UploadError):
+    """Operation not valid in the upload's current state (e.g. appending after completion)."""
+
+
+class UploadStore:
+    """
+    On-disk resumable uploads.
+
+    Args:
+        directory: Where .part/.json files and completed uploads live
+        max_size: Maximum total upload size in bytes
+        analyzer_factory: Optional ``filename -> analyzer`` callable; analyzers
+            receive every chunk in order via ``feed(bytes)`` (None to skip).
+            Feeding is CPU work, so it is a separate step (``feed``) that
+            callers run off the I/O pool after ``append``.
+    """
+
+    def __init__(
+        self,
+        directory,
+        max_size: int,
+        analyzer_factory: Optional[Callable[[str], Optional[object]]] = None,
+    ):
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.analyzer_factory = analyzer_factory
+        self._lock = threading.Lock()
+        self._file_locks: Dict[str, threading.Lock] = {}
+        self._analyzers: Dict[str, object] = {}
+        self._analyzer_locks: Dict[str, threading.Lock] = {}
+
+    # -- records ---------------------------------------------------------
+
+    def _record_path(self, file_id: str) -> Path:
+        # file_ids are generated here; reject anything that could escape the directory
+        if not file_id or Path(file_id).name != file_id or file_id.startswith("."):
+            raise UploadNotFound(file_id)
+        return self.directory / f"{file_id}.json"
+
+    def _write_record(self, record: Dict) -> None:
+        path = self._record_path(record["file_id"])
+        tmp = path.with_suffix(".json.tmp")
+        record["updated_at"] = time.time()
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(record, f)
+        os.replace(tmp, path)
+
+    def get(self, file_id: str) -> Dict:
+        """Upload record for ``file_id``; raises UploadNotFound."""
+        try:
+            with open(self._record_path(file_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise UploadNotFound(file_id)
+
+    def _file_lock(self, file_id: str) -> threading.Lock:
+        with self._lock:
+            return self._file_locks.setdefault(file_id, threading.Lock())
+
+    # -- upload lifecycle ------------------------------------------------
+
+    def create(self, filename: str, user_id: str, total_size: Optional[int] = None, kind: str = "audio") -> Dict:
+        """Start an upload and return its record."""
+        if total_size is not None and total_size > self.max_size:
+            raise UploadTooLarge(f"Upload exceeds {self.max_size} bytes")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        file_id = f"{kind}_{uuid.uuid4().hex}"
+        name = safe_filename(filename)
+        record = {
+            "file_id": file_id,
+            "filename": name,
+            "user_id": user_id,
+            "status": STATUS_UPLOADING,
+            "received": 0,
+            "total_size": total_size,
+            "part_path": str(self.directory / f"{file_id}.part"),
+            "path": None,
+            "created_at": time.time(),
+            "analysis": None,
+        }
+        Path(record["part_path"]).touch()
+        self._write_record(record)
+        if self.analyzer_factory is not None:
+            analyzer = self.analyzer_factory(name)
+            if analyzer is not None:
+                self._analyzer_locks[file_id] = threading.Lock()
+                self._analyzers[file_id] = analyzer
+        return record
+
+    def append(self, file_id: str, offset: int, data: bytes) -> Dict:
+        """
+        Append ``data`` at ``offset``.
+
+        Resending a chunk that was already stored (offset + len <= received) is
+        a no-op, so clients can retry a chunk whose response they never saw.
+        """
+        with self._file_lock(file_id):
+            record = self.get(file_id)
+            if record["status"] != STATUS_UPLOADING:
+                raise UploadStateError(f"Upload {file_id} is {record['status']}")
+            received = record["received"]
+            if offset + len(data) <= received:
+                return record
+            if offset != received:
+                raise OffsetMismatch(received)
+            if received + len(data) > (record["total_size"] or self.max_size):
+                raise UploadTooLarge(f"Upload exceeds {record['total_size'] or self.max_size} bytes")
+
+            with open(record["part_path"], "r+b") as f:
+                # Truncate bytes a crashed request may have written past ``received``
+                f.seek(offset)
+                f.truncate()
+                f.write(data)
+            record["received"] = received + len(data)
+            self._write_record(record)
+            return record
+
+    def feed(self, file_id: str, offset: int, data: bytes) -> None:
+        """
+        Pass a chunk stored by ``append`` to the upload's incremental analyzer.
+
+        Chunks the analyzer has already seen (a retried append) are skipped.
+        Runs under a per-upload analyzer lock rather than the upload lock, so
+        appends are not held up by the analysis.
+        """
+        with self._lock:
+            lock = self._analyzer_locks.get(file_id)
+        if lock is None:
+            return
+        with lock:
+            analyzer = self._analyzers.get(file_id)
+            if analyzer is None or offset + len(data) <= analyzer.bytes_fed:
+                return
+            if analyzer.bytes_fed != offset:
+                # Analyzer state does not line up (e.g. server restarted mid-upload);
+                # the completed file is analyzed in one pass instead.
+                self._analyzers.pop(file_id, None)
+                return
+            try:
+                analyzer.feed(data)
+            except ValueError:
+                # Not a decodable PCM WAV; keep the upload, skip incremental analysis
+                self._analyzers.pop(file_id, None)
+
+    def _pop_analyzer(self, file_id: str):
+        with self._lock:
+            lock = self._analyzer_locks.pop(file_id, None)
+        if lock is None:
+            return None
+        with lock:  # wait for a chunk still being analyzed
+            return self._analyzers.pop(file_id, None)
+
+    def complete(self, file_id: str) -> Dict:
+        """
+        Finalize an upload: move the .part file into place and return the record.
+
+        The incremental analyzer, if one kept up with every chunk, is returned
+        under the transient ``"analyzer"`` key for the caller to finish.
+        """
+        with self._file_lock(file_id):
+            record = self.get(file_id)
+            if record["status"] == STATUS_COMPLETE:
+                return record
+            if record["total_size"] is not None and record["received"] != record["total_size"]:
+                raise UploadStateError(
+                    f"Upload {file_id} has {record['received']} of {record['total_size']} bytes"
+                )
+            if record["received"] == 0:
+                raise UploadStateError(f"Upload {file_id} is empty")
+            final = self.directory / f"{file_id}_{record['filename']}"
+            os.replace(record["part_path"], final)
+            record.update(status=STATUS_COMPLETE, path=str(final), part_path=None)
+            self._write_record(record)
+            analyzer = self._pop_analyzer(file_id)
+        return dict(record, analyzer=analyzer)
+
+    def discard(self, file_id: str) -> None:
+        """Abort an upload (or delete a completed one) and remove its files."""
+        with self._file_lock(file_id):
+            record = self.get(file_id)
+            self._pop_analyzer(file_id)
+            for path in (record.get("part_path"), record.get("path")):
+                if path:
+                    Path(path).unlink(missing_ok=True)
+            self._record_path(file_id).unlink(missing_ok=True)
+        with self._lock:
+            self._file_locks.pop(file_id, None)
+
+    def set_analysis(self, file_id: str, analysis: Dict) -> None:
+        with self._file_lock(file_id):
+            record = self.get(file_id)
+            record["analysis"] = analysis
+            self._write_record(record)
+
+    def status(self, file_id: str) -> Dict:
+        """Public view of an upload (what to resume from, analysis progress)."""
+        record = self.get(file_id)
+        analyzer = self._analyzers.get(file_id)
+        return {
+            "file_id": file_id,
+            "filename": record["filename"],
+            "status": record["status"],
+            "received": record["received"],
+            "total_size": record["total_size"],
+            "analyzed_seconds": round(analyzer.analyzed_seconds, 1) if analyzer is not None else None,
+            "analysis_ready": record.get("analysis") is not None,
+        }
+
+    def resolve(self, file_id: str) -> Path:
+        """Path of a completed upload; raises UploadNotFound / UploadStateError."""
+        record = self.get(file_id)
+        if record["status"] != STATUS_COMPLETE:
+            raise UploadStateError(f"Upload {file_id} is not complete")
+        return Path(record["path"])
+
+
+_STORE: Optional[UploadStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_upload_store() -> UploadStore:
+    """Process-wide store for audio recordings (created on first use)."""
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                from backend.config import AUDIO_UPLOAD_DIR, AUDIO_UPLOAD_MAX_SIZE
+                from backend.models.audio_features import IncrementalAudioAnalyzer
+
+                def wav_analyzer(filename: str):
+                    return IncrementalAudioAnalyzer() if filename.lower().endswith(".wav") else None
+
+                _STORE = UploadStore(AUDIO_UPLOAD_DIR, AUDIO_UPLOAD_MAX_SIZE, wav_analyzer)
+    return _STORE
@@ -1,40 +1,62 @@
 # Backend: wearable ingestion utilities and simple persistence.
 # Add this file to backend/utils/wearable.py
 
-import os
-import json
-from pathlib import Path
-from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Union
 
-STORAGE_DIR = Path(os.getenv("UPLOAD_DIR", os.path.join(os.getcwd(), "uploads")))
-WEARABLE_DIR = STORAGE_DIR / "wearable"
-WEARABLE_DIR.mkdir(parents=True, exist_ok=True)
+import numpy as np
 
-def summarize_wearable_samples(samples: List[Dict]) -> Dict:
+# Per-sample fields; missing values become NaN in the columnar form
+WEARABLE_FIELDS = ("ts", "hr", "spo2", "hrv")
+
+def wearable_columns(samples: Union[List[Dict], Dict[str, list]]) -> Dict[str, np.ndarray]:
+    """
+    Convert wearable samples to float64 columns (NaN = missing) in one pass.
+
+    Accepts the row form ``[{"ts": .., "hr": .., "spo2": .., "hrv": ..}, ...]``
+    or the columnar form ``{"ts": [...], "hr": [...], ...}``; absent fields
+    become all-NaN columns. Raises ValueError if columns differ in length.
+    """
+    if isinstance(samples, dict):
+        present = {
+            f: np.asarray(samples[f], dtype=np.float64).ravel() for f in WEARABLE_FIELDS if samples.get(f) is not None
+        }
+        lengths = {c.shape[0] for c in present.values()}
+        if len(lengths) > 1:
+            raise ValueError("Columnar wearable samples must all have the same length")
+        n = lengths.pop() if lengths else 0
+        return {f: present.get(f, np.full(n, np.nan)) for f in WEARABLE_FIELDS}
+    # One flat list per field converts far faster than a 2-D array of tuples;
+    # None -> NaN happens inside the float64 conversion
+    return {f: np.array([s.get(f) for s in samples], dtype=np.float64) for f in WEARABLE_FIELDS}
+
+def summarize_wearable_samples(samples: Union[List[Dict], Dict[str, list]]) -> Dict:
     """
     Expect samples: list of { "ts": 1698000000, "hr": 72, "spo2": 98, "hrv": 45 }
+    or the same as columns: { "ts": [...], "hr": [...], "spo2": [...], "hrv": [...] }
     Returns summary dict with min_spo2, avg_hr, spo2_drops (count < 90), hr_std (simple), sample_count
     """
     if not samples:
         return {"sample_count": 0}
+    columns = wearable_columns(samples)
+    n = columns["ts"].shape[0]
+    if n == 0:
+        return {"sample_count": 0}
 
-    hrs = [s.get("hr") for s in samples if s.get("hr") is not None]
-    spos = [s.get("spo2") for s in samples if s.get("spo2") is not None]
-    hrvs = [s.get("hrv") for s in samples if s.get("hrv") is not None]
-
-    import numpy as np
+    # Drop missing values once per column; statistics run on the compact arrays
+    hrs = columns["hr"][~np.isnan(columns["hr"])]
+    spos = columns["spo2"][~np.isnan(columns["spo2"])]
+    hrvs = columns["hrv"][~np.isnan(columns["hrv"])]
 
     summary = {}
-    summary["sample_count"] = len(samples)
-    summary["min_spo2"] = float(min(spos)) if spos else None
-    summary["avg_spo2"] = float(np.mean(spos)) if spos else None
-    summary["min_hr"] = float(min(hrs)) if hrs else None
-    summary["avg_hr"] = float(np.mean(hrs)) if hrs else None
-    summary["hr_std"] = float(np.std(hrs)) if len(hrs) > 1 else None
-    summary["avg_hrv"] = float(np.mean(hrvs)) if hrvs else None
+    summary["sample_count"] = n
+    summary["min_spo2"] = float(spos.min()) if spos.size else None
+    summary["avg_spo2"] = float(spos.mean()) if spos.size else None
+    summary["min_hr"] = float(hrs.min()) if hrs.size else None
+    summary["avg_hr"] = float(hrs.mean()) if hrs.size else None
+    summary["hr_std"] = float(hrs.std()) if hrs.size > 1 else None
+    summary["avg_hrv"] = float(hrvs.mean()) if hrvs.size else None
     # count clinically relevant SpO2 drops (below 90)
-    summary["spo2_drops"] = int(sum(1 for x in spos if x < 90)) if spos else 0
+    summary["spo2_drops"] = int(np.count_nonzero(spos < 90))
 
     # simple risk heuristic
     risk_score = 0.0
@@ -45,7 +67,8 @@ def summarize_wearable_samples(samples: List[Dict]) -> Dict:
             risk_score += 0.3
     if summary.get("spo2_drops", 0) > 3:
         risk_score += 0.3
-    if summary.get("avg_hr", 0) > 100:
+    # avg_hr is None when no sample carried a heart rate
+    if (summary["avg_hr"] or 0) > 100:
         risk_score += 0.1
 
     summary["risk_score"] = round(min(1.0, risk_score), 2)
@@ -60,19 +83,9 @@ def summarize_wearable_samples(samples: List[Dict]) -> Dict:
 
 def save_wearable_record(user_id: str, summary: Dict, raw_payload: Dict) -> Dict:
     """
-    Save a JSON record to uploads/wearable/<timestamp>_<user>.json
+    Append a record to the wearable store at DATABASE_URL (see wearable_store.py);
+    the raw payload is kept compressed, apart from the summary.
     Returns a record dict with id/path/timestamp
     """
-    now = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-    filename = f"wearable_{user_id}_{now}.json"
-    out_path = WEARABLE_DIR / filename
-    record = {
-        "id": filename,
-        "user_id": user_id,
-        "timestamp": now,
-        "summary": summary,
-        "raw": raw_payload  # caution: you may want to omit raw before production
-    }
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(record, f, ensure_ascii=False, indent=2)
-    return {"id": filename, "path": str(out_path), "timestamp": now}
\ No newline at end of file
+    from backend.utils.wearable_store import get_wearable_store
+    return get_wearable_store().save(user_id, summary, raw_payload)
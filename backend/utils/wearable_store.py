@@ -0,0 +1,152 @@
+"""
+Wearable Record Store
+Append-only SQLite storage for wearable uploads at DATABASE_URL.
+Team: Chimpanzini Bananini
+
+Summaries go in ``wearable_records``, indexed by (user_id, created_at), so
+the newest ``limit`` records, for everyone or for one user, come from an
+index scan of ``limit`` rows at any history size. Raw payloads (the bulky
+per-sample arrays) are zlib-compressed JSON in ``wearable_raw``, keyed by
+record, and read only when asked for. Record ids are unique per upload, so
+two uploads from one user in the same second no longer overwrite each other.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS wearable_records (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    user_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    timestamp TEXT NOT NULL,
+    device TEXT,
+    summary TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_wearable_user_time ON wearable_records (user_id, created_at);
+CREATE TABLE IF NOT EXISTS wearable_raw (
+    seq INTEGER PRIMARY KEY REFERENCES wearable_records (seq) ON DELETE CASCADE,
+    payload BLOB NOT NULL
+);
+"""
+
+
+class RecordNotFound(KeyError):
+    pass
+
+
+def sqlite_path(database_url: str, base_dir=None) -> str:
+    """
+    Filesystem path (or ``:memory:``) of a ``sqlite:///...`` URL; relative
+    paths are resolved against ``base_dir`` when given.
+    """
+    prefix = "sqlite:///"
+    if not database_url.startswith(prefix):
+        raise ValueError(f"Wearable storage needs a sqlite:/// DATABASE_URL (e.g. sqlite:///./somnia.db), "
+                         f"got {database_url!r}")
+    path = database_url[len(prefix):]
+    if not path or path == ":memory:":
+        return ":memory:"
+    if base_dir is not None and not os.path.isabs(path):
+        path = os.path.normpath(os.path.join(base_dir, path))
+    return path
+
+
+def configured_path() -> str:
+    """SQLite path of DATABASE_URL, relative to DATABASE_BASE_DIR; ValueError if unsupported."""
+    from backend.config import DATABASE_BASE_DIR, DATABASE_URL
+    return sqlite_path(DATABASE_URL, DATABASE_BASE_DIR)
+
+
+class WearableStore:
+    """Wearable summaries and compressed raw payloads in one SQLite database."""
+
+    def __init__(self, path, compression_level: int = 6):
+        self.path = str(path)
+        self.compression_level = compression_level
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the API's threads; sqlite3 calls are serialized here
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+
+    def save(self, user_id: str, summary: Dict, raw_payload: Optional[Dict] = None) -> Dict:
+        """Append one upload; returns {id, path, timestamp}."""
+        created = time.time()
+        timestamp = datetime.fromtimestamp(created, timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        record_id = f"wearable_{user_id}_{timestamp}_{uuid.uuid4().hex[:8]}"
+        device = (raw_payload or {}).get("device")
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO wearable_records (id, user_id, created_at, timestamp, device, summary) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (record_id, user_id, created, timestamp, device, json.dumps(summary)),
+            )
+            if raw_payload is not None:
+                blob = zlib.compress(json.dumps(raw_payload, separators=(",", ":")).encode("utf-8"),
+                                     self.compression_level)
+                self._conn.execute("INSERT INTO wearable_raw (seq, payload) VALUES (?, ?)",
+                                   (cursor.lastrowid, blob))
+        return {"id": record_id, "path": self.path, "timestamp": timestamp}
+
+    def recent(self, limit: int = 20, user_id: Optional[str] = None) -> List[Dict]:
+        """Newest ``limit`` records (optionally for one user), newest first, without raw payloads."""
+        if user_id is None:
+            query = "SELECT id, user_id, timestamp, summary FROM wearable_records ORDER BY seq DESC LIMIT ?"
+            args = (limit,)
+        else:
+            query = ("SELECT id, user_id, timestamp, summary FROM wearable_records WHERE user_id = ? "
+                     "ORDER BY created_at DESC, seq DESC LIMIT ?")
+            args = (user_id, limit)
+        with self._lock:
+            rows = self._conn.execute(query, args).fetchall()
+        return [
+            {"id": r["id"], "user_id": r["user_id"], "timestamp": r["timestamp"], "summary": json.loads(r["summary"])}
+            for r in rows
+        ]
+
+    def raw(self, record_id: str) -> Optional[Dict]:
+        """Decompressed raw payload of a record (None if it was saved without one)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT r.seq, w.payload FROM wearable_records r LEFT JOIN wearable_raw w ON w.seq = r.seq "
+                "WHERE r.id = ?", (record_id,),
+            ).fetchone()
+        if row is None:
+            raise RecordNotFound(record_id)
+        if row["payload"] is None:
+            return None
+        return json.loads(zlib.decompress(row["payload"]).decode("utf-8"))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_STORE: Optional[WearableStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_wearable_store() -> WearableStore:
+    """Process-wide store at DATABASE_URL (opened on first use)."""
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                _STORE = WearableStore(configured_path())
+    return _STORE